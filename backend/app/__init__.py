@@ -1,6 +1,7 @@
 from flask import Flask
 from flask_cors import CORS
 from .models import db, migrate
+from .database import init_engine_tuning
 import os
 from config import Config  # Now it should find it
 
@@ -10,6 +11,27 @@ def create_app(config_class=Config):
     app.config.from_object(config_class)
 
     db.init_app(app)
+    init_engine_tuning(app)
+
+    from .utils.json_provider import init_json_provider
+
+    init_json_provider(app)
+
+    from .utils.schedule_cache import init_schedule_cache
+
+    init_schedule_cache(app)
+
+    from .utils.response_cache import init_response_cache
+
+    init_response_cache(app)
+
+    from .utils.query_stats import init_query_stats
+
+    init_query_stats(app)
+
+    from .utils.compression import init_compression
+
+    init_compression(app)
 
     # Only initialize Migrate if we aren't in a test
     if not app.config.get("TESTING"):
@@ -66,4 +88,8 @@ def create_app(config_class=Config):
 
     app.register_blueprint(membership_station_bp, url_prefix="/api")
 
+    from .routes.metrics import metrics_bp
+
+    app.register_blueprint(metrics_bp, url_prefix="/api")
+
     return app
@@ -1,7 +1,8 @@
 from datetime import date, datetime
-from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.orm import DeclarativeBase, Session, scoped_session, sessionmaker
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import event
+from sqlalchemy import event, create_engine
 from sqlalchemy.engine import Engine
 from sqlite3 import Connection as SQLite3Connection
 from flask_migrate import Migrate
@@ -35,3 +36,66 @@ def _set_sqlite_pragma(dbapi_connection, connection_record):
 db = SQLAlchemy(model_class=Base)
 # 2. Initialize Migrate here
 migrate = Migrate()
+
+
+# --- ENGINE TUNING / READ-ONLY SESSION ---
+
+
+# Stored in the database file: set once by the write engine, never by readers
+# (a mode=ro connection fails with "attempt to write a readonly database")
+PERSISTENT_PRAGMAS = ("journal_mode",)
+
+
+def _pragma_hook(pragmas):
+    def _apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return _apply
+
+
+def init_engine_tuning(app):
+    """
+    Applies SQLITE_PRAGMAS to every new SQLite connection (WAL lets readers
+    proceed while a solve commits) and, when SQLALCHEMY_READONLY_URI is set,
+    builds a second engine + scoped session that read_session() hands out.
+    The file is switched to WAL here, so read-only connections never have to.
+    """
+    pragmas = app.config.get("SQLITE_PRAGMAS") or {}
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite" and pragmas:
+            event.listen(db.engine, "connect", _pragma_hook(pragmas))
+            if any(name in pragmas for name in PERSISTENT_PRAGMAS):
+                with db.engine.connect():
+                    pass
+
+    read_uri = app.config.get("SQLALCHEMY_READONLY_URI")
+    if not read_uri:
+        return
+
+    read_engine = create_engine(
+        read_uri, **app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {})
+    )
+    if read_engine.dialect.name == "sqlite":
+        read_pragmas = {
+            name: value
+            for name, value in pragmas.items()
+            if name not in PERSISTENT_PRAGMAS
+        }
+        event.listen(
+            read_engine, "connect", _pragma_hook({**read_pragmas, "query_only": "ON"})
+        )
+    app.extensions["read_session"] = scoped_session(
+        sessionmaker(bind=read_engine), scopefunc=db.session.registry.scopefunc
+    )
+
+    @app.teardown_appcontext
+    def _remove_read_session(exc):
+        app.extensions["read_session"].remove()
+
+
+def read_session():
+    """Session for read-only work; falls back to db.session when not configured."""
+    return current_app.extensions.get("read_session") or db.session
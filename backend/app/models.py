@@ -2,17 +2,21 @@ from __future__ import annotations
 from datetime import date, timedelta, datetime
 from typing import Optional, List, Dict, Any
 from sqlalchemy import (
+    DDL,
+    event,
     String,
     Integer,
     Boolean,
     Date,
     ForeignKey,
     UniqueConstraint,
+    Index,
     Float,
     DateTime,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .database import db, migrate
+from .utils.leave_intervals import leave_interval, leave_counts_by_date
 from collections import defaultdict
 
 
@@ -59,6 +63,8 @@ class Group(db.Model):
 
 class Person(db.Model):
     __tablename__ = "personnel"
+    # Keyset pages of the roster (ORDER BY name, id)
+    __table_args__ = (Index("ix_personnel_name_id", "name", "id"),)
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -117,6 +123,9 @@ class Holiday(db.Model):
     date: Mapped[date] = mapped_column(Date, unique=True, nullable=False)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
 
+    def to_dict(self):
+        return {"id": self.id, "date": self.date.isoformat(), "name": self.name}
+
 
 class Qualification(db.Model):
     __tablename__ = "qualifications"
@@ -150,6 +159,8 @@ class Qualification(db.Model):
 
 class Schedule(db.Model):
     __tablename__ = "schedules"
+    # Keyset pages of the schedule list (ORDER BY start_date DESC, id DESC)
+    __table_args__ = (Index("ix_schedules_start_date_id", "start_date", "id"),)
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     start_date: Mapped[date] = mapped_column(Date, nullable=False)
@@ -162,20 +173,25 @@ class Schedule(db.Model):
     weight_consecutive_weekends: Mapped[float] = mapped_column(default=1.5)
     weight_goal_deviation: Mapped[float] = mapped_column(default=0.5)
     group_weights: Mapped[Dict[str, Any]] = mapped_column(db.JSON, default={})
+    # Bumped in the writing transaction on any change to the schedule or its
+    # child rows (utils/revisions.py). With the global revision (master data)
+    # it backs the GET ETags.
+    revision: Mapped[int] = mapped_column(default=0, server_default="0")
 
-    # Cascades: If a Schedule is deleted, wipe all related child records
+    # Cascades: If a Schedule is deleted, wipe all related child records.
+    # Collections load lazily; endpoints pick a plan from utils/load_plans.py.
     memberships: Mapped[List["ScheduleMembership"]] = relationship(
-        back_populates="schedule", cascade="all, delete-orphan", lazy="joined"
+        back_populates="schedule", cascade="all, delete-orphan", lazy="select"
     )
     days: Mapped[List["ScheduleDay"]] = relationship(
-        back_populates="schedule", cascade="all, delete-orphan", lazy="joined"
+        back_populates="schedule", cascade="all, delete-orphan", lazy="select"
     )
     assignments: Mapped[List["Assignment"]] = relationship(
-        back_populates="schedule", cascade="all, delete-orphan", lazy="joined"
+        back_populates="schedule", cascade="all, delete-orphan", lazy="select"
     )
     # Add this relationship
     required_stations: Mapped[List["ScheduleStation"]] = relationship(
-        back_populates="schedule", cascade="all, delete-orphan", lazy="joined"
+        back_populates="schedule", cascade="all, delete-orphan", lazy="select"
     )
     candidates: Mapped[List["ScheduleCandidate"]] = relationship(
         back_populates="schedule", cascade="all, delete-orphan"
@@ -223,7 +239,28 @@ class Schedule(db.Model):
                     curr += timedelta(days=1)
         return leaves_by_date
 
-    def to_dict(self, summary_only=True):
+    def _get_leave_intervals(self):
+        """One dict per leave (the compact alternative to the two above)."""
+        return [
+            leave_interval(
+                l.id,
+                m.id,
+                m.person.id if m.person else None,
+                m.person.name if m.person else "Unknown",
+                l.reason,
+                l.start_date,
+                l.end_date,
+            )
+            for m in self.memberships
+            for l in m.leaves
+        ]
+
+    def to_dict(self, summary_only=True, explode_leaves=False):
+        """
+        summary_only=False adds days, memberships and stations. Leaves go out
+        as intervals ("leave_intervals", per-day "leave_count") unless
+        explode_leaves asks for the legacy per-day lists + "leaves_exploded".
+        """
         data = {
             "id": self.id,
             "name": self.name,
@@ -241,15 +278,27 @@ class Schedule(db.Model):
         }
 
         if not summary_only:
-            # Reuse the helper
-            leaves_map = self._get_leaves_by_date()
-            data["days"] = [
-                d.to_dict(day_leaves=leaves_map.get(d.date.isoformat(), []))
-                for d in self.days
-            ]
+            if explode_leaves:
+                # Reuse the helper
+                leaves_map = self._get_leaves_by_date()
+                data["days"] = [
+                    d.to_dict(day_leaves=leaves_map.get(d.date.isoformat(), []))
+                    for d in self.days
+                ]
+                data["leaves_exploded"] = self._get_exploded_leaves()
+            else:
+                spans = [
+                    (l.start_date, l.end_date)
+                    for m in self.memberships
+                    for l in m.leaves
+                ]
+                counts = leave_counts_by_date(spans, [d.date for d in self.days])
+                data["days"] = [
+                    d.to_dict(leave_count=counts[d.date]) for d in self.days
+                ]
+                data["leave_intervals"] = self._get_leave_intervals()
             data["memberships"] = [m.to_dict() for m in self.memberships]
             data["required_stations"] = [rs.to_dict() for rs in self.required_stations]
-            data["leaves_exploded"] = self._get_exploded_leaves()
 
         return data
 
@@ -259,6 +308,13 @@ class ScheduleDay(db.Model):
     # Prevent duplicate dates in the same schedule
     __table_args__ = (
         UniqueConstraint("schedule_id", "date", name="_schedule_date_uc"),
+        # Calendar reads: active/lookback days of a schedule in date order
+        Index(
+            "ix_schedule_days_schedule_date_lookback",
+            "schedule_id",
+            "date",
+            "is_lookback",
+        ),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -274,15 +330,18 @@ class ScheduleDay(db.Model):
     is_holiday: Mapped[bool] = mapped_column(Boolean, default=False)
 
     schedule: Mapped["Schedule"] = relationship(back_populates="days")
+    # Plain lazy: day payloads come from row_serializers (grouped counts, one
+    # exclusions join); load_plans selectin-loads these where to_dict needs them.
     assignments: Mapped[List["Assignment"]] = relationship(
-        back_populates="day", cascade="all, delete-orphan", lazy="selectin"
+        back_populates="day", cascade="all, delete-orphan", lazy="select"
     )
     exclusions: Mapped[List["ScheduleExclusion"]] = relationship(
-        back_populates="day", cascade="all, delete-orphan", lazy="selectin"
+        back_populates="day", cascade="all, delete-orphan", lazy="select"
     )
 
-    def to_dict(self, day_leaves=None):
-        return {
+    def to_dict(self, day_leaves=None, leave_count=None):
+        """leave_count (compact schedule payload) replaces the "leaves" list."""
+        data = {
             "id": self.id,
             "schedule_id": self.schedule_id,
             "date": self.date.isoformat() if self.date else None,
@@ -295,9 +354,13 @@ class ScheduleDay(db.Model):
             # We don't usually nest all assignments here to keep it light,
             # but we could return the count
             "assignment_count": len(self.assignments),
-            "leaves": day_leaves if day_leaves is not None else [],
             "exclusions": [e.to_dict() for e in self.exclusions],
         }
+        if leave_count is not None:
+            data["leave_count"] = leave_count
+        else:
+            data["leaves"] = day_leaves if day_leaves is not None else []
+        return data
 
 
 class ScheduleMembership(db.Model):
@@ -375,6 +438,12 @@ class ScheduleMembership(db.Model):
 
 class Assignment(db.Model):
     __tablename__ = "assignments"
+    __table_args__ = (
+        # One slot per station per day
+        Index("ux_assignments_day_station", "day_id", "station_id", unique=True),
+        # Schedule-wide reads; the is_locked suffix serves lock filtering
+        Index("ix_assignments_schedule_locked", "schedule_id", "is_locked"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -438,6 +507,11 @@ class ScheduleLeave(db.Model):
     """Blocks out a range of dates for a person on a specific schedule."""
 
     __tablename__ = "schedule_leaves"
+    __table_args__ = (
+        Index(
+            "ix_schedule_leaves_member_range", "membership_id", "start_date", "end_date"
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -465,6 +539,12 @@ class ScheduleLeave(db.Model):
 
 class ScheduleExclusion(db.Model):
     __tablename__ = "schedule_exclusions"
+    __table_args__ = (
+        # toggle_exclusion looks up (day, member); one exclusion per pair
+        Index(
+            "ux_schedule_exclusions_day_member", "day_id", "membership_id", unique=True
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -502,6 +582,14 @@ class MembershipStationWeight(db.Model):
     """
 
     __tablename__ = "membership_station_weights"
+    __table_args__ = (
+        Index(
+            "ux_membership_station_weights_member_station",
+            "membership_id",
+            "station_id",
+            unique=True,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     membership_id: Mapped[int] = mapped_column(
@@ -565,6 +653,10 @@ class ScheduleStation(db.Model):
 
 class ScheduleCandidate(db.Model):
     __tablename__ = "schedule_candidates"
+    __table_args__ = (
+        # Candidate lists are read best score first
+        Index("ix_schedule_candidates_schedule_score", "schedule_id", "score"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
@@ -591,3 +683,27 @@ class ScheduleCandidate(db.Model):
             "metrics_data": self.metrics_data,
             "created_at": self.created_at.isoformat(),
         }
+
+
+# --- 3. BOOKKEEPING ---
+
+
+class RevisionCounter(db.Model):
+    """
+    Named counters bumped by utils/revisions.py. "global" counts master-data
+    changes (Person, Group, ...), which affect every schedule: one row to
+    bump instead of every schedules.revision.
+    """
+
+    __tablename__ = "revision_counters"
+
+    name: Mapped[str] = mapped_column(String(32), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+
+# create_all (tests, fresh installs) seeds the row the migration inserts
+event.listen(
+    RevisionCounter.__table__,
+    "after_create",
+    DDL("INSERT INTO revision_counters (name, value) VALUES ('global', 0)"),
+)
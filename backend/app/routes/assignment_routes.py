@@ -1,32 +1,151 @@
-from flask import Blueprint, request, jsonify
-from sqlalchemy.orm import joinedload
-from ..database import db
+from flask import Blueprint, current_app, request, jsonify
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.exc import SQLAlchemyError
+from ..database import db, read_session
 from ..models import Assignment, ScheduleMembership
+from ..utils.bulk_ops import update_rows_by_key
+from ..utils.schedule_validator import validate_changes
+from ..utils.revisions import schedule_etag
+from ..utils.pagination import date_range_args
+from ..utils.row_serializers import (
+    serialize_assignments,
+    serialize_assignments_columnar,
+)
 
 assignment_bp = Blueprint("assignments", __name__)
 
 
 # --- GET ALL (Optimized with Eager Loading) ---
 @assignment_bp.route("/schedules/<int:schedule_id>/assignments", methods=["GET"])
+@schedule_etag()
 def get_schedule_assignments(schedule_id):
     """
     Fetch all slots for a month.
-    Uses joinedload to prevent N+1 queries for station and person names.
+    One joined column query; rows map straight to the Assignment.to_dict() shape.
+    ?format=columnar returns parallel arrays plus day/station/member lookups.
+    ?from=&to= (YYYY-MM-DD) only returns the slots of days in that window.
     """
-    assignments = (
-        db.session.query(Assignment)
-        .filter_by(schedule_id=schedule_id)
-        .options(
-            joinedload(Assignment.master_station),
-            joinedload(Assignment.day),
-            # Nested join: Membership -> Person
-            joinedload(Assignment.membership).joinedload(ScheduleMembership.person),
+    try:
+        start, end = date_range_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    fmt = request.args.get("format", "rows")
+    if fmt == "columnar":
+        serialize = serialize_assignments_columnar
+    elif fmt == "rows":
+        serialize = serialize_assignments
+    else:
+        return jsonify({"error": f"Unknown format '{fmt}'"}), 400
+    payload = serialize(schedule_id, session=read_session(), start=start, end=end)
+    return jsonify(payload), 200
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _slot_change(index, item):
+    """
+    One bulk PATCH entry -> {"id", <columns to set>}, with the same rules as
+    PATCH /assignments/<id>: picking a member locks the slot, clearing it
+    unlocks it, and an explicit is_locked wins. Raises ValueError.
+    """
+    if not isinstance(item, dict) or not _is_int(item.get("id")):
+        raise ValueError(f"Item {index}: missing integer id")
+    row = {"id": item["id"]}
+    if "membership_id" in item:
+        member_id = item["membership_id"]
+        if member_id is not None and not _is_int(member_id):
+            raise ValueError(f"Item {index}: membership_id must be an integer or null")
+        row["membership_id"] = member_id
+        row["is_locked"] = member_id is not None
+    if "is_locked" in item:
+        if not isinstance(item["is_locked"], bool):
+            raise ValueError(f"Item {index}: is_locked must be true or false")
+        row["is_locked"] = item["is_locked"]
+    if "availability_estimate" in item:
+        estimate = item["availability_estimate"]
+        if not isinstance(estimate, (int, float)) or isinstance(estimate, bool):
+            raise ValueError(f"Item {index}: availability_estimate must be a number")
+        row["availability_estimate"] = float(estimate)
+    if len(row) == 1:
+        raise ValueError(f"Item {index}: nothing to change")
+    return row
+
+
+# --- PATCH MANY (Drag across days, clear a station column) ---
+@assignment_bp.route("/schedules/<int:schedule_id>/assignments", methods=["PATCH"])
+def patch_schedule_assignments(schedule_id):
+    """
+    Atomic batch edit. Accepts a list of
+    {"id", "membership_id"?, "is_locked"?, "availability_estimate"?}.
+    Slots and members are checked against the schedule in one query, then all
+    entries are written by one UPDATE ... CASE (entries that leave a column
+    out keep its value).
+    Returns the updated slots and the incremental alert delta.
+    """
+    payload = request.get_json()
+    if not isinstance(payload, list):
+        return jsonify({"error": "Payload must be a list"}), 400
+    try:
+        rows = [_slot_change(i, item) for i, item in enumerate(payload)]
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    slot_ids = [r["id"] for r in rows]
+    if len(set(slot_ids)) != len(slot_ids):
+        return jsonify({"error": "Each slot may appear only once"}), 400
+    member_ids = {r.get("membership_id") for r in rows} - {None}
+
+    found = db.session.execute(
+        union_all(
+            select(literal("slot"), Assignment.id).where(
+                Assignment.schedule_id == schedule_id, Assignment.id.in_(slot_ids)
+            ),
+            select(literal("member"), ScheduleMembership.id).where(
+                ScheduleMembership.schedule_id == schedule_id,
+                ScheduleMembership.id.in_(member_ids),
+            ),
         )
-        .all()
+    ).all()
+    known = {(kind, id_) for kind, id_ in found}
+    missing = [i for i in slot_ids if ("slot", i) not in known]
+    if missing:
+        return jsonify({"error": f"Assignments not found: {missing}"}), 404
+    missing = sorted(i for i in member_ids if ("member", i) not in known)
+    if missing:
+        return jsonify({"error": f"Members not found: {missing}"}), 404
+
+    columns = sorted(set().union(*rows) - {"id"})
+    try:
+        update_rows_by_key(Assignment, ["id"], columns, rows, schedule_id=schedule_id)
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        current_app.logger.exception(
+            "Batch assignment update failed for schedule %s", schedule_id
+        )
+        return jsonify({"error": "Batch update failed"}), 500
+
+    return (
+        jsonify(
+            {
+                "assignments": serialize_assignments(
+                    schedule_id, assignment_ids=slot_ids
+                ),
+                # None if no alert set is cached yet (as PATCH /assignments/<id>)
+                "alerts_delta": validate_changes(
+                    schedule_id,
+                    slot_ids,
+                    base=request.args.get("alerts_base"),
+                    build=False,
+                ),
+            }
+        ),
+        200,
     )
 
-    return jsonify([a.to_dict() for a in assignments]), 200
-
 
 # --- GET ONE ---
 @assignment_bp.route("/assignments/<int:id>", methods=["GET"])
@@ -77,7 +196,16 @@ def patch_assignment(id):
         assignment.availability_estimate = data["availability_estimate"]
 
     db.session.commit()
-    return jsonify(assignment.to_dict()), 200
+
+    response = assignment.to_dict()
+    # Alert changes since ?alerts_base= (None if no alert set is cached yet)
+    response["alerts_delta"] = validate_changes(
+        assignment.schedule_id,
+        [assignment.id],
+        base=request.args.get("alerts_base"),
+        build=False,
+    )
+    return jsonify(response), 200
 
 
 # --- DELETE ---
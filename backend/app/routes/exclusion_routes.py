@@ -2,6 +2,9 @@ from flask import Blueprint, request, jsonify
 from sqlalchemy.orm import joinedload
 from app import db
 from app.models import ScheduleExclusion, ScheduleMembership, ScheduleDay, Schedule
+from app.utils.load_plans import load_schedule
+from app.utils.revisions import schedule_etag
+from app.utils.pagination import date_range_args
 
 exclusion_bp = Blueprint("exclusions", __name__)
 
@@ -11,15 +14,21 @@ exclusion_bp = Blueprint("exclusions", __name__)
 
 
 @exclusion_bp.route("/exclusions/schedule/<int:schedule_id>", methods=["GET"])
+@schedule_etag()
 def get_exclusions_for_schedule(schedule_id):
+    """?from=&to= (YYYY-MM-DD) only returns exclusions on days in that window."""
+    try:
+        start, end = date_range_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     # 1. Check Schedule Existence
-    schedule = db.session.get(Schedule, schedule_id)
-    if not schedule:
+    if not load_schedule(schedule_id, "summary"):
         return jsonify({"error": f"Schedule {schedule_id} not found"}), 404
 
     try:
         # 2. THE FIX IS HERE
-        exclusions = (
+        query = (
             db.session.query(ScheduleExclusion)
             .join(ScheduleExclusion.day)  # <--- Join the "Bridge" table
             .filter(
@@ -31,8 +40,12 @@ def get_exclusions_for_schedule(schedule_id):
                     ScheduleMembership.person
                 ),
             )
-            .all()
         )
+        if start:
+            query = query.filter(ScheduleDay.date >= start)
+        if end:
+            query = query.filter(ScheduleDay.date <= end)
+        exclusions = query.all()
 
         return jsonify([e.to_dict() for e in exclusions]), 200
 
@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
 from sqlalchemy import select, func
-from ..database import db
-from ..models import Group
+from sqlalchemy.orm import lazyload, selectinload
+from ..database import db, read_session
+from ..models import Group, Person
 
 group_bp = Blueprint("groups", __name__)
 
@@ -10,8 +11,16 @@ group_bp = Blueprint("groups", __name__)
 def get_groups():
     # Primary sort: Priority (1, 2, 3...)
     # Secondary sort: Name (A-Z)
-    stmt = select(Group).order_by(Group.priority.asc(), Group.name.asc())
-    groups = db.session.execute(stmt).scalars().all()
+    # to_dict lists the member ids: one batched query instead of one per group
+    # (and skip the qualifications Person would otherwise selectin-load)
+    stmt = (
+        select(Group)
+        .options(
+            selectinload(Group.personnel).options(lazyload(Person.qualifications))
+        )
+        .order_by(Group.priority.asc(), Group.name.asc())
+    )
+    groups = read_session().execute(stmt).scalars().all()
     return jsonify([g.to_dict() for g in groups])
 
 
@@ -4,6 +4,7 @@ from ..database import db
 from ..models import Holiday
 from datetime import datetime, date
 from ..utils.holidays import get_holidays_with_breaks
+from ..utils.pagination import date_range_args, keyset_page, parse_page_args
 
 
 holiday_bp = Blueprint("holidays", __name__)
@@ -11,10 +12,25 @@ holiday_bp = Blueprint("holidays", __name__)
 
 @holiday_bp.route("/holidays", methods=["GET"])
 def get_holidays():
-    """Returns a list of all holidays for the UI to reference."""
-    stmt = select(Holiday).order_by(Holiday.date.asc())
-    holidays = db.session.execute(stmt).scalars().all()
-    return jsonify([h.to_dict() for h in holidays])
+    """
+    Returns the holidays for the UI to reference (?from=&to= to narrow).
+    Always paged: ?limit=&cursor=&total=1 (see utils/pagination.py).
+    """
+    order = [(Holiday.date, False), (Holiday.id, False)]
+    try:
+        page = parse_page_args(request.args, order, required=True)
+        start, end = date_range_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    stmt = select(Holiday)
+    if start:
+        stmt = stmt.where(Holiday.date >= start)
+    if end:
+        stmt = stmt.where(Holiday.date <= end)
+
+    result = keyset_page(stmt, order, page)
+    return jsonify(result.envelope([h.to_dict() for (h,) in result.rows]))
 
 
 @holiday_bp.route("/holidays/sync-range", methods=["POST"])
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models import ScheduleLeave, ScheduleMembership, Person
+from app.utils.revisions import schedule_etag
+from app.utils.pagination import date_range_args, keyset_page, parse_page_args
+from sqlalchemy import select
 from datetime import datetime
 
 leave_bp = Blueprint("leaves", __name__)
@@ -27,19 +30,44 @@ def validate_leave_logic(start_date, end_date):
 
 
 @leave_bp.route("/leaves", methods=["GET"])
+@schedule_etag(query_arg="schedule_id")
 def get_leaves():
+    """
+    Leaves of one schedule. Filters: ?membership_id=, ?from=&to= (leaves
+    overlapping the range). Paging: ?limit=&cursor=&total=1.
+    """
     schedule_id = request.args.get("schedule_id")
     if not schedule_id:
         return jsonify({"error": "Missing schedule_id parameter"}), 400
+    order = [(ScheduleLeave.start_date, False), (ScheduleLeave.id, False)]
+    try:
+        page = parse_page_args(request.args, order)
+        start, end = date_range_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     # Query: Join Leave -> Membership -> Person to get the name
-    results = (
-        db.session.query(ScheduleLeave, Person.name)
+    stmt = (
+        select(ScheduleLeave, Person.name)
         .join(ScheduleMembership, ScheduleLeave.membership_id == ScheduleMembership.id)
         .join(Person, ScheduleMembership.person_id == Person.id)
-        .filter(ScheduleMembership.schedule_id == schedule_id)
-        .all()
+        .where(ScheduleMembership.schedule_id == schedule_id)
     )
+    membership_id = request.args.get("membership_id", type=int)
+    if membership_id is not None:
+        stmt = stmt.where(ScheduleLeave.membership_id == membership_id)
+    if start:
+        stmt = stmt.where(ScheduleLeave.end_date >= start)
+    if end:
+        stmt = stmt.where(ScheduleLeave.start_date <= end)
+
+    if page is None:
+        results = db.session.execute(
+            stmt.order_by(ScheduleLeave.start_date, ScheduleLeave.id)
+        ).all()
+    else:
+        result = keyset_page(stmt, order, page)
+        results = result.rows
 
     # Serialize results and inject person_name
     leaves_data = []
@@ -48,7 +76,9 @@ def get_leaves():
         leave_dict["person_name"] = person_name
         leaves_data.append(leave_dict)
 
-    return jsonify(leaves_data), 200
+    if page is None:
+        return jsonify(leaves_data), 200
+    return jsonify(result.envelope(leaves_data)), 200
 
 
 @leave_bp.route("/leaves", methods=["POST"])
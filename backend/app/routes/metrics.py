@@ -0,0 +1,27 @@
+from flask import Blueprint, jsonify
+from ..utils.response_cache import get_response_cache
+from ..utils.schedule_cache import get_schedule_cache
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics/caches", methods=["GET"])
+def get_cache_metrics():
+    """Hit ratio and size of the in-process caches (per worker process)."""
+    memo = get_schedule_cache()
+    lookups = memo.hits + memo.misses
+    return (
+        jsonify(
+            {
+                "response_cache": get_response_cache().stats(),
+                "schedule_cache": {
+                    "entries": len(memo),
+                    "max_entries": memo.max_entries,
+                    "hits": memo.hits,
+                    "misses": memo.misses,
+                    "hit_ratio": round(memo.hits / lookups, 4) if lookups else 0.0,
+                },
+            }
+        ),
+        200,
+    )
@@ -6,23 +6,41 @@ person_bp = Blueprint("personnel", __name__)
 
 from flask import Blueprint, request, jsonify
 from sqlalchemy import select
-from ..database import db
+from ..database import db, read_session
 from ..models import Person
 
 from sqlalchemy.orm import joinedload
+from ..utils.pagination import keyset_page, parse_page_args
 
 person_bp = Blueprint("personnel", __name__)
 
 
 @person_bp.route("/personnel", methods=["GET"])
 def get_all_personnel():
-    # .options() belongs on the stmt object
-    stmt = select(Person).options(joinedload(Person.group)).order_by(Person.name)
+    """
+    Filters: ?group_id=, ?active=true|false.
+    Always paged: ?limit=&cursor=&total=1, ordered by name (see
+    utils/pagination.py).
+    """
+    order = [(Person.name, False), (Person.id, False)]
+    try:
+        page = parse_page_args(request.args, order, required=True)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    # Execute the optimized statement
-    people = db.session.execute(stmt).scalars().all()
-
-    return jsonify([p.to_dict() for p in people]), 200
+    # .options() belongs on the stmt object
+    stmt = select(Person).options(joinedload(Person.group))
+    group_id = request.args.get("group_id", type=int)
+    if group_id is not None:
+        stmt = stmt.where(Person.group_id == group_id)
+    active = request.args.get("active")
+    if active is not None:
+        stmt = stmt.where(Person.is_active.is_(active.lower() in ("1", "true")))
+
+    # Execute the optimized statement (read-only session when configured)
+    session = read_session()
+    result = keyset_page(stmt, order, page, session=session)
+    return jsonify(result.envelope([p.to_dict() for (p,) in result.rows])), 200
 
 
 # --- FETCH ONE ---
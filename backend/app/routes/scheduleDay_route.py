@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from ..database import db
 from ..models import ScheduleDay, ScheduleMembership, ScheduleLeave, Person, Schedule
+from ..utils.revisions import schedule_etag
+from ..utils.pagination import date_range_args
+from ..utils.row_serializers import serialize_day, serialize_days
 from collections import defaultdict
 from datetime import timedelta
 
@@ -9,33 +12,22 @@ day_bp = Blueprint("schedule_days", __name__)
 
 
 @day_bp.route("/schedules/<int:schedule_id>/days", methods=["GET"])
+@schedule_etag()
 def get_schedule_days(schedule_id):
-    # 1. Modern SQLAlchemy 2.0 / Flask-SQLAlchemy 3.0 syntax
-    # This avoids the LegacyAPIWarning and handles the 404
-    stmt = (
-        db.select(Schedule)
-        .options(
-            db.joinedload(Schedule.memberships).joinedload(ScheduleMembership.leaves),
-            db.joinedload(Schedule.memberships).joinedload(ScheduleMembership.person),
-        )
-        .filter_by(id=schedule_id)
-    )
-
-    schedule = db.session.execute(stmt).unique().scalar_one_or_none()
-
-    if not schedule:
-        return jsonify({"error": "Schedule not found"}), 404
-
-    # Use the shared logic from the model
-    leaves_map = schedule._get_leaves_by_date()
+    """
+    Days with their assignment counts, exclusions and leaves, built from column
+    queries (row_serializers). ?from=&to= (YYYY-MM-DD) limits the result to a
+    calendar viewport; only that window's rows are read.
+    """
+    try:
+        start, end = date_range_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-    # Return the days using the standard Day to_dict
-    return jsonify(
-        [
-            d.to_dict(day_leaves=leaves_map.get(d.date.isoformat(), []))
-            for d in schedule.days
-        ]
-    )
+    days = serialize_days(schedule_id, start=start, end=end)
+    if days is None:
+        return jsonify({"error": "Schedule not found"}), 404
+    return jsonify(days)
 
 
 @day_bp.route("/schedule-days/<int:id>", methods=["PATCH"])
@@ -61,7 +53,7 @@ def patch_day(id):
             day.label = data["label"]
 
         db.session.commit()
-        return jsonify(day.to_dict()), 200
+        return jsonify(serialize_day(id)), 200
 
     except (ValueError, TypeError):
         db.session.rollback()
@@ -86,4 +78,4 @@ def update_schedule_day(id):
     day.availability_estimate = data.get("availability_estimate", 1.0)
 
     db.session.commit()
-    return jsonify(day.to_dict()), 200
+    return jsonify(serialize_day(id)), 200
@@ -1,31 +1,49 @@
 from flask import Blueprint, request, jsonify
 from ..database import db
 from ..models import ScheduleMembership, Person  # Updated class name
-from sqlalchemy.orm import joinedload
 from ..utils.schedule_utils import add_person_to_schedule
+from ..utils.row_serializers import serialize_memberships
+from ..utils.revisions import schedule_etag
+from ..utils.pagination import keyset_page, parse_page_args
+from sqlalchemy import select
 
 # Changed blueprint name to memberships for consistency
 membership_bp = Blueprint("memberships", __name__)
 
 
 @membership_bp.route("/schedule-memberships", methods=["GET"])
+@schedule_etag(query_arg="schedule_id")
 def get_all_memberships():
-    schedule_id = request.args.get("schedule_id")
-
-    # We "eagerly" load the related objects using JOINs
-    query = db.session.query(ScheduleMembership).options(
-        joinedload(ScheduleMembership.person),
-        joinedload(ScheduleMembership.group),
-        joinedload(ScheduleMembership.exclusions),
-        joinedload(ScheduleMembership.leaves),
-    )
-
-    if schedule_id:
-        query = query.filter_by(schedule_id=schedule_id)
-
-    memberships = query.all()
-    # Now to_dict() uses data already in memory, no extra queries!
-    return jsonify([m.to_dict() for m in memberships]), 200
+    """
+    Filters: ?schedule_id=, ?group_id=.
+    Paging: ?limit=&cursor=&total=1, ordered by id (see utils/pagination.py).
+    Without ?schedule_id= the list is always paged.
+    """
+    schedule_id = request.args.get("schedule_id", type=int)
+    group_id = request.args.get("group_id", type=int)
+    order = [(ScheduleMembership.id, False)]
+    try:
+        page = parse_page_args(request.args, order, required=schedule_id is None)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Column queries + row mappers: no ORM instances, same to_dict() shape
+    if page is None and group_id is None:
+        return jsonify(serialize_memberships(schedule_id)), 200
+
+    stmt = select(ScheduleMembership.id)
+    if schedule_id is not None:
+        stmt = stmt.where(ScheduleMembership.schedule_id == schedule_id)
+    if group_id is not None:
+        stmt = stmt.where(ScheduleMembership.group_id == group_id)
+
+    if page is None:
+        return jsonify(serialize_memberships(schedule_id, membership_ids=stmt)), 200
+
+    result = keyset_page(stmt, order, page, key=lambda row: [row[0]])
+    ids = [row[0] for row in result.rows]
+    items = serialize_memberships(schedule_id, membership_ids=ids) if ids else []
+    return jsonify(result.envelope(items)), 200
 
 
 @membership_bp.route("/schedule-memberships/<int:id>", methods=["GET"])
@@ -1,21 +1,33 @@
 from flask import Blueprint, request, jsonify, Response, stream_with_context
-from sqlalchemy.orm import selectinload
 from sqlalchemy import select, delete
 from sqlalchemy.orm.attributes import flag_modified
 
 from app import db
 from ..models import (
     Schedule,
-    ScheduleMembership,
-    MembershipStationWeight,
-    ScheduleDay,
     ScheduleCandidate,
     Assignment,
 )
 from ..utils.schedule_utils import generate_schedule_days, populate_holiday_table
 from ..utils.schedule_summary_util import get_schedule_summary_data
-from ..utils.quota_calculator import calculate_schedule_quotas
-from ..utils.schedule_validator import validate_schedule
+from ..utils.quota_calculator import (
+    calculate_schedule_quotas,
+    calculate_quotas_for_schedules,
+)
+from ..utils.schedule_validator import (
+    validate_schedule,
+    validate_changes,
+    validate_candidates,
+)
+from ..utils.availibility import build_slot_grid
+from ..utils.schedule_cache import cached_availability
+from ..utils.what_if import evaluate_what_if
+from ..utils.load_plans import load_schedule, schedule_load_options
+from ..utils.candidate_apply import apply_candidate_slots
+from ..utils.row_serializers import serialize_schedule
+from ..utils.leave_intervals import LEAVE_FORMATS
+from ..utils.revisions import schedule_etag
+from ..utils.pagination import date_range_args, keyset_page, parse_page_args
 from ..utils.optimization_service import run_schedule_optimization
 from datetime import datetime, date
 
@@ -49,7 +61,7 @@ def create_schedule():
         generate_schedule_days(new_schedule)
 
         db.session.commit()
-        return jsonify(new_schedule.to_dict(summary_only=False)), 201
+        return jsonify(serialize_schedule(new_schedule.id)), 201
 
     except Exception as e:
         db.session.rollback()
@@ -59,49 +71,48 @@ def create_schedule():
 @schedule_bp.route("/schedules", methods=["GET"])
 def get_schedules():
     """
-    List all schedules.
-    Fixes N+1 by eager loading memberships to calculate member_count.
+    List schedules, newest first.
+    The summary plan reads columns only, one row per schedule.
+    Filters: ?status=, ?from=&to= (schedules overlapping the range).
+    Always paged: ?limit=&cursor=&total=1 (see utils/pagination.py).
     """
-    schedules = (
-        db.session.query(Schedule)
-        .options(selectinload(Schedule.memberships))
-        .order_by(Schedule.start_date.desc())
-        .all()
-    )
-    # to_dict defaults to summary_only=True
-    return jsonify([s.to_dict() for s in schedules]), 200
+    order = [(Schedule.start_date, True), (Schedule.id, True)]
+    try:
+        page = parse_page_args(request.args, order, required=True)
+        start, end = date_range_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    stmt = select(Schedule).options(*schedule_load_options("summary"))
+    if request.args.get("status"):
+        stmt = stmt.where(Schedule.status == request.args["status"])
+    if start:
+        stmt = stmt.where(Schedule.end_date >= start)
+    if end:
+        stmt = stmt.where(Schedule.start_date <= end)
+
+    result = keyset_page(stmt, order, page)
+    return jsonify(result.envelope([s.to_dict() for (s,) in result.rows])), 200
 
 
 @schedule_bp.route("/schedules/<int:id>", methods=["GET"])
+@schedule_etag("id")
 def get_single_schedule(id):
     """
     Fetch a full schedule object.
-    Deeply eager-loads Memberships -> StationWeights and Days -> Assignments.
+    Built from column tuples (see row_serializers); same shape as
+    Schedule.to_dict(summary_only=False). Leaves come as intervals;
+    ?leaves=exploded returns the legacy per-day lists instead.
     """
-    schedule = (
-        db.session.query(Schedule)
-        .options(
-            # Load Days and their Assignments
-            selectinload(Schedule.days).selectinload(ScheduleDay.assignments),
-            # Load Memberships, their Person details, and their Station Weights
-            selectinload(Schedule.memberships).options(
-                selectinload(ScheduleMembership.person),
-                selectinload(ScheduleMembership.leaves),
-                selectinload(ScheduleMembership.exclusions),
-                selectinload(ScheduleMembership.station_weights).selectinload(
-                    MembershipStationWeight.station
-                ),
-            ),
-        )
-        .filter(Schedule.id == id)
-        .first()
-    )
+    leaves = request.args.get("leaves", "intervals")
+    if leaves not in LEAVE_FORMATS:
+        return jsonify({"error": f"Unknown leaves format '{leaves}'"}), 400
+    data = serialize_schedule(id, explode_leaves=leaves == "exploded")
 
-    if not schedule:
+    if data is None:
         return jsonify({"error": "Schedule not found"}), 404
 
-    # We use summary_only=False to include the nested children in the JSON
-    return jsonify(schedule.to_dict(summary_only=False)), 200
+    return jsonify(data), 200
 
 
 @schedule_bp.route("/schedules/<int:id>", methods=["DELETE"])
@@ -120,6 +131,7 @@ def delete_schedule(id):
 
 
 @schedule_bp.route("/schedules/<int:id>/summary", methods=["GET"])
+@schedule_etag("id")
 def get_schedule_summary(id):
     """
     Returns high-level health metrics for a schedule.
@@ -134,6 +146,7 @@ def get_schedule_summary(id):
 
 
 @schedule_bp.route("/schedules/<int:schedule_id>/quotas", methods=["GET"])
+@schedule_etag()
 def get_schedule_quotas(schedule_id):
     try:
         quotas = calculate_schedule_quotas(schedule_id)
@@ -144,11 +157,85 @@ def get_schedule_quotas(schedule_id):
         return jsonify({"error": str(e)}), 500
 
 
+@schedule_bp.route("/schedules/<int:schedule_id>/availability-grid", methods=["GET"])
+@schedule_etag()
+def get_availability_grid(schedule_id):
+    """
+    Returns the Day x Station supply/demand grid as compact parallel arrays.
+    The calendar renders these numbers directly instead of recomputing per cell.
+    """
+    if not db.session.get(Schedule, schedule_id):
+        return jsonify({"error": "Schedule not found"}), 404
+
+    grid = build_slot_grid(schedule_id, availability=cached_availability(schedule_id))
+    return jsonify(grid), 200
+
+
+@schedule_bp.route("/schedules/quotas", methods=["GET"])
+def get_batch_quotas():
+    """
+    Quotas for many schedules at once: /schedules/quotas?ids=1,2,3
+    Returns { schedule_id: { membership_id: quota } }.
+    """
+    raw_ids = request.args.get("ids", "")
+    try:
+        schedule_ids = [int(x) for x in raw_ids.split(",") if x.strip()]
+    except ValueError:
+        return jsonify({"error": "ids must be a comma-separated list of integers"}), 400
+
+    if not schedule_ids:
+        return jsonify({"error": "Missing ids parameter"}), 400
+
+    try:
+        return jsonify(calculate_quotas_for_schedules(schedule_ids)), 200
+    except Exception as e:
+        print(f"Batch Quota Route Error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@schedule_bp.route("/schedules/<int:schedule_id>/what-if", methods=["POST"])
+def get_what_if(schedule_id):
+    """
+    Evaluates hypothetical changes without writing anything.
+    Body: { "changes": [ { "type": "leave", "membership_id": 1, ... }, ... ] }
+    Returns quota before/after/delta, feasibility and quota score impact.
+    """
+    data = request.get_json(silent=True) or {}
+    changes = data.get("changes", [])
+    if not isinstance(changes, list):
+        return jsonify({"error": "changes must be a list"}), 400
+
+    try:
+        report = evaluate_what_if(schedule_id, changes)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if report is None:
+        return jsonify({"error": "Schedule not found"}), 404
+    return jsonify(report), 200
+
+
 @schedule_bp.route("/schedules/<int:schedule_id>/alerts", methods=["GET"])
+@schedule_etag()
 def get_schedule_alerts(schedule_id):
     """
     Returns a list of validation alerts for the schedule.
+    With ?changed=<assignment ids>, only re-checks those slots' neighborhood
+    and returns { "base", "added": [...], "removed": [...] } relative to
+    ?base=<revision token> instead (see validate_changes).
     """
+    raw_ids = request.args.get("changed")
+    if raw_ids is not None:
+        try:
+            changed = [int(x) for x in raw_ids.split(",") if x.strip()]
+        except ValueError:
+            return (
+                jsonify({"error": "changed must be a comma-separated list of integers"}),
+                400,
+            )
+        base = request.args.get("base")
+        return jsonify(validate_changes(schedule_id, changed, base=base)), 200
+
     try:
         alerts = validate_schedule(schedule_id)
         return jsonify(alerts), 200
@@ -159,7 +246,7 @@ def get_schedule_alerts(schedule_id):
 
 @schedule_bp.route("/schedules/<int:id>", methods=["PATCH"])
 def update_schedule(id):
-    schedule = db.session.get(Schedule, id)
+    schedule = load_schedule(id, "summary")
     if not schedule:
         return jsonify({"error": "Schedule not found"}), 404
 
@@ -196,7 +283,7 @@ def update_schedule(id):
 
     db.session.commit()
     # 🟢 3. Return the full object so the frontend sees the new weights
-    return jsonify(schedule.to_dict(summary_only=False))
+    return jsonify(serialize_schedule(id))
 
 
 @schedule_bp.route("/schedules/<int:id>/generate", methods=["POST"])
@@ -211,15 +298,16 @@ def generate_candidates(id):
         mimetype="application/x-ndjson",  # 🟢 Use a streaming-friendly MIME type
     )
 
-    # 🟢 CRITICAL: Disable Buffering & Compression
-    # This tells Nginx/Flask/Gunicorn: "Send it raw, right now."
+    # 🟢 CRITICAL: Disable Buffering
+    # This tells Nginx/Gunicorn: "Send it raw, right now." (Streamed responses
+    # are skipped by utils/compression.py, no Content-Encoding needed.)
     response.headers["X-Accel-Buffering"] = "no"
     response.headers["Cache-Control"] = "no-cache"
-    response.headers["Content-Encoding"] = "none"
     return response
 
 
 @schedule_bp.route("/schedules/<int:id>/candidates", methods=["GET"])
+@schedule_etag("id")
 def get_candidates(id):
     # 🟢 Use select() to find all candidates matching the schedule_id
     stmt = (
@@ -235,55 +323,40 @@ def get_candidates(id):
     return jsonify([c.to_dict() for c in candidates]), 200
 
 
+@schedule_bp.route("/schedules/<int:id>/candidates/validation", methods=["GET"])
+@schedule_etag("id")
+def get_candidate_validation(id):
+    """
+    Validates every candidate (or one run: ?run_id=...) in memory without
+    applying it. Returns alert counts + lists per candidate, best score first.
+    """
+    if not db.session.get(Schedule, id):
+        return jsonify({"error": "Schedule not found"}), 404
+
+    return jsonify(validate_candidates(id, request.args.get("run_id"))), 200
+
+
 @schedule_bp.route("/schedules/<int:id>/apply", methods=["POST"])
 def apply_candidate(id):
     """
-    Applies a candidate by UPDATING existing slots.
+    Applies a candidate by UPDATING existing slots: one keyed UPDATE of the
+    slots that change, locked slots filtered in SQL (never overwrite a lock).
+    {"clear_missing": true} also empties the unlocked slots the candidate
+    leaves out, in the same statement. Returns the diff (see candidate_apply).
     """
-    data = request.get_json()
+    data = request.get_json() or {}
     candidate_id = data.get("candidate_id")
-
-    candidate = db.session.get(ScheduleCandidate, candidate_id)
-    if not candidate:
+    candidate = candidate_id and db.session.get(ScheduleCandidate, candidate_id)
+    if not candidate or candidate.schedule_id != id:
         return jsonify({"error": "Candidate not found"}), 404
 
-    # 1. Fetch ALL existing assignments for this schedule
-    # We map them by (day_id, station_id) for fast lookup
-    existing_assignments = db.session.scalars(
-        select(Assignment).filter_by(schedule_id=id)
-    ).all()
-
-    assignment_map = {(a.day_id, a.station_id): a for a in existing_assignments}
-
-    updated_count = 0
-
-    # 2. Iterate through the Candidate's suggestions
-    for key, member_id in candidate.assignments_data.items():
-        day_id, station_id = map(int, key.split("_"))
-
-        # Find the existing slot in the DB
-        slot = assignment_map.get((day_id, station_id))
-
-        if slot:
-            # SAFETY: Only update if NOT locked
-            if not slot.is_locked:
-                slot.membership_id = member_id
-                updated_count += 1
-        else:
-            # Edge Case: The candidate has a slot that doesn't exist in the DB?
-            # You might want to create it, or ignore it.
-            # Given your setup, this shouldn't happen if generate_assignments runs correctly.
-            pass
-
-    # 3. CRITICAL: What about slots NOT in the candidate?
-    # The solver fills every required slot, so this is mostly handled.
-    # But if you want to be safe, you could loop through assignment_map
-    # and set membership_id=None if it wasn't in candidate.assignments_data
-
+    diff = apply_candidate_slots(
+        id, candidate.assignments_data, clear_missing=bool(data.get("clear_missing"))
+    )
     db.session.commit()
 
     return (
-        jsonify({"message": "Schedule updated successfully", "updated": updated_count}),
+        jsonify({"message": "Schedule updated successfully", **diff}),
         200,
     )
 
@@ -305,6 +378,7 @@ def clear_assignments(id):
         .where(Assignment.schedule_id == id)
         .where(Assignment.is_locked != True)
         .values(membership_id=None)
+        .execution_options(schedule_id=id)
     )
 
     result = db.session.execute(stmt)
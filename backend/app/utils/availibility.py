@@ -1 +1,258 @@
+import numpy as np
+from sqlalchemy import select, func
+from ..database import db
+from ..models import (
+    Assignment,
+    ScheduleDay,
+    ScheduleMembership,
+    ScheduleLeave,
+    ScheduleExclusion,
+    ScheduleStation,
+    Qualification,
+)
 
+
+def merge_intervals(intervals):
+    """
+    Sorts (start, end) date ranges and merges overlapping or touching ones.
+    [(1st, 3rd), (2nd, 5th), (6th, 6th)] -> [(1st, 6th)]
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start.toordinal() <= merged[-1][1].toordinal() + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class AvailabilityMatrix:
+    """
+    Compact members x days view of who can work when, for ONE schedule.
+
+    Rows follow `member_ids`, columns follow `day_ids` (sorted by date).
+    - on_leave:  bool[members, days]     (from merged ScheduleLeave ranges)
+    - excluded:  bool[members, days]     (from ScheduleExclusion rows)
+    - qualified: bool[members, stations] (columns follow the required stations)
+    """
+
+    def __init__(
+        self,
+        member_ids,
+        days,
+        stations,
+        leaves_by_member,
+        exclusion_pairs,
+        qualification_pairs,
+    ):
+        # --- AXES ---
+        self.member_ids = list(member_ids)
+        self.day_ids = [d[0] for d in days]
+        self.dates = [d[1] for d in days]
+        self.day_weights = np.array([float(d[2]) for d in days], dtype=float)
+        self.lookback = np.array([bool(d[3]) for d in days], dtype=bool)
+        # stations: [(schedule_station_id, master_station_id), ...]
+        self.schedule_station_ids = [s[0] for s in stations]
+        self.station_ids = [s[1] for s in stations]
+
+        self.member_index = {m_id: i for i, m_id in enumerate(self.member_ids)}
+        self.day_index = {d_id: j for j, d_id in enumerate(self.day_ids)}
+        self.station_index = {s_id: k for k, s_id in enumerate(self.station_ids)}
+
+        n_members, n_days = len(self.member_ids), len(self.day_ids)
+
+        # --- LEAVES (one slice per merged interval) ---
+        self.on_leave = np.zeros((n_members, n_days), dtype=bool)
+        ordinals = np.array([d.toordinal() for d in self.dates], dtype=np.int64)
+        for m_id, intervals in leaves_by_member.items():
+            row = self.member_index.get(m_id)
+            if row is None:
+                continue
+            for start, end in merge_intervals(intervals):
+                lo = np.searchsorted(ordinals, start.toordinal(), side="left")
+                hi = np.searchsorted(ordinals, end.toordinal(), side="right")
+                self.on_leave[row, lo:hi] = True
+
+        # --- EXCLUSIONS ---
+        self.excluded = np.zeros((n_members, n_days), dtype=bool)
+        for m_id, d_id in exclusion_pairs:
+            row = self.member_index.get(m_id)
+            col = self.day_index.get(d_id)
+            if row is not None and col is not None:
+                self.excluded[row, col] = True
+
+        # --- QUALIFICATIONS ---
+        self.qualified = np.zeros((n_members, len(self.station_ids)), dtype=bool)
+        for m_id, st_id in qualification_pairs:
+            row = self.member_index.get(m_id)
+            col = self.station_index.get(int(st_id))
+            if row is not None and col is not None:
+                self.qualified[row, col] = True
+
+    # --- DERIVED VIEWS ---
+
+    @property
+    def available(self):
+        """True where the member is neither on leave nor excluded."""
+        return ~(self.on_leave | self.excluded)
+
+    @property
+    def active_days(self):
+        """Boolean column mask of the non-lookback days."""
+        return ~self.lookback
+
+    # --- POINT LOOKUPS (unknown ids are treated as 'not blocked') ---
+
+    def is_on_leave(self, member_id, day_id):
+        row = self.member_index.get(member_id)
+        col = self.day_index.get(day_id)
+        if row is None or col is None:
+            return False
+        return bool(self.on_leave[row, col])
+
+    def is_excluded(self, member_id, day_id):
+        row = self.member_index.get(member_id)
+        col = self.day_index.get(day_id)
+        if row is None or col is None:
+            return False
+        return bool(self.excluded[row, col])
+
+    def is_qualified(self, member_id, station_id):
+        row = self.member_index.get(member_id)
+        col = self.station_index.get(station_id)
+        if row is None or col is None:
+            return False
+        return bool(self.qualified[row, col])
+
+
+def build_availability(schedule_id):
+    """
+    Loads everything the matrix needs with one column-only query per table.
+    No ORM objects are materialized.
+    """
+    # 1. Days (sorted, so leave ranges become contiguous column slices)
+    days = db.session.execute(
+        select(
+            ScheduleDay.id,
+            ScheduleDay.date,
+            ScheduleDay.weight,
+            ScheduleDay.is_lookback,
+        )
+        .where(ScheduleDay.schedule_id == schedule_id)
+        .order_by(ScheduleDay.date)
+    ).all()
+
+    # 2. Members
+    member_ids = db.session.scalars(
+        select(ScheduleMembership.id)
+        .where(ScheduleMembership.schedule_id == schedule_id)
+        .order_by(ScheduleMembership.id)
+    ).all()
+
+    # 3. Required Stations
+    stations = db.session.execute(
+        select(ScheduleStation.id, ScheduleStation.station_id)
+        .where(ScheduleStation.schedule_id == schedule_id)
+        .order_by(ScheduleStation.id)
+    ).all()
+
+    # 4. Leaves
+    leaves_by_member = {}
+    leave_rows = db.session.execute(
+        select(
+            ScheduleLeave.membership_id,
+            ScheduleLeave.start_date,
+            ScheduleLeave.end_date,
+        )
+        .join(ScheduleMembership)
+        .where(ScheduleMembership.schedule_id == schedule_id)
+    ).all()
+    for m_id, start, end in leave_rows:
+        leaves_by_member.setdefault(m_id, []).append((start, end))
+
+    # 5. Exclusions
+    exclusion_pairs = db.session.execute(
+        select(ScheduleExclusion.membership_id, ScheduleExclusion.day_id)
+        .join(ScheduleMembership)
+        .where(ScheduleMembership.schedule_id == schedule_id)
+    ).all()
+
+    # 6. Qualifications (Person-level, mapped onto the membership rows);
+    # lapsed (inactive) ones do not qualify anyone
+    qualification_pairs = db.session.execute(
+        select(ScheduleMembership.id, Qualification.station_id)
+        .join(Qualification, Qualification.person_id == ScheduleMembership.person_id)
+        .where(ScheduleMembership.schedule_id == schedule_id)
+        .where(Qualification.is_active.is_(True))
+    ).all()
+
+    return AvailabilityMatrix(
+        member_ids=member_ids,
+        days=days,
+        stations=stations,
+        leaves_by_member=leaves_by_member,
+        exclusion_pairs=exclusion_pairs,
+        qualification_pairs=qualification_pairs,
+    )
+
+
+def build_slot_grid(schedule_id, availability=None):
+    """
+    Day x Station supply/demand grid for the calendar, in one vectorized pass.
+
+    For every slot (all counts are per station type):
+    - supply:       qualified members who are not on leave / excluded that day,
+                    each counting 1 (station weights / seniority do not apply)
+    - assigned:     filled slots for that station that day
+    - demand:       max(required, assigned) -> the load a neighbor day puts on the pool;
+                    a type is required once per schedule and a slot holds one
+                    member, so this is 1
+    - availability: supply - demand(D-1) - demand(D+1) - assigned(D), floored at 0
+    All grids are day-major lists aligned with `day_ids` x `station_ids`.
+    """
+    if availability is None:
+        availability = build_availability(schedule_id)
+
+    n_days = len(availability.day_ids)
+    n_stations = len(availability.station_ids)
+
+    # 1. Assigned counts (one grouped query)
+    assigned = np.zeros((n_days, n_stations), dtype=np.int64)
+    rows = db.session.execute(
+        select(Assignment.day_id, Assignment.station_id, func.count(Assignment.id))
+        .where(Assignment.schedule_id == schedule_id)
+        .where(Assignment.membership_id.is_not(None))
+        .group_by(Assignment.day_id, Assignment.station_id)
+    ).all()
+    for day_id, station_id, count in rows:
+        j = availability.day_index.get(day_id)
+        k = availability.station_index.get(station_id)
+        if j is not None and k is not None:
+            assigned[j, k] = count
+
+    # 2. Supply: available[members, days]^T @ qualified[members, stations]
+    supply = availability.available.T.astype(np.int64) @ availability.qualified.astype(
+        np.int64
+    )
+
+    # 3. Demand: each required station needs exactly one person per day
+    demand = np.maximum(1, assigned)
+
+    # 4. Neighbor load (D-1, D+1) + today's filled slots
+    prev_load = np.zeros_like(demand)
+    next_load = np.zeros_like(demand)
+    prev_load[1:] = demand[:-1]
+    next_load[:-1] = demand[1:]
+    effective = np.maximum(0, supply - prev_load - next_load - assigned)
+
+    return {
+        "schedule_id": schedule_id,
+        "day_ids": availability.day_ids,
+        "dates": [d.isoformat() for d in availability.dates],
+        "station_ids": availability.station_ids,
+        "supply": supply.tolist(),
+        "demand": demand.tolist(),
+        "assigned": assigned.tolist(),
+        "availability": effective.astype(float).tolist(),
+    }
@@ -0,0 +1,169 @@
+"""
+Dialect-aware bulk writes for the hot write paths (slot generation, day
+generation, candidate saves, apply).
+
+    insert_rows          PostgreSQL + psycopg: COPY ... FROM STDIN
+                         otherwise: one Core INSERT executed with all rows
+                         (multi-row VALUES batches via insertmanyvalues)
+    update_rows_by_key   PostgreSQL: UPDATE ... FROM (VALUES ...) AS v
+                         single key on SQLite, or rows that set different
+                         columns: UPDATE ... SET c = CASE key ... ELSE c END
+                         WHERE key IN (...), in parameter-limit sized chunks
+                         SQLite, composite key: one executemany of a keyed
+                         UPDATE (in-process, no round trips; SQLite has no
+                         VALUES column alias)
+
+Statements bypass the ORM unit of work, so callers pass schedule_id: ORM
+statements are tagged with it, and the paths the session events cannot see
+(COPY, Core executemany) report through change_tracking.mark_schedule_changed.
+Updates keyed by "id" also report the row ids, so incremental consumers (the
+cached alert set) re-check those rows instead of starting over.
+"""
+
+from sqlalchemy import bindparam, case, column, insert, literal, update, values
+from ..database import db
+from .change_tracking import mark_schedule_changed
+
+# COPY only pays off past a handful of rows
+COPY_THRESHOLD = 64
+# Bound parameters per CASE statement (SQLite allows 32766 since 3.32)
+MAX_BIND_PARAMS = 30000
+
+
+def _dialect():
+    return db.session.get_bind().dialect
+
+
+def _copy_supported(dialect):
+    return dialect.name == "postgresql" and dialect.driver == "psycopg"
+
+
+def _copy_rows(model, rows):
+    table = model.__table__
+    cols = list(rows[0].keys())
+    col_sql = ", ".join(table.c[c].name for c in cols)
+    raw = db.session.connection().connection.driver_connection
+    with raw.cursor() as cursor:
+        with cursor.copy(f"COPY {table.name} ({col_sql}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row([row[c] for c in cols])
+    return len(rows)
+
+
+def insert_rows(model, rows, *, schedule_id):
+    """Inserts plain dict rows (same keys each). Returns the number inserted."""
+    if not rows:
+        return 0
+    if _copy_supported(_dialect()) and len(rows) >= COPY_THRESHOLD:
+        count = _copy_rows(model, rows)
+        mark_schedule_changed(db.session, schedule_id, model.__name__)
+        return count
+    db.session.execute(
+        insert(model).execution_options(schedule_id=schedule_id), rows
+    )
+    return len(rows)
+
+
+def values_update_statement(model, key_columns, value_columns, rows, where=()):
+    """UPDATE model SET ... FROM (VALUES ...) AS v WHERE keys match (PostgreSQL)."""
+    table = model.__table__
+    names = (*key_columns, *value_columns)
+    data = values(
+        *[column(c, table.c[c].type) for c in names],
+        name="v",
+    ).data([tuple(r[c] for c in names) for r in rows])
+    return (
+        update(model)
+        .where(*[table.c[k] == data.c[k] for k in key_columns], *where)
+        .values({c: data.c[c] for c in value_columns})
+    )
+
+
+def case_update_statement(model, key_column, value_columns, rows, where=()):
+    """
+    UPDATE model SET c = CASE key WHEN ... ELSE c END WHERE key IN (...) for a
+    single key column. A row without some value column leaves it as is; a
+    column no row sets is not in the SET list. Values are typed like their
+    column.
+    """
+    table = model.__table__
+    key = table.c[key_column]
+    assignments = {}
+    for c in value_columns:
+        whens = {
+            r[key_column]: literal(r[c], table.c[c].type) for r in rows if c in r
+        }
+        if whens:
+            assignments[c] = case(whens, value=key, else_=table.c[c])
+    return (
+        update(table)
+        .where(key.in_([r[key_column] for r in rows]), *where)
+        .values(assignments)
+    )
+
+
+def update_rows_by_key(
+    model, key_columns, value_columns, rows, *, schedule_id, where=(), returning=None
+):
+    """
+    Sets value_columns on the rows matching key_columns, one statement (per
+    parameter-limit chunk on the CASE path). rows: list of dicts holding the
+    key columns and any of value_columns (with a single key, rows may set
+    different columns). `where` adds extra criteria (e.g.
+    model.is_locked.is_(False)).
+
+    Returns rows updated, or with returning=(column names, ...) the written
+    rows' values of those columns: rows the `where` filtered out are not in
+    it. Composite keys on SQLite do not support returning.
+    """
+    if not rows:
+        return [] if returning else 0
+    table = model.__table__
+    dialect = _dialect()
+    row_ids = [r["id"] for r in rows] if list(key_columns) == ["id"] else None
+    returned = [table.c[c] for c in returning or ()]
+    partial = any(c not in r for r in rows for c in value_columns)
+
+    if dialect.name == "postgresql" and not partial:
+        stmt = values_update_statement(
+            model, key_columns, value_columns, rows, where
+        ).execution_options(
+            schedule_id=schedule_id, row_ids=row_ids, synchronize_session=False
+        )
+        if returned:
+            return db.session.execute(stmt.returning(*returned)).all()
+        return db.session.execute(stmt).rowcount
+
+    if len(key_columns) == 1:
+        written = [] if returned else 0
+        chunk = max(1, MAX_BIND_PARAMS // (1 + 2 * len(value_columns)))
+        for start in range(0, len(rows), chunk):
+            stmt = case_update_statement(
+                model, key_columns[0], value_columns, rows[start : start + chunk], where
+            )
+            if returned:
+                written += db.session.connection().execute(
+                    stmt.returning(*returned)
+                ).all()
+            else:
+                written += db.session.connection().execute(stmt).rowcount
+        mark_schedule_changed(db.session, schedule_id, model.__name__, row_ids=row_ids)
+        return written
+
+    if returned or partial:
+        raise ValueError("returning and partial rows need a single key column")
+    stmt = (
+        update(table)
+        .where(*[table.c[k] == bindparam(f"k_{k}") for k in key_columns], *where)
+        .values({c: bindparam(f"v_{c}") for c in value_columns})
+    )
+    params = [
+        {
+            **{f"k_{k}": r[k] for k in key_columns},
+            **{f"v_{c}": r[c] for c in value_columns},
+        }
+        for r in rows
+    ]
+    result = db.session.connection().execute(stmt, params)
+    mark_schedule_changed(db.session, schedule_id, model.__name__, row_ids=row_ids)
+    return result.rowcount
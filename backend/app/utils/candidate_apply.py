@@ -0,0 +1,134 @@
+"""
+Applying a solver candidate to the schedule's slots.
+
+A candidate stores its solution as {"<day_id>_<station_id>": membership_id}.
+apply_candidate_slots reads the schedule's slots as plain columns once,
+compares them with the candidate and writes only the slots that change. It
+does that with one keyed UPDATE (bulk_ops.update_rows_by_key) that also
+carries the clears when clear_missing is set. The is_locked filter stays in
+the UPDATE's WHERE, so a lock taken by a concurrent edit still wins: the
+report is built from the ids the UPDATE returns, and a slot it did not write
+is listed under skipped_locked (with its member re-read).
+
+The returned diff:
+    updated         rows the UPDATE wrote
+    changed         [{"id", "day_id", "station_id", "from", "to"}]
+    unchanged       [assignment ids already holding the candidate's member]
+    skipped_locked  [{"id", "day_id", "station_id", "membership_id", "wanted"}]
+    cleared         ids of the changed slots emptied by clear_missing
+    unknown         candidate keys without a slot in the schedule
+"""
+
+from sqlalchemy import select
+
+from ..database import db
+from ..models import Assignment
+from .bulk_ops import update_rows_by_key
+
+
+def candidate_slots(assignments_data):
+    """{(day_id, station_id): membership_id} from a candidate's assignments_data."""
+    slots = {}
+    for key, member_id in (assignments_data or {}).items():
+        day_id, _, station_id = key.partition("_")
+        slots[(int(day_id), int(station_id))] = member_id
+    return slots
+
+
+def apply_candidate_slots(schedule_id, assignments_data, clear_missing=False):
+    """
+    Writes the candidate into the schedule's unlocked slots (no commit).
+    clear_missing empties the unlocked slots the candidate does not mention.
+    Returns the diff described in the module docstring.
+    """
+    proposed = candidate_slots(assignments_data)
+    current = db.session.execute(
+        select(
+            Assignment.id,
+            Assignment.day_id,
+            Assignment.station_id,
+            Assignment.membership_id,
+            Assignment.is_locked,
+        )
+        .where(Assignment.schedule_id == schedule_id)
+        .order_by(Assignment.id)
+    ).all()
+
+    planned, unchanged, skipped_locked = [], [], []
+    for a_id, d_id, s_id, m_id, locked in current:
+        missing = (d_id, s_id) not in proposed
+        if not missing:
+            wanted = proposed.pop((d_id, s_id))
+        elif clear_missing:
+            wanted = None
+        else:
+            continue
+
+        if wanted == m_id:
+            unchanged.append(a_id)
+        elif locked:
+            skipped_locked.append(
+                {
+                    "id": a_id,
+                    "day_id": d_id,
+                    "station_id": s_id,
+                    "membership_id": m_id,
+                    "wanted": wanted,
+                }
+            )
+        else:
+            planned.append(
+                (
+                    {
+                        "id": a_id,
+                        "day_id": d_id,
+                        "station_id": s_id,
+                        "from": m_id,
+                        "to": wanted,
+                    },
+                    missing,
+                )
+            )
+
+    written = update_rows_by_key(
+        Assignment,
+        ("id",),
+        ("membership_id",),
+        [{"id": c["id"], "membership_id": c["to"]} for c, _ in planned],
+        schedule_id=schedule_id,
+        where=(Assignment.schedule_id == schedule_id, Assignment.is_locked.is_(False)),
+        returning=("id",),
+    )
+    written = {a_id for (a_id,) in written}
+
+    changed = [c for c, _ in planned if c["id"] in written]
+    cleared = [c["id"] for c, missing in planned if missing and c["id"] in written]
+    lost = [c for c, _ in planned if c["id"] not in written]
+    if lost:
+        # Locked since the read above: report the member now holding the slot
+        members = dict(
+            db.session.execute(
+                select(Assignment.id, Assignment.membership_id).where(
+                    Assignment.id.in_([c["id"] for c in lost])
+                )
+            ).all()
+        )
+        skipped_locked += [
+            {
+                "id": c["id"],
+                "day_id": c["day_id"],
+                "station_id": c["station_id"],
+                "membership_id": members.get(c["id"], c["from"]),
+                "wanted": c["to"],
+            }
+            for c in lost
+        ]
+        skipped_locked.sort(key=lambda s: s["id"])
+    return {
+        "updated": len(written),
+        "changed": changed,
+        "unchanged": unchanged,
+        "skipped_locked": skipped_locked,
+        "cleared": cleared,
+        "unknown": [f"{d}_{s}" for d, s in sorted(proposed)],
+    }
@@ -0,0 +1,281 @@
+"""
+Figures out WHICH schedules a unit of work touched, and tells subscribers.
+
+Every flush (and every bulk UPDATE/DELETE/INSERT issued through the session)
+is reduced to a ChangeSet:
+    by_schedule:   {schedule_id: {"ScheduleDay", "Assignment", ...}}
+    global_models: {"Group", "Qualification", ...}   (affect every schedule)
+    row_ids:       {(schedule_id, "Assignment"): {assignment ids}}
+    untracked:     {(schedule_id, "Assignment"), ...}  (bulk, ids unknown)
+    revisions:     {schedule_id: new revision}  (set by the revisions writer)
+    global_revision: new global revision, if master data changed
+    rolled_back:   True for the replay of a rolled back transaction
+
+Subscribers are notified when the change hits the database (flush / bulk
+statement) and once more when the transaction ends (commit or rollback), so
+anything derived from uncommitted data in between is dropped as well.
+
+Writers (register_writer) run only at the first point, inside the transaction,
+and may issue SQL of their own on the session's connection (see revisions.py).
+"""
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from ..models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleMembership,
+    ScheduleStation,
+    ScheduleLeave,
+    ScheduleExclusion,
+    MembershipStationWeight,
+    Assignment,
+    ScheduleCandidate,
+    Group,
+    Person,
+    Qualification,
+    MasterStation,
+)
+
+# Rows that carry schedule_id themselves
+DIRECT_MODELS = (ScheduleDay, ScheduleMembership, ScheduleStation, Assignment, ScheduleCandidate)
+# Rows that reach their schedule through membership_id
+MEMBERSHIP_MODELS = (ScheduleLeave, ScheduleExclusion, MembershipStationWeight)
+# Master data shared by every schedule
+GLOBAL_MODELS = (Group, Person, Qualification, MasterStation)
+
+TRACKED_MODELS = {
+    cls.__name__: cls
+    for cls in (Schedule,) + DIRECT_MODELS + MEMBERSHIP_MODELS + GLOBAL_MODELS
+}
+
+_listeners = []
+_writers = []
+
+
+# Models whose changed row ids are reported (for incremental consumers)
+ROW_TRACKED_MODELS = (Assignment,)
+
+
+class ChangeSet:
+    def __init__(self):
+        self.by_schedule = {}
+        self.global_models = set()
+        self.row_ids = {}
+        self.untracked = set()
+        self.revisions = {}
+        self.global_revision = None
+        self.rolled_back = False
+
+    def add(self, schedule_id, model_name):
+        self.by_schedule.setdefault(schedule_id, set()).add(model_name)
+
+    def add_row(self, schedule_id, model_name, row_id):
+        self.add(schedule_id, model_name)
+        self.row_ids.setdefault((schedule_id, model_name), set()).add(row_id)
+
+    def merge(self, other):
+        for s_id, models in other.by_schedule.items():
+            self.by_schedule.setdefault(s_id, set()).update(models)
+        self.global_models.update(other.global_models)
+        for key, ids in other.row_ids.items():
+            self.row_ids.setdefault(key, set()).update(ids)
+        self.untracked.update(other.untracked)
+
+    def __bool__(self):
+        return bool(self.by_schedule or self.global_models)
+
+
+def register_listener(fn):
+    """fn(change_set) is called for every flushed / committed / rolled back change."""
+    if fn not in _listeners:
+        _listeners.append(fn)
+    return fn
+
+
+def register_writer(fn):
+    """
+    fn(session, change_set) is called when a change hits the database, inside
+    the writing transaction (it commits or rolls back with the change).
+    """
+    if fn not in _writers:
+        _writers.append(fn)
+    return fn
+
+
+def _notify(change_set):
+    if not change_set:
+        return
+    for fn in _listeners:
+        fn(change_set)
+
+
+def _write(session, change_set):
+    if not change_set:
+        return
+    for fn in _writers:
+        fn(session, change_set)
+
+
+def _pending(session):
+    """Transaction-wide ChangeSet, replayed on commit / rollback."""
+    return session.info.setdefault("schedule_changes", ChangeSet())
+
+
+# --- RESOLUTION ---
+
+
+def _loaded_membership(obj):
+    """The membership object if it is already in memory (never lazy loads)."""
+    return inspect(obj).dict.get("membership")
+
+
+def collect_changes(session, objects):
+    """Maps ORM objects to a ChangeSet (issues at most one lookup query)."""
+    changes = ChangeSet()
+    unresolved = {}  # membership_id -> [model_name, ...]
+
+    for obj in objects:
+        name = type(obj).__name__
+        if name not in TRACKED_MODELS:
+            continue
+
+        if isinstance(obj, GLOBAL_MODELS):
+            changes.global_models.add(name)
+
+        elif isinstance(obj, Schedule):
+            if obj.id is not None:
+                changes.add(obj.id, name)
+
+        elif isinstance(obj, DIRECT_MODELS):
+            if obj.schedule_id is not None:
+                changes.add(obj.schedule_id, name)
+            else:
+                changes.global_models.add(name)
+
+        elif isinstance(obj, MEMBERSHIP_MODELS):
+            membership = _loaded_membership(obj)
+            if membership is not None and membership.schedule_id is not None:
+                changes.add(membership.schedule_id, name)
+            elif obj.membership_id is not None:
+                unresolved.setdefault(obj.membership_id, []).append(name)
+            else:
+                changes.global_models.add(name)
+
+    if unresolved:
+        rows = session.execute(
+            select(ScheduleMembership.id, ScheduleMembership.schedule_id).where(
+                ScheduleMembership.id.in_(list(unresolved))
+            )
+        ).all()
+        found = dict(rows)
+        for m_id, names in unresolved.items():
+            for name in names:
+                if m_id in found:
+                    changes.add(found[m_id], name)
+                else:
+                    # Membership already gone: fall back to "any schedule"
+                    changes.global_models.add(name)
+
+    return changes
+
+
+def _bulk_changes(schedule_id, model_names, row_ids):
+    """Statement-level change: the given row ids, else the rows are untracked."""
+    changes = ChangeSet()
+    for name in model_names:
+        changes.add(schedule_id, name)
+        if row_ids is None:
+            changes.untracked.add((schedule_id, name))
+        else:
+            for row_id in row_ids:
+                changes.add_row(schedule_id, name, row_id)
+    return changes
+
+
+def mark_schedule_changed(session, schedule_id, *model_names, row_ids=None):
+    """
+    Explicit hook for code paths the events cannot scope precisely
+    (e.g. raw Core statements, COPY). Notifies immediately and on transaction
+    end. Unless the caller knows the changed row_ids, the rows count as
+    untracked.
+    """
+    changes = _bulk_changes(schedule_id, model_names or ("Schedule",), row_ids)
+    _pending(session).merge(changes)
+    _write(session, changes)
+    _notify(changes)
+
+
+# --- SESSION EVENTS ---
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_flush_changes(session, flush_context, instances):
+    dirty = [o for o in session.dirty if session.is_modified(o, include_collections=False)]
+    objects = list(session.new) + dirty + list(session.deleted)
+    session.info["flush_changes"] = collect_changes(session, objects)
+
+
+def _collect_row_ids(session, changes):
+    """Adds the ids of flushed row-tracked objects (new rows have ids by now)."""
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, ROW_TRACKED_MODELS) and obj.id is not None:
+            if obj.schedule_id is not None:
+                changes.add_row(obj.schedule_id, type(obj).__name__, obj.id)
+
+
+@event.listens_for(Session, "after_flush")
+def _publish_flush_changes(session, flush_context):
+    changes = session.info.pop("flush_changes", None)
+    if changes:
+        _collect_row_ids(session, changes)
+        _pending(session).merge(changes)
+        _write(session, changes)
+        _notify(changes)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state):
+    """
+    Bulk statements skip the unit of work. Callers can scope them with
+    .execution_options(schedule_id=...[, row_ids=...]); otherwise the whole
+    model is dirty.
+    """
+    if not (
+        orm_execute_state.is_update
+        or orm_execute_state.is_delete
+        or orm_execute_state.is_insert
+    ):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+    name = mapper.class_.__name__
+    if name not in TRACKED_MODELS:
+        return
+
+    options = orm_execute_state.execution_options
+    schedule_id = options.get("schedule_id")
+    if schedule_id is not None:
+        changes = _bulk_changes(schedule_id, (name,), options.get("row_ids"))
+    else:
+        changes = ChangeSet()
+        changes.global_models.add(name)
+
+    _pending(orm_execute_state.session).merge(changes)
+    _write(orm_execute_state.session, changes)
+    _notify(changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_commit(session):
+    _notify(session.info.pop("schedule_changes", None))
+
+
+@event.listens_for(Session, "after_rollback")
+def _publish_rollback(session):
+    changes = session.info.pop("schedule_changes", None)
+    if changes is not None:
+        changes.rolled_back = True
+    _notify(changes)
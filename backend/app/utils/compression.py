@@ -0,0 +1,111 @@
+"""
+Response compression (gzip, or brotli when the optional package is installed).
+
+An after_request hook encodes a response only when all of these hold:
+    - the client accepts br or gzip (Accept-Encoding, q-values honoured)
+    - status 200, no Content-Encoding set yet
+    - the mimetype is in COMPRESS_MIMETYPES (NDJSON / SSE are not)
+    - the body is buffered and at least COMPRESS_MIN_SIZE bytes
+Streamed responses (the optimizer's NDJSON progress feed) are never touched,
+so nothing has to opt out by hand. ETags stay weak, hence valid for every
+encoding of the same revision. Tradeoffs: python -m benchmarks.compression.
+
+The response cache (revisions.schedule_etag) encodes before storing, with
+the negotiated encoding in its key, so a cache hit is served as stored and
+the hook sees Content-Encoding already set.
+"""
+
+import gzip
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+from flask import current_app, has_app_context, request
+
+DEFAULT_MIMETYPES = frozenset(
+    {
+        "application/json",
+        "text/html",
+        "text/css",
+        "text/plain",
+        "application/javascript",
+    }
+)
+
+
+def gzip_encode(body, level):
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def brotli_encode(body, quality):
+    return brotli.compress(body, quality=quality)
+
+
+def _choose_encoding():
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+class Compressor:
+    def __init__(self, min_size, mimetypes, gzip_level, brotli_quality):
+        self.min_size = min_size
+        self.mimetypes = mimetypes
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def negotiate(self):
+        """The encoding this request would get ("br", "gzip" or None)."""
+        return _choose_encoding()
+
+    def compress(self, response):
+        """Encodes the response in place when eligible; returns the encoding."""
+        if (
+            response.status_code != 200
+            or response.is_streamed
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in self.mimetypes
+        ):
+            return None
+        response.vary.add("Accept-Encoding")
+
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return None
+        encoding = self.negotiate()
+        if encoding == "br":
+            data = brotli_encode(body, self.brotli_quality)
+        elif encoding == "gzip":
+            data = gzip_encode(body, self.gzip_level)
+        else:
+            return None
+
+        response.set_data(data)
+        response.headers["Content-Encoding"] = encoding
+        return encoding
+
+
+def init_compression(app):
+    if not app.config.get("COMPRESS_RESPONSES", True):
+        return
+    compressor = Compressor(
+        min_size=app.config.get("COMPRESS_MIN_SIZE", 1024),
+        mimetypes=frozenset(app.config.get("COMPRESS_MIMETYPES", DEFAULT_MIMETYPES)),
+        gzip_level=app.config.get("COMPRESS_GZIP_LEVEL", 6),
+        brotli_quality=app.config.get("COMPRESS_BROTLI_QUALITY", 4),
+    )
+    app.extensions["compression"] = compressor
+
+    @app.after_request
+    def _compress(response):
+        compressor.compress(response)
+        return response
+
+
+def get_compressor():
+    """The app's Compressor, or None when compression is off."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("compression")
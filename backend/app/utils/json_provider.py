@@ -0,0 +1,45 @@
+"""
+orjson-backed JSON provider (optional dependency).
+
+Behaves like Flask's default provider (sorted keys, int dict keys allowed,
+dates via the default hook) but encodes in C and writes response bytes
+directly, skipping the str round trip.
+"""
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional
+    orjson = None
+
+from flask.json.provider import DefaultJSONProvider
+
+_OPTIONS = 0
+if orjson is not None:
+    _OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_NON_STR_KEYS
+        # Keep Flask's date format (RFC 822) for raw datetimes; the models
+        # already send isoformat() strings.
+        | orjson.OPT_PASSTHROUGH_DATETIME
+    )
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    def _encode(self, obj):
+        return orjson.dumps(obj, default=self.default, option=_OPTIONS)
+
+    def dumps(self, obj, **kwargs):
+        return self._encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """Installs OrjsonProvider when orjson is importable and JSON_ORJSON is on."""
+    if orjson is not None and app.config.get("JSON_ORJSON", True):
+        app.json = OrjsonProvider(app)
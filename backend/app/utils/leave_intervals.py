@@ -0,0 +1,55 @@
+"""
+Leaves as date intervals instead of one dict per leave-day.
+
+The full schedule payload used to expand every ScheduleLeave into a dict per
+calendar day, twice (each day's "leaves" list and "leaves_exploded"). The
+compact form sends each leave once as an interval; the per-day numbers come
+from one sweep over a difference array, O(leaves + days) instead of
+O(leave-days). Clients that still need the exploded lists ask for
+?leaves=exploded.
+"""
+
+LEAVE_FORMATS = ("intervals", "exploded")
+
+
+def leave_interval(
+    leave_id, membership_id, person_id, person_name, reason, start, end
+):
+    """One leave of the compact payload (names included: no client lookup)."""
+    return {
+        "id": leave_id,
+        "membership_id": membership_id,
+        "person_id": person_id,
+        "person_name": person_name,
+        "reason": reason,
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+    }
+
+
+def leave_counts_by_date(spans, dates):
+    """
+    spans: (start_date, end_date) pairs, inclusive. dates: the dates to
+    report. Returns {date: number of spans covering it}.
+
+    Sweep line: +1 where a span starts, -1 the day after it ends, then a
+    running sum across [min(dates), max(dates)].
+    """
+    dates = list(dates)
+    if not dates:
+        return {}
+    first, last = min(dates), max(dates)
+    size = (last - first).days + 1
+    delta = [0] * (size + 1)
+    for start, end in spans:
+        lo = max((start - first).days, 0)
+        hi = min((end - first).days, size - 1)
+        if lo <= hi:
+            delta[lo] += 1
+            delta[hi + 1] -= 1
+
+    running, counts = 0, []
+    for step in delta[:size]:
+        running += step
+        counts.append(running)
+    return {d: counts[(d - first).days] for d in dates}
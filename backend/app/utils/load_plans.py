@@ -0,0 +1,94 @@
+"""
+Named eager-loading plans for Schedule.
+
+Schedule's collections default to plain lazy "select" loading, so fetching a
+schedule is a single-row query. Endpoints that need children ask for them by
+plan name; every Schedule collection a plan does not load is set to raise, so
+an access outside the plan fails loudly instead of silently querying.
+
+    summary -> columns only (Schedule.to_dict())
+    grid    -> days (+ assignments, exclusions), members + leaves, stations
+    solver  -> what the optimizer reads from the schedule itself
+    full    -> everything Schedule.to_dict(summary_only=False) renders
+"""
+
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from ..database import db
+from ..models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleStation,
+    ScheduleMembership,
+    MembershipStationWeight,
+)
+
+
+def _days():
+    return selectinload(Schedule.days).options(
+        selectinload(ScheduleDay.assignments),
+        # exclusion.day / exclusion.membership resolve from the identity map:
+        # both plans that use this also load the schedule's memberships.
+        selectinload(ScheduleDay.exclusions),
+    )
+
+
+def _raise_unlisted(*loaded):
+    """raiseload for every Schedule relationship outside the plan."""
+    return [
+        raiseload(getattr(Schedule, rel.key))
+        for rel in Schedule.__mapper__.relationships
+        if rel.key not in loaded
+    ]
+
+
+def _stations():
+    return selectinload(Schedule.required_stations).joinedload(
+        ScheduleStation.master_station
+    )
+
+
+LOAD_PLANS = {
+    "summary": lambda: _raise_unlisted(),
+    "grid": lambda: [
+        _days(),
+        _stations(),
+        selectinload(Schedule.memberships).options(
+            joinedload(ScheduleMembership.person),
+            selectinload(ScheduleMembership.leaves),
+        ),
+        *_raise_unlisted("days", "required_stations", "memberships"),
+    ],
+    "solver": lambda: [
+        selectinload(Schedule.required_stations),
+        *_raise_unlisted("required_stations"),
+    ],
+    "full": lambda: [
+        _days(),
+        _stations(),
+        selectinload(Schedule.memberships).options(
+            joinedload(ScheduleMembership.person),
+            joinedload(ScheduleMembership.group),
+            selectinload(ScheduleMembership.leaves),
+            selectinload(ScheduleMembership.exclusions),
+            selectinload(ScheduleMembership.station_weights).joinedload(
+                MembershipStationWeight.station
+            ),
+        ),
+        *_raise_unlisted("days", "required_stations", "memberships"),
+    ],
+}
+
+
+def schedule_load_options(plan):
+    """Loader options for a named plan (KeyError for unknown names)."""
+    return LOAD_PLANS[plan]()
+
+
+def load_schedule(schedule_id, plan="summary"):
+    """Fetches one Schedule with the given plan, or None."""
+    return db.session.scalars(
+        db.select(Schedule)
+        .options(*schedule_load_options(plan))
+        .where(Schedule.id == schedule_id)
+        .execution_options(populate_existing=True)
+    ).first()
@@ -2,12 +2,11 @@ import pulp as lp
 import random
 import uuid
 import json
-from datetime import timedelta
-from sqlalchemy import select, delete
+from datetime import datetime, timedelta
+from sqlalchemy import select, delete, insert
 from sqlalchemy.orm import joinedload
 from ..database import db
 from ..models import (
-    Schedule,
     ScheduleCandidate,
     ScheduleDay,
     ScheduleMembership,
@@ -18,6 +17,12 @@ from ..models import (
     MasterStation,
 )
 from .quota_calculator import calculate_schedule_quotas
+from .load_plans import load_schedule
+from .schedule_cache import (
+    cached_valid_shifts,
+    cached_weekend_clusters,
+    cached_day_weight_map,
+)
 
 
 def run_schedule_optimization(schedule_id: int, num_candidates: int = 5):
@@ -35,12 +40,14 @@ def run_schedule_optimization(schedule_id: int, num_candidates: int = 5):
     ) + "\n"
 
     db.session.execute(
-        delete(ScheduleCandidate).where(ScheduleCandidate.schedule_id == schedule_id)
+        delete(ScheduleCandidate)
+        .where(ScheduleCandidate.schedule_id == schedule_id)
+        .execution_options(schedule_id=schedule_id)
     )
     db.session.commit()
 
     # 2. FETCH DATA
-    schedule = db.session.get(Schedule, schedule_id)
+    schedule = load_schedule(schedule_id, "solver")
     if not schedule:
         yield json.dumps({"type": "error", "message": "Schedule not found"}) + "\n"
         return
@@ -64,15 +71,13 @@ def run_schedule_optimization(schedule_id: int, num_candidates: int = 5):
     # Create a set of Active Day IDs for O(1) filtering later
     active_day_ids = {d.id for d in active_days}
 
-    # Fetch Members
+    # Fetch Members (leaves come from the cached availability helpers)
     stmt_members = (
         select(ScheduleMembership)
         .filter_by(schedule_id=schedule_id)
-        .options(
-            joinedload(ScheduleMembership.person), joinedload(ScheduleMembership.leaves)
-        )
+        .options(joinedload(ScheduleMembership.person))
     )
-    members = db.session.scalars(stmt_members).unique().all()
+    members = db.session.scalars(stmt_members).all()
 
     # Fetch Locks
     stmt_locks = select(Assignment).filter_by(schedule_id=schedule_id, is_locked=True)
@@ -104,30 +109,11 @@ def run_schedule_optimization(schedule_id: int, num_candidates: int = 5):
         return 1.0
 
     quota_targets = calculate_schedule_quotas(schedule_id)
-    day_weight_map = {d.id: float(d.weight) for d in active_days}
+    day_weight_map = cached_day_weight_map(schedule_id)
 
     # --- VALIDITY CHECK (The "Hard Constraints") ---
-    valid_shifts = set()
-
-    def is_member_on_leave(member, date_obj):
-        for l in member.leaves:
-            if l.start_date <= date_obj <= l.end_date:
-                return True
-        return False
-
-    for m in members:
-        # Lazy load qualifications safely
-        qualified_station_ids = {int(q.station_id) for q in m.person.qualifications}
-
-        for d in active_days:
-            if is_member_on_leave(m, d.date):
-                continue
-
-            for s in stations:
-                if int(s.station_id) not in qualified_station_ids:
-                    continue
-
-                valid_shifts.add((m.id, d.id, s.id))
+    # Leaves + Qualifications, memoized per schedule (copy: locks are added below)
+    valid_shifts = set(cached_valid_shifts(schedule_id))
 
     # Force Locks
     for (l_day_id, l_station_id), l_member_id in locked_map.items():
@@ -150,33 +136,8 @@ def run_schedule_optimization(schedule_id: int, num_candidates: int = 5):
         return
 
     # --- LONG WEEKEND LOGIC ---
-    weekend_groups = []
     sorted_active_days = sorted(active_days, key=lambda x: x.date)
-
-    def is_weekend_part(d):
-        return d.date.weekday() in [5, 6] or getattr(d, "is_holiday", False)
-
-    potential_indices = [
-        i for i, d in enumerate(sorted_active_days) if is_weekend_part(d)
-    ]
-    if potential_indices:
-        current_cluster = [sorted_active_days[potential_indices[0]]]
-        for i in range(1, len(potential_indices)):
-            prev = potential_indices[i - 1]
-            curr = potential_indices[i]
-            if (
-                sorted_active_days[curr].date - sorted_active_days[prev].date
-            ).days == 1:
-                current_cluster.append(sorted_active_days[curr])
-            else:
-                weekend_groups.append(current_cluster)
-                current_cluster = [sorted_active_days[curr]]
-        if current_cluster:
-            weekend_groups.append(current_cluster)
-
-    final_weekend_groups = [
-        g for g in weekend_groups if any(d.date.weekday() in [5, 6] for d in g)
-    ]
+    final_weekend_groups = cached_weekend_clusters(schedule_id)
 
     run_id = str(uuid.uuid4())
     generated_candidates = []
@@ -275,12 +236,13 @@ def run_schedule_optimization(schedule_id: int, num_candidates: int = 5):
 
         # 5. Min/Max Limits
         for m in members:
-            max_limit = m.override_max_assignments or (
-                m.person.group.max_assignments if m.person.group else 999
-            )
-            min_limit = m.override_min_assignments or (
-                m.person.group.min_assignments if m.person.group else 0
-            )
+            # An override of 0 is a limit, not "unset"
+            max_limit = m.override_max_assignments
+            if max_limit is None:
+                max_limit = m.person.group.max_assignments if m.person.group else 999
+            min_limit = m.override_min_assignments
+            if min_limit is None:
+                min_limit = m.person.group.min_assignments if m.person.group else 0
             total_vars = [
                 X[(m.id, d.id, s.id)]
                 for d in active_days
@@ -396,10 +358,10 @@ def run_schedule_optimization(schedule_id: int, num_candidates: int = 5):
         for idx, w_days in enumerate(final_weekend_groups):
             for m in members:
                 w_vars = [
-                    X[(m.id, d.id, s.id)]
-                    for d in w_days
+                    X[(m.id, d_id, s.id)]
+                    for d_id in w_days
                     for s in stations
-                    if (m.id, d.id, s.id) in X
+                    if (m.id, d_id, s.id) in X
                 ]
                 if not w_vars:
                     worked_weekend_vars[m.id].append(0)
@@ -464,7 +426,9 @@ def run_schedule_optimization(schedule_id: int, num_candidates: int = 5):
                 elif isinstance(w, dict):
                     weight_map[int(w.get("station_id"))] = float(w.get("weight", 0))
 
-            q_ids = {int(q.station_id) for q in m.person.qualifications}
+            q_ids = {
+                int(q.station_id) for q in m.person.qualifications if q.is_active
+            }
 
             total_config_weight = 0.0
             target_weights = {}
@@ -593,14 +557,21 @@ def run_schedule_optimization(schedule_id: int, num_candidates: int = 5):
                     "group_priority": round(get_member_priority(m), 2),
                 }
 
-            cand = ScheduleCandidate(
-                schedule_id=schedule_id,
-                run_id=run_id,
-                score=round(total_pen, 2),
-                assignments_data=assignment_map,
-                metrics_data=metric_data,
-            )
-            db.session.add(cand)
+            # Core INSERT ... RETURNING: no ORM object to refresh after commit
+            cand = {
+                "schedule_id": schedule_id,
+                "run_id": run_id,
+                "score": round(total_pen, 2),
+                "assignments_data": assignment_map,
+                "metrics_data": metric_data,
+                "created_at": datetime.utcnow(),
+            }
+            cand["id"] = db.session.execute(
+                insert(ScheduleCandidate)
+                .values(cand)
+                .returning(ScheduleCandidate.id)
+                .execution_options(schedule_id=schedule_id)
+            ).scalar_one()
             generated_candidates.append(cand)
 
             db.session.commit()
@@ -612,14 +583,14 @@ def run_schedule_optimization(schedule_id: int, num_candidates: int = 5):
                 {
                     "type": "candidate",
                     "candidate": {
-                        "id": cand.id,
-                        "run_id": cand.run_id,
-                        "score": cand.score,
-                        "assignments_data": cand.assignments_data,
-                        "metrics_data": cand.metrics_data,
-                        "created_at": str(cand.created_at) if cand.created_at else None,
+                        "id": cand["id"],
+                        "run_id": cand["run_id"],
+                        "score": cand["score"],
+                        "assignments_data": cand["assignments_data"],
+                        "metrics_data": cand["metrics_data"],
+                        "created_at": str(cand["created_at"]),
                     },
-                    "message": f"Found Option {i+1} (Score: {cand.score})",
+                    "message": f"Found Option {i+1} (Score: {cand['score']})",
                 }
             ) + padding + "\n"
 
@@ -0,0 +1,172 @@
+"""
+Keyset (cursor) pagination for the list endpoints.
+
+A paged list answers ?limit=N (and ?cursor=<token> for the following pages)
+with
+
+    {"items": [...], "next_cursor": "<token>" | null, "total": N (?total=1)}
+
+Lists that are not scoped to one schedule (/schedules, /personnel,
+/holidays, /schedule-memberships without ?schedule_id=) grow with the whole
+database and are always paged: without ?limit they return the first
+DEFAULT_LIMIT rows. Schedule-scoped lists (leaves, a schedule's memberships)
+stay bounded by the schedule and keep returning a bare JSON array unless
+the client passes ?limit or ?cursor.
+
+Pages are cut with a WHERE on the sort key of the last row instead of
+OFFSET, so page 500 costs the same index range scan as page 1 and rows
+inserted meanwhile never shift or duplicate a page. The sort key always ends
+with the primary key, which keeps the order total (stable across requests).
+Cursors are opaque url-safe tokens holding the last row's key values.
+
+date_range_args parses the shared ?from=&to= filter (YYYY-MM-DD, inclusive).
+"""
+
+import base64
+import json
+from datetime import date
+
+from sqlalchemy import Date, and_, func, or_, select
+
+from ..database import db
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class PageArgs:
+    def __init__(self, limit, cursor, with_total):
+        self.limit = limit
+        self.cursor = cursor
+        self.with_total = with_total
+
+
+def parse_page_args(
+    args, order_by, default_limit=DEFAULT_LIMIT, max_limit=MAX_LIMIT, required=False
+):
+    """
+    Reads limit / cursor / total from request.args; the cursor is checked
+    against order_by (the list's keyset_page sort key). Returns None when the
+    client asked for neither (legacy full list), unless required is set (the
+    first default_limit rows then). Raises ValueError.
+    """
+    if "limit" not in args and "cursor" not in args and not required:
+        return None
+    try:
+        limit = int(args.get("limit", default_limit))
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if not 1 <= limit <= max_limit:
+        raise ValueError(f"limit must be between 1 and {max_limit}")
+    cursor = None
+    if args.get("cursor"):
+        cursor = _cursor_values(order_by, decode_cursor(args["cursor"]))
+    with_total = args.get("total", "").lower() in ("1", "true")
+    return PageArgs(limit, cursor, with_total)
+
+
+def date_range_args(args):
+    """(from, to) dates from request.args, either may be None. Raises ValueError."""
+    bounds = []
+    for name in ("from", "to"):
+        raw = args.get(name)
+        try:
+            bounds.append(date.fromisoformat(raw) if raw else None)
+        except ValueError:
+            raise ValueError(f"{name} must be a YYYY-MM-DD date")
+    start, end = bounds
+    if start and end and start > end:
+        raise ValueError("from must not be after to")
+    return start, end
+
+
+def encode_cursor(values):
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, date) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or any(
+        isinstance(v, (list, dict)) for v in values
+    ):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _cursor_values(order_by, values):
+    """Cursor values typed for the order_by columns. Raises ValueError."""
+    if len(values) != len(order_by):
+        raise ValueError("Invalid cursor")
+    typed = []
+    for (col, _), value in zip(order_by, values):
+        if isinstance(col.type, Date) and value is not None:
+            try:
+                value = date.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+        typed.append(value)
+    return typed
+
+
+def _after(order_by, typed):
+    """(a, b, id) strictly after the cursor, each column in its own direction."""
+    clauses = []
+    for i, (col, descending) in enumerate(order_by):
+        beyond = col < typed[i] if descending else col > typed[i]
+        equal = [c == v for (c, _), v in zip(order_by[:i], typed[:i])]
+        clauses.append(and_(*equal, beyond))
+    return or_(*clauses)
+
+
+class Page:
+    def __init__(self, rows, next_cursor, total):
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.total = total
+
+    def envelope(self, items):
+        out = {"items": items, "next_cursor": self.next_cursor}
+        if self.total is not None:
+            out["total"] = self.total
+        return out
+
+
+def keyset_page(stmt, order_by, page, session=None, key=None):
+    """
+    stmt: filtered select() without ORDER BY / LIMIT.
+    order_by: [(column, descending)], last entry the primary key.
+    key(row) -> tuple of the order_by values for a result row; defaults to
+    reading the column attributes off the first entity of the row.
+    """
+    session = session or db.session
+    total = None
+    if page.with_total:
+        total = session.execute(
+            select(func.count()).select_from(stmt.order_by(None).subquery())
+        ).scalar()
+
+    if page.cursor is not None:
+        stmt = stmt.where(_after(order_by, page.cursor))
+    stmt = stmt.order_by(
+        *[col.desc() if descending else col.asc() for col, descending in order_by]
+    ).limit(page.limit + 1)
+    rows = session.execute(stmt).all()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        if key is None:
+            last = rows[-1][0]
+            values = [getattr(last, col.key) for col, _ in order_by]
+        else:
+            values = key(rows[-1])
+        next_cursor = encode_cursor(values)
+    return Page(rows, next_cursor, total)
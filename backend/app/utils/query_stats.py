@@ -0,0 +1,131 @@
+"""
+Per-request SQL instrumentation: statement count, rows and database time.
+
+Engine events feed every active QueryStats collector. A collector is pushed
+for each Flask request when SQL_INSTRUMENTATION is on, and tests can push
+their own with capture_queries() to enforce a query budget.
+
+Rows are the ORM instances materialized plus the rowcount of DML statements
+(DBAPI cursors do not report a row count for SELECTs before they are read).
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..database import db
+
+_active = ContextVar("query_stats_active", default=())
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self.statements = []  # [(sql, ms)], kept for budget failure messages
+
+    @property
+    def ms(self):
+        return round(self.seconds * 1000, 2)
+
+    def record(self, statement, seconds, rowcount):
+        self.count += 1
+        self.seconds += seconds
+        if rowcount > 0:
+            self.rows += rowcount
+        self.statements.append((statement, round(seconds * 1000, 3)))
+
+    def to_dict(self):
+        return {"queries": self.count, "rows": self.rows, "db_ms": self.ms}
+
+    def report(self):
+        """Numbered statement listing, for assertion messages."""
+        return "\n".join(
+            f"{i}. ({ms} ms) {sql}" for i, (sql, ms) in enumerate(self.statements, 1)
+        )
+
+
+@contextmanager
+def capture_queries():
+    """Collects every statement executed inside the block (requests included)."""
+    stats = QueryStats()
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    if _active.get():
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record(conn, cursor, statement, parameters, context, executemany):
+    collectors = _active.get()
+    if not collectors:
+        return
+    starts = conn.info.get("query_stats_start")
+    elapsed = time.perf_counter() - starts.pop() if starts else 0.0
+    is_dml = context is not None and (
+        context.isinsert or context.isupdate or context.isdelete
+    )
+    rowcount = cursor.rowcount if is_dml else -1
+    for stats in collectors:
+        stats.record(statement, elapsed, rowcount)
+
+
+@event.listens_for(db.Model, "load", propagate=True)
+def _count_loaded_row(target, context):
+    for stats in _active.get():
+        stats.rows += 1
+
+
+# --- FLASK WIRING ---
+
+
+def init_query_stats(app):
+    """Adds X-SQL-* headers and a structured log line per request when enabled."""
+    if not app.config.get("SQL_INSTRUMENTATION"):
+        return
+
+    @app.before_request
+    def _begin_request_stats():
+        g.query_stats = QueryStats()
+        g.query_stats_token = _active.set(_active.get() + (g.query_stats,))
+
+    @app.after_request
+    def _report_request_stats(response):
+        stats = g.get("query_stats")
+        if stats is None:
+            return response
+        response.headers["X-SQL-Query-Count"] = str(stats.count)
+        response.headers["X-SQL-Row-Count"] = str(stats.rows)
+        response.headers["X-SQL-Time-Ms"] = str(stats.ms)
+        response.headers["Server-Timing"] = f"db;dur={stats.ms}"
+        app.logger.info(
+            json.dumps(
+                {
+                    "event": "sql_stats",
+                    "method": request.method,
+                    "path": request.path,
+                    "status": response.status_code,
+                    **stats.to_dict(),
+                }
+            )
+        )
+        return response
+
+    @app.teardown_request
+    def _end_request_stats(exc):
+        token = g.pop("query_stats_token", None)
+        if token is not None:
+            _active.reset(token)
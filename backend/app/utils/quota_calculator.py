@@ -1,115 +1,312 @@
-from ..models import Schedule, ScheduleMembership, ScheduleDay
+from collections import namedtuple
+
+import numpy as np
+from sqlalchemy import select, func
+from ..models import (
+    Schedule,
+    ScheduleMembership,
+    ScheduleDay,
+    ScheduleLeave,
+    ScheduleStation,
+    Group,
+)
 from ..database import db
+from .availibility import merge_intervals
+from .schedule_cache import get_schedule_cache, QUOTA_DEPS
 
 
-def calculate_schedule_quotas(schedule_id):
+# Plain rows the quota math works from (no ORM objects, safe to cache / copy)
+QuotaDay = namedtuple("QuotaDay", "id date weight is_lookback")
+QuotaLeave = namedtuple("QuotaLeave", "id membership_id start_date end_date")
+QuotaMember = namedtuple(
+    "QuotaMember",
+    "id group_id override_seniority override_max override_min "
+    "group_seniority group_max group_min",
+)
+
+
+def resolve_seniority(member):
+    """Membership Override first, then the Group column, then 1.0."""
+    if member.override_seniority is not None:
+        return float(member.override_seniority)
+    if member.group_seniority is not None:
+        return float(member.group_seniority)
+    return 1.0
+
+
+def resolve_shift_cap(member):
+    """Membership Override first, then the Group column, then 999."""
+    if member.override_max is not None:
+        return float(member.override_max)
+    if member.group_max is not None:
+        return float(member.group_max)
+    return 999.0
+
+
+class QuotaInputs:
     """
-    Calculates the 'Fair Share' quota (in Points) for every member.
+    Snapshot of everything the quota math needs for ONE schedule.
+    Built from column tuples, so it is safe to keep around (and to copy for
+    what-if scenarios via the days / members / leaves lists).
+    """
+
+    def __init__(self, schedule_id, days, slots_per_day, members, leaves):
+        self.schedule_id = schedule_id
+        self.days = list(days)  # [QuotaDay] sorted by date
+        self.members = list(members)  # [QuotaMember]
+        self.leaves = list(leaves)  # [QuotaLeave]
+        self.slots_per_day = slots_per_day
+
+        self.day_ids = [d.id for d in self.days]
+        self.day_ordinals = np.array(
+            [d.date.toordinal() for d in self.days], dtype=np.int64
+        )
+        self.day_weights = np.array([float(d.weight) for d in self.days], dtype=float)
+
+        self.member_ids = [m.id for m in self.members]
+        self.seniority = np.array(
+            [resolve_seniority(m) for m in self.members], dtype=float
+        )
+        self.shift_cap = np.array(
+            [resolve_shift_cap(m) for m in self.members], dtype=float
+        )
+
+        self.leaves_by_member = {}
+        for l in self.leaves:
+            self.leaves_by_member.setdefault(l.membership_id, []).append(
+                (l.start_date, l.end_date)
+            )
+
+
+def _leave_points_lost(inputs):
+    """
+    Day weight lost to leave, per member.
+    Uses merged intervals + a prefix sum of day weights: O(L log D) per member.
+    """
+    prefix = np.concatenate(([0.0], np.cumsum(inputs.day_weights)))
+    lost = np.zeros(len(inputs.member_ids), dtype=float)
+
+    for i, m_id in enumerate(inputs.member_ids):
+        for start, end in merge_intervals(inputs.leaves_by_member.get(m_id, [])):
+            lo = np.searchsorted(inputs.day_ordinals, start.toordinal(), side="left")
+            hi = np.searchsorted(inputs.day_ordinals, end.toordinal(), side="right")
+            lost[i] += prefix[hi] - prefix[lo]
+    return lost
+
+
+def water_fill(weights, caps, demand):
+    """
+    Splits `demand` proportionally to `weights`, never giving anyone more than
+    their cap. Overflow from capped members is re-shared among the rest.
+
+    Equivalent to the old iterative 'waterfall' loop, but solved in one sort:
+    find the level L where sum(min(cap_i, L * weight_i)) == demand.
+    """
+    weights = np.asarray(weights, dtype=float)
+    caps = np.asarray(caps, dtype=float)
+    shares = np.zeros(len(weights), dtype=float)
+
+    # Zero-weight members never receive a share
+    pos = np.flatnonzero(weights > 0)
+    if len(pos) == 0 or demand <= 0:
+        return shares
+
+    w = weights[pos]
+    c = caps[pos]
+
+    # 1. Sort by the level at which each member hits their cap
+    ratio = c / w
+    order = np.argsort(ratio, kind="stable")
+    w, c, ratio = w[order], c[order], ratio[order]
+
+    # 2. Total handed out if the level stopped exactly at each member's cap
+    capped_before = np.concatenate(([0.0], np.cumsum(c)[:-1]))
+    weight_from = np.cumsum(w[::-1])[::-1]
+    filled_at = capped_before + c + ratio * (weight_from - w)
+
+    # 3. First breakpoint that reaches the demand
+    k = int(np.searchsorted(filled_at, demand, side="left"))
+
+    sorted_shares = np.empty(len(w), dtype=float)
+    if k >= len(w):
+        # Everyone capped (demand exceeds total capacity)
+        sorted_shares[:] = c
+    else:
+        level = (demand - capped_before[k]) / weight_from[k]
+        sorted_shares[:k] = c[:k]
+        sorted_shares[k:] = level * w[k:]
+
+    shares[pos[order]] = sorted_shares
+    return shares
+
+
+def solve_quotas(inputs):
+    """
+    Calculates the 'Fair Share' quota (in Points) for every member of a snapshot.
     """
-    schedule = db.session.get(Schedule, schedule_id)
-    if not schedule:
+    if not inputs.day_ids:
         return {}
 
-    # 1. FETCH DAYS & ANALYZE WEIGHTS
-    days = ScheduleDay.query.filter_by(schedule_id=schedule_id).all()
-    if not days:
+    max_day_weight = float(inputs.day_weights.max()) if len(inputs.day_weights) else 1.0
+
+    # 1. Supply & Demand in points
+    total_schedule_points = float(inputs.day_weights.sum())
+    total_demand_points = total_schedule_points * inputs.slots_per_day
+
+    if total_schedule_points == 0:
+        return {}
+
+    if not inputs.member_ids:
         return {}
 
-    max_day_weight = max((float(d.weight) for d in days), default=1.0)
+    # 2. Member weights: availability ratio (after leave) x seniority
+    available_points = np.maximum(
+        0.0, total_schedule_points - _leave_points_lost(inputs)
+    )
+    availability_ratio = available_points / total_schedule_points
+    weights = availability_ratio * inputs.seniority
 
-    total_schedule_points = 0.0
-    total_demand_points = 0.0
+    # Convert Shift Cap to Point Cap (using max day weight)
+    point_caps = inputs.shift_cap * max_day_weight
 
-    # Assumption: daily slots needed is constant based on required_stations length
-    daily_slots_count = len(schedule.required_stations)
+    # 3. Water-filling distribution
+    shares = water_fill(weights, point_caps, total_demand_points)
 
-    for day in days:
-        w = float(day.weight)
-        total_schedule_points += w
-        total_demand_points += w * daily_slots_count
+    return {
+        m_id: round(float(q), 2) for m_id, q in zip(inputs.member_ids, shares)
+    }
 
-    if total_schedule_points == 0:
+
+def load_quota_inputs(schedule_ids):
+    """
+    Loads QuotaInputs for many schedules in a constant number of queries
+    (schedules, days, station counts, members+groups, leaves).
+    """
+    schedule_ids = list(schedule_ids)
+    if not schedule_ids:
         return {}
 
-    # 2. PREPARE POOL
-    memberships = ScheduleMembership.query.filter_by(schedule_id=schedule_id).all()
-    pool = []
-
-    for m in memberships:
-        # --- LEAVE ADJUSTMENT ---
-        points_lost = 0.0
-        for day in days:
-            is_on_leave = any(l.start_date <= day.date <= l.end_date for l in m.leaves)
-            if is_on_leave:
-                points_lost += float(day.weight)
-
-        member_available_points = max(0, total_schedule_points - points_lost)
-        availability_ratio = member_available_points / total_schedule_points
-
-        # --- SENIORITY ---
-        # 1. Check Membership Override first
-        seniority = 1.0
-        if m.override_seniorityFactor is not None:
-            seniority = float(m.override_seniorityFactor)
-        # 2. Check Group column: seniorityFactor (Found in models.py)
-        elif m.group is not None:
-            seniority = float(m.group.seniorityFactor)
-
-        # --- MAX ASSIGNMENTS ---
-        # 1. Check Membership Override first
-        shift_cap = 999
-        if m.override_max_assignments is not None:
-            shift_cap = float(m.override_max_assignments)
-        # 2. Check Group column: max_assignments (Found in models.py)
-        elif m.group is not None:
-            shift_cap = float(m.group.max_assignments)
-
-        # Convert Shift Cap to Point Cap (using max day weight)
-        point_cap = shift_cap * max_day_weight
-
-        # Final Weight
-        raw_weight = availability_ratio * seniority
-
-        pool.append(
-            {
-                "id": m.id,
-                "weight": raw_weight,
-                "max_load": point_cap,
-                "assigned_quota": 0.0,
-                "is_locked": False,
-            }
+    # 1. Which schedules exist
+    existing = db.session.scalars(
+        select(Schedule.id).where(Schedule.id.in_(schedule_ids))
+    ).all()
+
+    # 2. Days
+    days_by_schedule = {s_id: [] for s_id in existing}
+    day_rows = db.session.execute(
+        select(
+            ScheduleDay.schedule_id,
+            ScheduleDay.id,
+            ScheduleDay.date,
+            ScheduleDay.weight,
+            ScheduleDay.is_lookback,
+        )
+        .where(ScheduleDay.schedule_id.in_(existing))
+        .order_by(ScheduleDay.schedule_id, ScheduleDay.date)
+    ).all()
+    for s_id, *day in day_rows:
+        days_by_schedule[s_id].append(QuotaDay(*day))
+
+    # 3. Daily slots (one per required station)
+    slot_counts = dict(
+        db.session.execute(
+            select(ScheduleStation.schedule_id, func.count(ScheduleStation.id))
+            .where(ScheduleStation.schedule_id.in_(existing))
+            .group_by(ScheduleStation.schedule_id)
+        ).all()
+    )
+
+    # 4. Members with their Override + Group columns
+    members_by_schedule = {s_id: [] for s_id in existing}
+    member_rows = db.session.execute(
+        select(
+            ScheduleMembership.schedule_id,
+            ScheduleMembership.id,
+            ScheduleMembership.group_id,
+            ScheduleMembership.override_seniorityFactor,
+            ScheduleMembership.override_max_assignments,
+            ScheduleMembership.override_min_assignments,
+            Group.seniorityFactor,
+            Group.max_assignments,
+            Group.min_assignments,
+        )
+        .outerjoin(Group, Group.id == ScheduleMembership.group_id)
+        .where(ScheduleMembership.schedule_id.in_(existing))
+        .order_by(ScheduleMembership.schedule_id, ScheduleMembership.id)
+    ).all()
+    for s_id, *member in member_rows:
+        members_by_schedule[s_id].append(QuotaMember(*member))
+
+    # 5. Leaves
+    leaves_by_schedule = {s_id: [] for s_id in existing}
+    leave_rows = db.session.execute(
+        select(
+            ScheduleMembership.schedule_id,
+            ScheduleLeave.id,
+            ScheduleLeave.membership_id,
+            ScheduleLeave.start_date,
+            ScheduleLeave.end_date,
+        )
+        .join(ScheduleMembership)
+        .where(ScheduleMembership.schedule_id.in_(existing))
+        .order_by(ScheduleLeave.id)
+    ).all()
+    for s_id, *leave in leave_rows:
+        leaves_by_schedule[s_id].append(QuotaLeave(*leave))
+
+    return {
+        s_id: QuotaInputs(
+            schedule_id=s_id,
+            days=days_by_schedule[s_id],
+            slots_per_day=slot_counts.get(s_id, 0),
+            members=members_by_schedule[s_id],
+            leaves=leaves_by_schedule[s_id],
         )
+        for s_id in existing
+    }
+
+
+def calculate_quotas_for_schedules(schedule_ids):
+    """
+    Batch entry point: {schedule_id: {membership_id: quota}}.
+    Missing schedules are left out of the result.
+    Memoized per schedule; only the cache misses are loaded (in one batch).
+    """
+    cache = get_schedule_cache()
+    results = cache.peek_many(schedule_ids, "quotas") if cache is not None else {}
+    missing = [s_id for s_id in schedule_ids if s_id not in results]
+    # Taken before loading, so an edit made meanwhile keeps the result out
+    tokens = cache.snapshot(missing) if cache is not None and missing else {}
+
+    for s_id, inputs in load_quota_inputs(missing).items():
+        quotas = solve_quotas(inputs)
+        if cache is not None:
+            cache.put(s_id, "quota_inputs", QUOTA_DEPS, inputs, tokens[s_id])
+            cache.put(s_id, "quotas", QUOTA_DEPS, quotas, tokens[s_id])
+        results[s_id] = quotas
+
+    # Hand out copies so callers can't mutate the cached dicts
+    return {s_id: dict(q) for s_id, q in results.items()}
+
+
+def calculate_schedule_quotas(schedule_id):
+    """
+    Calculates the 'Fair Share' quota (in Points) for every member.
+    """
+    return calculate_quotas_for_schedules([schedule_id]).get(schedule_id, {})
+
+
+def cached_quota_inputs(schedule_id):
+    """QuotaInputs snapshot for one schedule (None if it doesn't exist)."""
+    cache = get_schedule_cache()
+    if cache is None:
+        return load_quota_inputs([schedule_id]).get(schedule_id)
+    inputs = cache.peek(schedule_id, "quota_inputs")
+    if inputs is not None:
+        return inputs
 
-    # 3. WATERFALL DISTRIBUTION
-    remaining_demand = total_demand_points
-
-    while True:
-        # Use ['is_locked'] instead of .is_locked
-        active_pool = [p for p in pool if not p["is_locked"]]
-        if not active_pool:
-            break
-
-        total_active_weight = sum(p["weight"] for p in active_pool)
-        if total_active_weight == 0:
-            break
-
-        offenders = []
-        for p in active_pool:
-            # Use ['weight'] and ['max_load']
-            share = (p["weight"] / total_active_weight) * remaining_demand
-            if share > p["max_load"]:
-                offenders.append(p)
-
-        if not offenders:
-            for p in active_pool:
-                p["assigned_quota"] = (
-                    p["weight"] / total_active_weight
-                ) * remaining_demand
-            break
-        else:
-            for p in offenders:
-                p["assigned_quota"] = p["max_load"]
-                p["is_locked"] = True  # Set dictionary key
-                remaining_demand -= p["max_load"]
-
-    return {p["id"]: round(p["assigned_quota"], 2) for p in pool}
+    token = cache.snapshot([schedule_id])[schedule_id]
+    inputs = load_quota_inputs([schedule_id]).get(schedule_id)
+    if inputs is not None:
+        cache.put(schedule_id, "quota_inputs", QUOTA_DEPS, inputs, token)
+    return inputs
@@ -0,0 +1,193 @@
+"""
+Serialized-response cache for schedule-scoped GET endpoints.
+
+Entries are keyed by (endpoint, query string, schedule_id, revision token:
+"<revision>.<global revision>", negotiated Content-Encoding) and hold the
+encoded (and compressed, see compression.py) body, so a hit skips the
+queries, the JSON encoding and the compression. The revisions in the key already make a
+stale hit impossible; change_tracking
+additionally evicts a schedule's entries as soon as any of its rows change,
+so memory is not held by revisions nobody can ask for anymore.
+
+Two tiers:
+    memory  per-process LRU bounded by entry count and body bytes
+    disk    optional (RESPONSE_CACHE_DIR), shared by every worker process;
+            one file per entry under <dir>/<schedule_id>/, written atomically.
+            A schedule's directory is emptied when it changes, so the disk
+            only ever holds current revisions.
+
+Views opt in through revisions.schedule_etag, which already knows the
+revision (see there).
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+from flask import current_app, has_app_context
+
+from . import change_tracking
+
+
+class DiskTier:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key):
+        endpoint, query, schedule_id, revision, accepted = key
+        digest = hashlib.sha1(f"{endpoint}?{query}|{accepted}".encode()).hexdigest()
+        return os.path.join(self.root, str(schedule_id), f"{revision}-{digest}")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "rb") as fh:
+                header, _, body = fh.read().partition(b"\n")
+        except OSError:
+            return None
+        mimetype, _, encoding = header.decode().partition(" ")
+        return mimetype, body, encoding or None
+
+    def put(self, key, mimetype, body, encoding=None):
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        header = f"{mimetype} {encoding or ''}".rstrip()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(header.encode() + b"\n" + body)
+            os.replace(tmp, path)
+        except OSError:
+            # Raced with an invalidation removing the directory; just skip
+            pass
+
+    def drop_schedule(self, schedule_id):
+        shutil.rmtree(os.path.join(self.root, str(schedule_id)), ignore_errors=True)
+
+    def clear(self):
+        for name in os.listdir(self.root):
+            shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU of (mimetype, body bytes, Content-Encoding or None), with
+    an optional DiskTier.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024, disk=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self._entries = OrderedDict()  # key -> (mimetype, body, encoding)
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _store(self, key, value):
+        """Caller holds the lock."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= len(old[1])
+        self._entries[key] = value
+        self.nbytes += len(value[1])
+        while self._entries and (
+            len(self._entries) > self.max_entries or self.nbytes > self.max_bytes
+        ):
+            _, (_, body, _) = self._entries.popitem(last=False)
+            self.nbytes -= len(body)
+            self.evictions += 1
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self.disk.get(key) if self.disk is not None else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, value)
+        return value
+
+    def put(self, key, mimetype, body, encoding=None):
+        if self.max_entries <= 0 or len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._store(key, (mimetype, body, encoding))
+        if self.disk is not None:
+            self.disk.put(key, mimetype, body, encoding)
+
+    def invalidate(self, change_set):
+        if change_set.global_models:
+            self.clear()
+            return
+        schedule_ids = set(change_set.by_schedule)
+        with self._lock:
+            for key in [k for k in self._entries if k[2] in schedule_ids]:
+                self.nbytes -= len(self._entries.pop(key)[1])
+        if self.disk is not None:
+            for schedule_id in schedule_ids:
+                self.disk.drop_schedule(schedule_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": (
+                    round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+                ),
+                "disk": self.disk.root if self.disk is not None else None,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def init_response_cache(app):
+    directory = app.config.get("RESPONSE_CACHE_DIR")
+    app.extensions["response_cache"] = ResponseCache(
+        max_entries=app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 1024),
+        max_bytes=app.config.get("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024),
+        disk=DiskTier(directory) if directory else None,
+    )
+
+
+def get_response_cache():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("response_cache")
+
+
+@change_tracking.register_listener
+def _invalidate_on_change(change_set):
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate(change_set)
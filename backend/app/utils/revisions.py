@@ -0,0 +1,165 @@
+"""
+Per-schedule revision numbers and conditional GETs.
+
+schedules.revision goes up inside every transaction that changes the schedule
+or one of its child rows (days, slots, memberships, leaves, ...). Master data
+(Person, Group, ...) feeds every schedule, so it bumps one shared counter,
+revision_counters["global"], instead of rewriting every schedule row. A rolled
+back write takes its bump with it, so a (revision, global revision) pair always
+names one committed state of the schedule.
+
+Schedule-scoped GET views are wrapped with @schedule_etag: responses carry
+ETag W/"<schedule_id>-<revision>.<global revision>", and a request whose
+If-None-Match still matches gets a 304 after one primary-key lookup, before the
+view runs. Other requests are served from the response cache
+(response_cache.py) when another client already fetched the same revision.
+"""
+
+from functools import wraps
+
+from flask import current_app, make_response, request
+from sqlalchemy import select, update
+
+from ..database import read_session
+from ..models import RevisionCounter, Schedule
+from . import change_tracking
+from .compression import get_compressor
+from .response_cache import get_response_cache
+
+_schedules = Schedule.__table__
+_counters = RevisionCounter.__table__
+GLOBAL = "global"
+
+_global_revision = (
+    select(_counters.c.value).where(_counters.c.name == GLOBAL).scalar_subquery()
+)
+
+
+@change_tracking.register_writer
+def _bump_revisions(session, change_set):
+    """
+    One UPDATE per flush / bulk statement for the changed schedules, and one
+    for the global counter when master data changed. The counter is bumped
+    first and schedules in id order, so concurrent writers lock alike. The
+    new numbers are left on the change set for the listeners (schedule_cache).
+    """
+    conn = session.connection()
+    if change_set.global_models:
+        change_set.global_revision = conn.execute(
+            update(_counters)
+            .where(_counters.c.name == GLOBAL)
+            .values(value=_counters.c.value + 1)
+            .returning(_counters.c.value)
+        ).scalar()
+    if change_set.by_schedule:
+        rows = conn.execute(
+            update(_schedules)
+            .where(_schedules.c.id.in_(sorted(change_set.by_schedule)))
+            .values(revision=_schedules.c.revision + 1)
+            .returning(_schedules.c.id, _schedules.c.revision)
+        )
+        change_set.revisions = dict(rows.all())
+
+
+def get_revision(schedule_id, session=None):
+    """Current schedule revision, or None if the schedule does not exist."""
+    session = session or read_session()
+    return session.execute(
+        select(Schedule.revision).where(Schedule.id == schedule_id)
+    ).scalar()
+
+
+def get_global_revision(session=None):
+    session = session or read_session()
+    return session.execute(select(_global_revision)).scalar() or 0
+
+
+def get_revisions(schedule_id, session=None):
+    """(revision, global revision) in one query, or None if no such schedule."""
+    return get_revisions_many([schedule_id], session=session).get(schedule_id)
+
+
+def get_revisions_many(schedule_ids, session=None):
+    """{schedule_id: (revision, global revision)} for the existing schedules."""
+    session = session or read_session()
+    rows = session.execute(
+        select(Schedule.id, Schedule.revision, _global_revision).where(
+            Schedule.id.in_(schedule_ids)
+        )
+    )
+    return {s_id: (rev, global_rev or 0) for s_id, rev, global_rev in rows}
+
+
+def revision_token(revisions):
+    return "{}.{}".format(*revisions)
+
+
+def schedule_etag_value(schedule_id, revisions):
+    return f"{schedule_id}-{revision_token(revisions)}"
+
+
+def schedule_etag(view_arg="schedule_id", *, query_arg=None, cache=True):
+    """
+    Decorates a schedule-scoped GET view. The schedule id comes from the URL
+    (view_arg) or from ?<query_arg>=. Requests without an id, for a missing
+    schedule, or answered with an error pass through untouched. cache=False
+    skips the response cache (ETags only).
+
+    The revisions are read before the view runs: if a write lands in between,
+    the body is newer than its tag and the next request simply misses.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if query_arg is not None:
+                schedule_id = request.args.get(query_arg, type=int)
+            else:
+                schedule_id = kwargs.get(view_arg)
+            revisions = None if schedule_id is None else get_revisions(schedule_id)
+            if revisions is None:
+                return view(*args, **kwargs)
+
+            etag = schedule_etag_value(schedule_id, revisions)
+            store = get_response_cache() if cache else None
+            compressor = get_compressor()
+            key = (
+                request.endpoint,
+                request.query_string.decode(),
+                schedule_id,
+                revision_token(revisions),
+                compressor.negotiate() if compressor is not None else None,
+            )
+            not_modified = request.if_none_match.contains_weak(etag)
+            hit = store.get(key) if store is not None and not not_modified else None
+            if not_modified:
+                response = current_app.response_class(status=304)
+            elif hit is not None:
+                mimetype, body, encoding = hit
+                response = current_app.response_class(body, mimetype=mimetype)
+                if encoding is not None:
+                    response.headers["Content-Encoding"] = encoding
+                if compressor is not None:
+                    response.vary.add("Accept-Encoding")
+                response.headers["X-Cache"] = "HIT"
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if store is not None and not response.is_streamed:
+                    # Stored encoded, so hits skip the compression as well
+                    encoding = None
+                    if compressor is not None:
+                        encoding = compressor.compress(response)
+                    store.put(key, response.mimetype, response.get_data(), encoding)
+                    response.headers["X-Cache"] = "MISS"
+
+            response.set_etag(etag, weak=True)
+            # Browsers store the body but revalidate on every fetch
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapper
+
+    return decorator
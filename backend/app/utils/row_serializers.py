@@ -0,0 +1,664 @@
+"""
+Column-tuple serialization for the heavy read endpoints.
+
+Each payload is assembled from a few Core select()s of plain columns; rows
+become dicts through precompiled mappers (fixed key tuple + per-column
+converters) instead of ORM instances and to_dict(). Output matches the
+models' to_dict() shapes key for key, so the frontend is unaffected.
+serialize_assignments_columnar is the one opt-in exception (?format=columnar).
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from operator import itemgetter
+
+from sqlalchemy import func, select
+
+from ..database import db
+from ..models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleStation,
+    ScheduleMembership,
+    ScheduleLeave,
+    ScheduleExclusion,
+    MembershipStationWeight,
+    Assignment,
+    Person,
+    Group,
+    MasterStation,
+    Qualification,
+)
+from .leave_intervals import leave_counts_by_date, leave_interval
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def row_mapper(*fields):
+    """
+    fields: key names, or (key, converter) pairs.
+    Returns row -> dict, with the key tuple and converters bound up front.
+    """
+    keys = tuple(f[0] if isinstance(f, tuple) else f for f in fields)
+    converters = tuple(
+        (i, f[1]) for i, f in enumerate(fields) if isinstance(f, tuple)
+    )
+    if not converters:
+        return lambda row: dict(zip(keys, row))
+
+    def _map(row):
+        values = list(row)
+        for i, convert in converters:
+            values[i] = convert(values[i])
+        return dict(zip(keys, values))
+
+    return _map
+
+
+def day_window(schedule_id, start=None, end=None):
+    """
+    select() of the schedule's day ids dated within [start, end] (either bound
+    optional): a range scan of ix_schedule_days_schedule_date_lookback.
+    """
+    q = select(ScheduleDay.id).where(ScheduleDay.schedule_id == schedule_id)
+    if start is not None:
+        q = q.where(ScheduleDay.date >= start)
+    if end is not None:
+        q = q.where(ScheduleDay.date <= end)
+    return q
+
+
+def _windowed(start, end):
+    return start is not None or end is not None
+
+
+# --- ASSIGNMENTS ---
+
+_assignment_row = row_mapper(
+    "id",
+    "day_id",
+    ("date", _iso),
+    "station_id",
+    ("station_name", lambda name: name if name is not None else "Unknown"),
+    "membership_id",
+    "assigned_person_name",
+    "is_locked",
+    "availability_estimate",
+)
+
+
+def serialize_assignments(
+    schedule_id, session=None, start=None, end=None, assignment_ids=None
+):
+    """
+    Same dicts as Assignment.to_dict(), one query. start/end: day dates.
+    assignment_ids limits it to those slots.
+    """
+    session = session or db.session
+    q = (
+        select(
+            Assignment.id,
+            Assignment.day_id,
+            ScheduleDay.date,
+            Assignment.station_id,
+            MasterStation.name,
+            Assignment.membership_id,
+            Person.name,
+            Assignment.is_locked,
+            Assignment.availability_estimate,
+        )
+        .outerjoin(ScheduleDay, ScheduleDay.id == Assignment.day_id)
+        .outerjoin(MasterStation, MasterStation.id == Assignment.station_id)
+        .outerjoin(
+            ScheduleMembership, ScheduleMembership.id == Assignment.membership_id
+        )
+        .outerjoin(Person, Person.id == ScheduleMembership.person_id)
+        .where(Assignment.schedule_id == schedule_id)
+        .order_by(Assignment.id)
+    )
+    if _windowed(start, end):
+        q = q.where(Assignment.day_id.in_(day_window(schedule_id, start, end)))
+    if assignment_ids is not None:
+        q = q.where(Assignment.id.in_(assignment_ids))
+    return [_assignment_row(r) for r in session.execute(q)]
+
+
+_COLUMNAR_FIELDS = (
+    "id",
+    "day_id",
+    "station_id",
+    "membership_id",
+    "is_locked",
+    "availability_estimate",
+)
+
+
+def serialize_assignments_columnar(schedule_id, session=None, start=None, end=None):
+    """
+    Compact grid payload: parallel per-slot arrays plus lookup tables sent
+    once, instead of one dict per slot repeating date/station/person names.
+
+        {"schedule_id", "count",
+         "columns": {"id": [...], "day_id": [...], "station_id": [...],
+                     "membership_id": [...], "is_locked": [...],
+                     "availability_estimate": [...]},
+         "days": {day_id: iso date}, "stations": {station_id: name},
+         "members": {membership_id: person name}}
+
+    Slots keep the row order of serialize_assignments (by id). start/end
+    restrict slots and the day table to that date window.
+    """
+    session = session or db.session
+    in_window = Assignment.schedule_id == schedule_id
+    if _windowed(start, end):
+        in_window = Assignment.day_id.in_(day_window(schedule_id, start, end))
+    rows = session.execute(
+        select(
+            Assignment.id,
+            Assignment.day_id,
+            Assignment.station_id,
+            Assignment.membership_id,
+            Assignment.is_locked,
+            Assignment.availability_estimate,
+        )
+        .where(in_window)
+        .order_by(Assignment.id)
+    ).all()
+    columns = {name: [] for name in _COLUMNAR_FIELDS}
+    for name, values in zip(_COLUMNAR_FIELDS, zip(*rows)):
+        columns[name] = list(values)
+
+    day_q = select(ScheduleDay.id, ScheduleDay.date).where(
+        ScheduleDay.schedule_id == schedule_id
+    )
+    if _windowed(start, end):
+        day_q = day_q.where(ScheduleDay.id.in_(day_window(schedule_id, start, end)))
+    days = {day_id: _iso(day) for day_id, day in session.execute(day_q)}
+    stations = {
+        station_id: name if name is not None else "Unknown"
+        for station_id, name in session.execute(
+            select(Assignment.station_id, MasterStation.name)
+            .distinct()
+            .outerjoin(MasterStation, MasterStation.id == Assignment.station_id)
+            .where(in_window)
+        )
+    }
+    members = dict(
+        session.execute(
+            select(ScheduleMembership.id, Person.name)
+            .join(Person, Person.id == ScheduleMembership.person_id)
+            .where(ScheduleMembership.schedule_id == schedule_id)
+        ).all()
+    )
+    return {
+        "schedule_id": schedule_id,
+        "count": len(rows),
+        "columns": columns,
+        "days": days,
+        "stations": stations,
+        "members": members,
+    }
+
+
+# --- MEMBERSHIPS ---
+
+_leave_row = row_mapper(
+    "id", "membership_id", ("start_date", _iso), ("end_date", _iso), "reason"
+)
+_exclusion_row = row_mapper(
+    "id",
+    "day_id",
+    "membership_id",
+    "person_id",
+    "person_name",
+    ("date", _iso),
+    "reason",
+)
+_weight_row = row_mapper("id", "membership_id", "station_id", "station_name", "weight")
+
+
+def _membership_filter(q, schedule_id, membership_ids):
+    if schedule_id is not None:
+        q = q.where(ScheduleMembership.schedule_id == schedule_id)
+    if membership_ids is not None:
+        q = q.where(ScheduleMembership.id.in_(membership_ids))
+    return q
+
+
+def _children(session, schedule_id, membership_ids=None):
+    scope = _membership_filter(
+        select(ScheduleMembership.id), schedule_id, membership_ids
+    )
+
+    leaves = defaultdict(list)
+    for r in session.execute(
+        select(
+            ScheduleLeave.id,
+            ScheduleLeave.membership_id,
+            ScheduleLeave.start_date,
+            ScheduleLeave.end_date,
+            ScheduleLeave.reason,
+        )
+        .where(ScheduleLeave.membership_id.in_(scope))
+        .order_by(ScheduleLeave.id)
+    ):
+        leaves[r[1]].append(_leave_row(r))
+
+    exclusions = defaultdict(list)
+    for r in session.execute(
+        select(
+            ScheduleExclusion.id,
+            ScheduleExclusion.day_id,
+            ScheduleExclusion.membership_id,
+            Person.id,
+            Person.name,
+            ScheduleDay.date,
+            ScheduleExclusion.reason,
+        )
+        .join(
+            ScheduleMembership,
+            ScheduleMembership.id == ScheduleExclusion.membership_id,
+        )
+        .join(Person, Person.id == ScheduleMembership.person_id)
+        .outerjoin(ScheduleDay, ScheduleDay.id == ScheduleExclusion.day_id)
+        .where(ScheduleExclusion.membership_id.in_(scope))
+        .order_by(ScheduleExclusion.id)
+    ):
+        exclusions[r[2]].append(_exclusion_row(r))
+
+    weights = defaultdict(list)
+    for r in session.execute(
+        select(
+            MembershipStationWeight.id,
+            MembershipStationWeight.membership_id,
+            MembershipStationWeight.station_id,
+            MasterStation.name,
+            MembershipStationWeight.weight,
+        )
+        .outerjoin(
+            MasterStation, MasterStation.id == MembershipStationWeight.station_id
+        )
+        .where(MembershipStationWeight.membership_id.in_(scope))
+        .order_by(MembershipStationWeight.id)
+    ):
+        weights[r[1]].append(_weight_row(r))
+
+    return leaves, exclusions, weights
+
+
+def serialize_memberships(schedule_id=None, session=None, membership_ids=None):
+    """
+    Same dicts as ScheduleMembership.to_dict(), five queries in total.
+    membership_ids (ids, or a select() of ids) narrows the result to those
+    rows, e.g. one page of a listing.
+    """
+    session = session or db.session
+    q = (
+        select(
+            ScheduleMembership.id,
+            ScheduleMembership.person_id,
+            Person.name,
+            Group.name,
+            ScheduleMembership.override_max_assignments,
+            ScheduleMembership.override_min_assignments,
+            ScheduleMembership.override_seniorityFactor,
+            Group.id,
+            Group.seniorityFactor,
+            Group.min_assignments,
+            Group.max_assignments,
+        )
+        .join(Person, Person.id == ScheduleMembership.person_id)
+        .outerjoin(Group, Group.id == ScheduleMembership.group_id)
+        .order_by(ScheduleMembership.id)
+    )
+    members = session.execute(_membership_filter(q, schedule_id, membership_ids)).all()
+    if not members:
+        return []
+
+    leaves, exclusions, weights = _children(session, schedule_id, membership_ids)
+
+    quals = defaultdict(list)
+    person_scope = _membership_filter(
+        select(ScheduleMembership.person_id), schedule_id, membership_ids
+    )
+    for person_id, station_id in session.execute(
+        select(Qualification.person_id, Qualification.station_id)
+        .where(
+            Qualification.person_id.in_(person_scope),
+            Qualification.is_active.is_(True),
+        )
+        .order_by(Qualification.id)
+    ):
+        quals[person_id].append(station_id)
+
+    out = []
+    for row in members:
+        m_id, p_id, p_name, g_name, o_max, o_min, o_sen, g_id, g_sen, g_min, g_max = row
+        has_group = g_id is not None
+        out.append(
+            {
+                "id": m_id,
+                "person_id": p_id,
+                "person_name": p_name,
+                "group_name": g_name if has_group else "Individual",
+                "override_max_assignments": o_max,
+                "override_min_assignments": o_min,
+                "override_seniorityFactor": o_sen,
+                "exclusions": exclusions.get(m_id, []),
+                "leaves": leaves.get(m_id, []),
+                "overrides": {
+                    "seniorityFactor": o_sen,
+                    "min_assignments": o_min,
+                    "max_assignments": o_max,
+                },
+                "group_defaults": {
+                    "seniorityFactor": g_sen if has_group else 1.0,
+                    "min_assignments": g_min if has_group else 0,
+                    "max_assignments": g_max if has_group else 5,
+                },
+                "station_weights": weights.get(m_id, []),
+                "qualifications": quals.get(p_id, []),
+            }
+        )
+    return out
+
+
+# --- FULL SCHEDULE ---
+
+_SCHEDULE_COLUMNS = (
+    Schedule.id,
+    Schedule.name,
+    Schedule.status,
+    Schedule.start_date,
+    Schedule.end_date,
+    Schedule.weight_quota_deviation,
+    Schedule.weight_spacing_1_day,
+    Schedule.weight_spacing_2_day,
+    Schedule.weight_same_weekend,
+    Schedule.weight_consecutive_weekends,
+    Schedule.weight_goal_deviation,
+    Schedule.group_weights,
+)
+_schedule_row = row_mapper(
+    "id",
+    "name",
+    "status",
+    ("start_date", _iso),
+    ("end_date", _iso),
+    "weight_quota_deviation",
+    "weight_spacing_1_day",
+    "weight_spacing_2_day",
+    "weight_same_weekend",
+    "weight_consecutive_weekends",
+    "weight_goal_deviation",
+    "group_weights",
+)
+_day_row = row_mapper(
+    "id",
+    "schedule_id",
+    ("date", _iso),
+    "name",
+    "weight",
+    "is_lookback",
+    "availability_estimate",
+    "label",
+    "is_holiday",
+    "assignment_count",
+)
+_station_row = row_mapper("id", "schedule_id", "station_id", "name", "abbr")
+
+
+def _serialize_day_rows(
+    session,
+    schedule_id,
+    leaves_by_date,
+    exclusions_by_day,
+    start=None,
+    end=None,
+    leave_spans=None,
+):
+    """
+    ScheduleDay.to_dict(day_leaves) dicts, by id, with assignment counts.
+    leave_spans ((start, end) pairs) gives each day a "leave_count" from one
+    sweep instead of its "leaves" list (ScheduleDay.to_dict(leave_count=...)).
+    """
+    counts = select(Assignment.day_id, func.count(Assignment.id).label("n")).where(
+        Assignment.schedule_id == schedule_id
+    )
+    q = select(
+        ScheduleDay.id,
+        ScheduleDay.schedule_id,
+        ScheduleDay.date,
+        ScheduleDay.name,
+        ScheduleDay.weight,
+        ScheduleDay.is_lookback,
+        ScheduleDay.availability_estimate,
+        ScheduleDay.label,
+        ScheduleDay.is_holiday,
+    ).where(ScheduleDay.schedule_id == schedule_id)
+    if _windowed(start, end):
+        window = day_window(schedule_id, start, end)
+        counts = counts.where(Assignment.day_id.in_(window))
+        q = q.where(ScheduleDay.id.in_(window))
+    counts = counts.group_by(Assignment.day_id).subquery()
+    q = q.add_columns(func.coalesce(counts.c.n, 0)).outerjoin(
+        counts, counts.c.day_id == ScheduleDay.id
+    )
+
+    rows = session.execute(q.order_by(ScheduleDay.id)).all()
+    counts = None
+    if leave_spans is not None:
+        counts = leave_counts_by_date(leave_spans, [r[2] for r in rows])
+
+    days = []
+    for r in rows:
+        day = _day_row(r)
+        if counts is not None:
+            day["exclusions"] = exclusions_by_day.get(day["id"], [])
+            day["leave_count"] = counts[r[2]]
+        else:
+            day["leaves"] = leaves_by_date.get(day["date"], [])
+            day["exclusions"] = exclusions_by_day.get(day["id"], [])
+        days.append(day)
+    return days
+
+
+def _day_exclusions(session, day_ids):
+    """{day_id: [ScheduleExclusion.to_dict()]} for day_ids, one joined query."""
+    exclusions_by_day = defaultdict(list)
+    for r in session.execute(
+        select(
+            ScheduleExclusion.id,
+            ScheduleExclusion.day_id,
+            ScheduleExclusion.membership_id,
+            Person.id,
+            Person.name,
+            ScheduleDay.date,
+            ScheduleExclusion.reason,
+        )
+        .join(ScheduleDay, ScheduleDay.id == ScheduleExclusion.day_id)
+        .join(
+            ScheduleMembership,
+            ScheduleMembership.id == ScheduleExclusion.membership_id,
+        )
+        .join(Person, Person.id == ScheduleMembership.person_id)
+        .where(ScheduleExclusion.day_id.in_(day_ids))
+        .order_by(ScheduleExclusion.id)
+    ):
+        exclusions_by_day[r[1]].append(_exclusion_row(r))
+    return exclusions_by_day
+
+
+def serialize_day(day_id, session=None):
+    """
+    Same dict as ScheduleDay.to_dict() (empty "leaves"), or None: one lookup,
+    the exclusions join and the day row with its grouped assignment count.
+    """
+    session = session or db.session
+    row = session.execute(
+        select(ScheduleDay.schedule_id, ScheduleDay.date).where(
+            ScheduleDay.id == day_id
+        )
+    ).first()
+    if row is None:
+        return None
+    schedule_id, day = row
+    exclusions_by_day = _day_exclusions(session, [day_id])
+    (data,) = _serialize_day_rows(
+        session, schedule_id, {}, exclusions_by_day, start=day, end=day
+    )
+    return data
+
+
+def serialize_days(schedule_id, session=None, start=None, end=None):
+    """
+    Same list as the grid plan's ScheduleDay.to_dict(day_leaves) per day, or
+    None if the schedule does not exist. start/end limit it to a date window:
+    only that window's days, exclusions and leave dates are read.
+    """
+    session = session or db.session
+    exists = session.execute(select(Schedule.id).where(Schedule.id == schedule_id))
+    if exists.first() is None:
+        return None
+
+    exclusions_by_day = _day_exclusions(session, day_window(schedule_id, start, end))
+
+    # Leaves overlapping the window, exploded per date inside it, in the
+    # (membership, leave) order Schedule._get_leaves_by_date produces.
+    leave_q = (
+        select(
+            ScheduleLeave.id,
+            ScheduleLeave.membership_id,
+            ScheduleLeave.start_date,
+            ScheduleLeave.end_date,
+            ScheduleLeave.reason,
+            Person.id,
+            Person.name,
+        )
+        .join(ScheduleMembership, ScheduleMembership.id == ScheduleLeave.membership_id)
+        .join(Person, Person.id == ScheduleMembership.person_id)
+        .where(ScheduleMembership.schedule_id == schedule_id)
+        .order_by(ScheduleMembership.id, ScheduleLeave.id)
+    )
+    if start is not None:
+        leave_q = leave_q.where(ScheduleLeave.end_date >= start)
+    if end is not None:
+        leave_q = leave_q.where(ScheduleLeave.start_date <= end)
+
+    leaves_by_date = defaultdict(list)
+    for l_id, m_id, l_start, l_end, reason, p_id, p_name in session.execute(leave_q):
+        curr = max(l_start, start) if start is not None else l_start
+        last = min(l_end, end) if end is not None else l_end
+        while curr <= last:
+            leaves_by_date[curr.isoformat()].append(
+                {
+                    "id": l_id,
+                    "person_name": p_name,
+                    "reason": reason,
+                    "membership_id": m_id,
+                    "person_id": p_id,
+                }
+            )
+            curr += timedelta(days=1)
+
+    return _serialize_day_rows(
+        session, schedule_id, leaves_by_date, exclusions_by_day, start, end
+    )
+
+
+def serialize_schedule(schedule_id, session=None, explode_leaves=False):
+    """Same dict as Schedule.to_dict(summary_only=False, explode_leaves), or None."""
+    session = session or db.session
+    header = session.execute(
+        select(*_SCHEDULE_COLUMNS).where(Schedule.id == schedule_id)
+    ).first()
+    if header is None:
+        return None
+    data = _schedule_row(header)
+
+    memberships = serialize_memberships(schedule_id, session=session)
+
+    leaves_by_date, exploded, intervals, spans = defaultdict(list), [], [], []
+    for m in memberships:
+        for leave in m["leaves"]:
+            curr = date.fromisoformat(leave["start_date"])
+            end = date.fromisoformat(leave["end_date"])
+            if not explode_leaves:
+                spans.append((curr, end))
+                intervals.append(
+                    leave_interval(
+                        leave["id"],
+                        m["id"],
+                        m["person_id"],
+                        m["person_name"],
+                        leave["reason"],
+                        curr,
+                        end,
+                    )
+                )
+                continue
+            # Exploded per date (as Schedule._get_leaves_by_date / _exploded)
+            while curr <= end:
+                iso = curr.isoformat()
+                leaves_by_date[iso].append(
+                    {
+                        "id": leave["id"],
+                        "person_name": m["person_name"],
+                        "reason": leave["reason"],
+                        "membership_id": m["id"],
+                        "person_id": m["person_id"],
+                    }
+                )
+                exploded.append(
+                    {
+                        "id": leave["id"],
+                        "date": iso,
+                        "membership_id": m["id"],
+                        "person_name": m["person_name"],
+                        "reason": leave["reason"],
+                    }
+                )
+                curr += timedelta(days=1)
+
+    exclusions_by_day = defaultdict(list)
+    for m in memberships:
+        for e in m["exclusions"]:
+            exclusions_by_day[e["day_id"]].append(e)
+    for day_exclusions in exclusions_by_day.values():
+        day_exclusions.sort(key=itemgetter("id"))
+
+    days = _serialize_day_rows(
+        session,
+        schedule_id,
+        leaves_by_date,
+        exclusions_by_day,
+        leave_spans=None if explode_leaves else spans,
+    )
+
+    stations = [
+        _station_row(r)
+        for r in session.execute(
+            select(
+                ScheduleStation.id,
+                ScheduleStation.schedule_id,
+                ScheduleStation.station_id,
+                MasterStation.name,
+                MasterStation.abbr,
+            )
+            .outerjoin(MasterStation, MasterStation.id == ScheduleStation.station_id)
+            .where(ScheduleStation.schedule_id == schedule_id)
+            .order_by(ScheduleStation.id)
+        )
+    ]
+
+    data["days"] = days
+    data["memberships"] = memberships
+    data["required_stations"] = stations
+    if explode_leaves:
+        data["leaves_exploded"] = exploded
+    else:
+        data["leave_intervals"] = intervals
+    return data
+
@@ -0,0 +1,358 @@
+"""
+Per-schedule memoization for derived data (quotas, availability, weekend
+clusters, day weights, valid shifts).
+
+Each entry declares the models it was derived from. change_tracking tells us
+which models changed for which schedule, and only the entries that depend on
+those models are dropped. An assignment edit therefore keeps the quotas warm.
+
+The cache lives in the process, but entries are checked against the revision
+counters (revisions.py) on every read, so several workers can share one
+database: a write in one of them makes the others recompute.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from flask import current_app, has_app_context
+from sqlalchemy import select
+
+from ..database import db
+from ..models import ScheduleDay
+from . import change_tracking
+from .availibility import build_availability
+from .revisions import get_revisions_many
+from .schedule_utils import find_weekend_clusters
+
+# --- DEPENDENCIES (model names, see change_tracking.TRACKED_MODELS) ---
+DAY_DEPS = frozenset({"Schedule", "ScheduleDay"})
+QUOTA_DEPS = frozenset(
+    {
+        "Schedule",
+        "ScheduleDay",
+        "ScheduleStation",
+        "ScheduleMembership",
+        "ScheduleLeave",
+        "Group",
+    }
+)
+AVAILABILITY_DEPS = frozenset(
+    {
+        "Schedule",
+        "ScheduleDay",
+        "ScheduleStation",
+        "ScheduleMembership",
+        "ScheduleLeave",
+        "ScheduleExclusion",
+        "Qualification",
+    }
+)
+
+
+class ScheduleCache:
+    """
+    Thread-safe LRU keyed by (schedule_id, name).
+
+    Values are computed outside the lock, so two guards keep a value from
+    outliving the data it was read from:
+    - generations: invalidate() / discard*() bump the schedule's generation.
+      A value whose computation started before a bump is returned to its
+      caller but not stored.
+    - stamps: with a stamp_fn (the app's cache uses the schedule's revision
+      and the global revision), entries are stamped with the revisions read
+      before computing and only served while those still match. Writes from
+      other processes bump the revisions too, so each worker's copy goes stale
+      with them. Local writes re-stamp the entries they do not touch.
+    """
+
+    def __init__(self, max_entries=512, stamp_fn=None):
+        self.max_entries = max_entries
+        self.stamp_fn = stamp_fn  # [schedule_id] -> {schedule_id: stamp}
+        self._entries = OrderedDict()  # (schedule_id, name) -> (deps, value, stamp)
+        self._generations = {}
+        self._global_generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _stamps(self, schedule_ids):
+        if self.stamp_fn is None:
+            return {}
+        return self.stamp_fn(schedule_ids)
+
+    def _generation(self, schedule_id):
+        return self._global_generation, self._generations.get(schedule_id, 0)
+
+    def _bump(self, schedule_id):
+        self._generations[schedule_id] = self._generations.get(schedule_id, 0) + 1
+
+    def _lookup(self, key, stamp):
+        """The entry if its stamp is current (drops a stale one). Holds the lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] != stamp:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _insert(self, key, deps, value, token):
+        stamp, generation = token
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if self._generation(key[0]) != generation:
+                return  # invalidated while computing
+            self._entries[key] = (frozenset(deps), value, stamp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def snapshot(self, schedule_ids):
+        """
+        {schedule_id: token} to take BEFORE reading the data of a value that
+        is later handed to put().
+        """
+        stamps = self._stamps(schedule_ids)
+        with self._lock:
+            return {
+                s_id: (stamps.get(s_id), self._generation(s_id))
+                for s_id in schedule_ids
+            }
+
+    def get_or_compute(self, schedule_id, name, deps, compute):
+        key = (schedule_id, name)
+        token = self.snapshot([schedule_id])[schedule_id]
+        with self._lock:
+            entry = self._lookup(key, token[0])
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = compute()
+        self._insert(key, deps, value, token)
+        return value
+
+    def peek(self, schedule_id, name, check=True):
+        """
+        The cached value or None. check=False skips the stamp lookup, for
+        callers that cannot issue SQL (change listeners).
+        """
+        if not check:
+            with self._lock:
+                entry = self._entries.get((schedule_id, name))
+                return entry[1] if entry is not None else None
+        return self.peek_many([schedule_id], name).get(schedule_id)
+
+    def peek_many(self, schedule_ids, name):
+        """{schedule_id: value} for the current entries (one stamp lookup)."""
+        stamps = self._stamps(schedule_ids)
+        found = {}
+        with self._lock:
+            for s_id in schedule_ids:
+                entry = self._lookup((s_id, name), stamps.get(s_id))
+                if entry is not None:
+                    found[s_id] = entry[1]
+        return found
+
+    def put(self, schedule_id, name, deps, value, token=None):
+        """
+        Stores a value computed after snapshot() returned token. Without a
+        token the value is taken to match the current data.
+        """
+        if token is None:
+            token = self.snapshot([schedule_id])[schedule_id]
+        self._insert((schedule_id, name), deps, value, token)
+
+    def invalidate(self, change_set):
+        """
+        Drops the entries depending on the changed models and moves the others
+        to the new revisions. A rolled back transaction drops every entry of
+        the schedules it touched: they may have been stamped with a revision
+        the rollback hands out again.
+        """
+        with self._lock:
+            if change_set.global_models:
+                self._global_generation += 1
+            for s_id in change_set.by_schedule:
+                self._bump(s_id)
+
+            for key in list(self._entries):
+                schedule_id, _ = key
+                deps, value, stamp = self._entries[key]
+                models = change_set.by_schedule.get(schedule_id, set())
+                if change_set.rolled_back:
+                    drop = schedule_id in change_set.by_schedule or bool(
+                        change_set.global_models
+                    )
+                else:
+                    drop = bool(deps & models or deps & change_set.global_models)
+                if drop:
+                    del self._entries[key]
+                elif stamp is not None:
+                    stamp = _restamp(stamp, schedule_id, change_set)
+                    self._entries[key] = (deps, value, stamp)
+
+    def discard(self, schedule_id, name):
+        with self._lock:
+            self._bump(schedule_id)
+            self._entries.pop((schedule_id, name), None)
+
+    def discard_all(self, name):
+        with self._lock:
+            self._global_generation += 1
+            for key in [k for k in self._entries if k[1] == name]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._global_generation += 1
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _restamp(stamp, schedule_id, change_set):
+    """
+    Moves a (revision, global revision) stamp past the bump of change_set.
+    Only a stamp one behind the new number is moved: otherwise some other
+    write happened in between and the entry has to stay stale.
+    """
+    revision, global_revision = stamp
+    new_revision = change_set.revisions.get(schedule_id)
+    if new_revision is not None and revision == new_revision - 1:
+        revision = new_revision
+    new_global = change_set.global_revision
+    if new_global is not None and global_revision == new_global - 1:
+        global_revision = new_global
+    return revision, global_revision
+
+
+def _current_stamps(schedule_ids):
+    """
+    Read on db.session, so a transaction sees its own (uncommitted) bumps.
+    Kept for the rest of the transaction; a tracked write there drops them.
+    """
+    session = db.session()
+    memo = session.info.get("schedule_stamps")
+    if memo is None or memo[0] is not session.get_transaction():
+        memo = None
+    stamps = memo[1] if memo is not None else {}
+    missing = [s_id for s_id in schedule_ids if s_id not in stamps]
+    if missing:
+        found = get_revisions_many(missing, session=session)
+        for s_id in missing:
+            stamps[s_id] = found.get(s_id)
+        if memo is None:
+            session.info["schedule_stamps"] = (session.get_transaction(), stamps)
+    return {s_id: stamps[s_id] for s_id in schedule_ids}
+
+
+def current_revisions(schedule_id):
+    """(revision, global revision) as this transaction sees them, or None."""
+    return _current_stamps([schedule_id])[schedule_id]
+
+
+@change_tracking.register_writer
+def _forget_stamps(session, change_set):
+    session.info.pop("schedule_stamps", None)
+
+
+def init_schedule_cache(app):
+    app.extensions["schedule_cache"] = ScheduleCache(
+        max_entries=app.config.get("SCHEDULE_CACHE_MAX_ENTRIES", 512),
+        stamp_fn=_current_stamps,
+    )
+
+
+def get_schedule_cache():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get("schedule_cache")
+
+
+@change_tracking.register_listener
+def _invalidate_on_change(change_set):
+    cache = get_schedule_cache()
+    if cache is not None:
+        cache.invalidate(change_set)
+
+
+def memoize(schedule_id, name, deps, compute):
+    """Returns the cached value, computing it on a miss (no cache -> compute)."""
+    cache = get_schedule_cache()
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(schedule_id, name, deps, compute)
+
+
+# --- CACHED DERIVED DATA ---
+
+
+def cached_availability(schedule_id):
+    return memoize(
+        schedule_id,
+        "availability",
+        AVAILABILITY_DEPS,
+        lambda: build_availability(schedule_id),
+    )
+
+
+def cached_day_weight_map(schedule_id):
+    """{day_id: weight} for the active (non-lookback) days."""
+
+    def compute():
+        matrix = cached_availability(schedule_id)
+        return {
+            d_id: float(w)
+            for d_id, w, lookback in zip(
+                matrix.day_ids, matrix.day_weights, matrix.lookback
+            )
+            if not lookback
+        }
+
+    return memoize(schedule_id, "day_weights", DAY_DEPS, compute)
+
+
+def cached_weekend_clusters(schedule_id):
+    """Lists of active day ids that form a (long) weekend block."""
+
+    def compute():
+        days = db.session.execute(
+            select(ScheduleDay.id, ScheduleDay.date, ScheduleDay.is_holiday)
+            .where(ScheduleDay.schedule_id == schedule_id)
+            .where(ScheduleDay.is_lookback.is_not(True))
+            .order_by(ScheduleDay.date)
+        ).all()
+        return find_weekend_clusters(days)
+
+    return memoize(schedule_id, "weekend_clusters", DAY_DEPS, compute)
+
+
+def cached_valid_shifts(schedule_id):
+    """
+    (membership_id, day_id, schedule_station_id) triples that pass the hard
+    constraints: active day, not on leave, qualified for the station.
+    """
+
+    def compute():
+        matrix = cached_availability(schedule_id)
+        ok = (
+            (~matrix.on_leave)[:, :, None]
+            & matrix.active_days[None, :, None]
+            & matrix.qualified[:, None, :]
+        )
+        return frozenset(
+            (
+                matrix.member_ids[i],
+                matrix.day_ids[j],
+                matrix.schedule_station_ids[k],
+            )
+            for i, j, k in np.argwhere(ok)
+        )
+
+    return memoize(schedule_id, "valid_shifts", AVAILABILITY_DEPS, compute)
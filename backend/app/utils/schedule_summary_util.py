@@ -1,101 +1,83 @@
-from sqlalchemy import func
-from ..database import db
-from ..models import (
-    Schedule,
-    ScheduleDay,
-    ScheduleMembership,
-    MembershipStationWeight,
-    ScheduleStation,
-    Person,
-)
-
-
-from sqlalchemy.orm import selectinload, joinedload
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload, selectinload
 from ..database import db
 from ..models import (
     Schedule,
     ScheduleDay,
     ScheduleStation,
     ScheduleMembership,
+    ScheduleExclusion,
     MembershipStationWeight,
-    Assignment,
+    Person,
 )
+from .schedule_cache import cached_availability
 
 
 def get_schedule_summary_data(schedule_id):
     """
-    Fetches all data for the Schedule Workspace in a single 'Power Query'.
-    Solves N+1 issues by eager-loading days, stations, memberships, and assignments.
+    Health metrics for the Schedule Workspace, built from aggregate queries.
+    Cost scales with the number of stations and members, never with
+    assignments (which are not read at all).
     """
-    # 1. THE POWER QUERY
-    # We use selectinload for collections (lists) and joinedload for single objects
-    schedule = (
-        db.session.query(Schedule)
-        .options(
-            # Load the calendar days
-            selectinload(Schedule.days),
-            # Load the station links + the MasterStation info (Abbr, Name)
-            selectinload(Schedule.required_stations).joinedload(
-                ScheduleStation.master_station
-            ),
-            # Load the Roster + Personnel details + their specific Weights + Qualifications
-            selectinload(Schedule.memberships).options(
-                joinedload(ScheduleMembership.person),
-                joinedload(ScheduleMembership.group),
-                selectinload(ScheduleMembership.station_weights).joinedload(
-                    MembershipStationWeight.station
-                ),
-                selectinload(ScheduleMembership.leaves),
-                # Note: qualifications are usually on the Person model
-                joinedload(ScheduleMembership.person).selectinload(
-                    Person.qualifications
-                ),
-            ),
-            # Load all Assignment slots for the month (The grid data)
-            selectinload(Schedule.assignments).options(
-                joinedload(Assignment.day),
-                joinedload(Assignment.master_station),
-                # Nested join: Assignment -> Membership -> Person (to get the name)
-                joinedload(Assignment.membership).joinedload(ScheduleMembership.person),
-            ),
-        )
-        .filter(Schedule.id == schedule_id)
-        .first()
-    )
-
-    if not schedule:
+    # 1. Header (columns only: no Schedule entity, no eager-loaded children)
+    header = db.session.execute(
+        select(Schedule.id, Schedule.name).where(Schedule.id == schedule_id)
+    ).first()
+    if not header:
         return None
 
-    # Force a refresh to ensure we aren't looking at a stale session cache
-    db.session.refresh(schedule)
-
     warnings = []
 
-    # 2. Demand Calculation (Using pre-loaded days)
-    total_calendar_weight = sum(day.weight for day in schedule.days)
+    # 2. Demand Calculation: SUM(weight) over the days
+    total_calendar_weight = db.session.scalar(
+        select(func.coalesce(func.sum(ScheduleDay.weight), 0.0)).where(
+            ScheduleDay.schedule_id == schedule_id
+        )
+    )
 
     # 3. Station Health Analysis
+    required_stations = db.session.scalars(
+        select(ScheduleStation)
+        .options(joinedload(ScheduleStation.master_station))
+        .where(ScheduleStation.schedule_id == schedule_id)
+        .order_by(ScheduleStation.id)
+    ).all()
+
+    # Supply per station: SUM / COUNT of the members' station weights
+    supply_rows = db.session.execute(
+        select(
+            MembershipStationWeight.station_id,
+            func.sum(MembershipStationWeight.weight),
+            func.count(MembershipStationWeight.id),
+        )
+        .join(ScheduleMembership)
+        .where(ScheduleMembership.schedule_id == schedule_id)
+        .group_by(MembershipStationWeight.station_id)
+    ).all()
+    supply_map = {st_id: (weight, count) for st_id, weight, count in supply_rows}
+
+    # Coverage: active days on which NO qualified member is available
+    availability = cached_availability(schedule_id)
+    available_active = availability.available[:, availability.active_days]
+
     station_analysis = []
-    for sch_station in schedule.required_stations:
+    for sch_station in required_stations:
         master = sch_station.master_station
 
-        # Calculate supply by looking at pre-loaded memberships
-        relevant_weights = [
-            sw.weight
-            for mem in schedule.memberships
-            for sw in mem.station_weights
-            if sw.station_id == master.id
-        ]
+        k = availability.station_index.get(master.id)
+        if k is not None:
+            qualified_col = availability.qualified[:, k]
+            covered = (available_active & qualified_col[:, None]).any(axis=0)
+            uncovered_days = int((~covered).sum())
+        else:
+            uncovered_days = int(availability.active_days.sum())
 
-        supply_weight = sum(relevant_weights)
-        member_count = len(relevant_weights)
+        supply_weight, member_count = supply_map.get(master.id, (0.0, 0))
 
         # Calculate Load Factor (Demand / Supply)
         load_factor = (
             round(total_calendar_weight / supply_weight, 2) if supply_weight > 0 else 0
         )
-        db.session.refresh(schedule)
         status = "healthy"
         if member_count == 0:
             status = "critical"
@@ -106,6 +88,11 @@ def get_schedule_summary_data(schedule_id):
                 f"Station {master.abbr} load is high (Factor: {load_factor})."
             )
 
+        if uncovered_days > 0:
+            warnings.append(
+                f"Station {master.abbr} has no available qualified personnel on {uncovered_days} day(s)."
+            )
+
         station_analysis.append(
             {
                 "station_id": master.id,
@@ -114,22 +101,49 @@ def get_schedule_summary_data(schedule_id):
                 "assigned_members_count": member_count,
                 "supply_weight": float(supply_weight),
                 "load_factor": float(load_factor),
+                "uncovered_days": uncovered_days,
                 "status": status,
             }
         )
 
-    # 4. Personnel Overload Check (Total weight across all stations for a person)
-    for mem in schedule.memberships:
-        total_mem_weight = sum(sw.weight for sw in mem.station_weights)
-        if total_mem_weight > 1.0:
-            warnings.append(
-                f"Member {mem.person.name} is over-assigned (Total Weight: {total_mem_weight})."
-            )
+    # 4. Personnel Overload Check (Total weight across all stations per member)
+    overloaded = db.session.execute(
+        select(Person.name, func.sum(MembershipStationWeight.weight))
+        .select_from(MembershipStationWeight)
+        .join(ScheduleMembership)
+        .join(Person, Person.id == ScheduleMembership.person_id)
+        .where(ScheduleMembership.schedule_id == schedule_id)
+        .group_by(ScheduleMembership.id, Person.name)
+        .having(func.sum(MembershipStationWeight.weight) > 1.0)
+        .order_by(ScheduleMembership.id)
+    ).all()
+    for name, total_mem_weight in overloaded:
+        warnings.append(
+            f"Member {name} is over-assigned (Total Weight: {total_mem_weight})."
+        )
+
+    # 5. Roster (returned in full, so load exactly what to_dict() reads)
+    memberships = db.session.scalars(
+        select(ScheduleMembership)
+        .options(
+            joinedload(ScheduleMembership.person),
+            joinedload(ScheduleMembership.group),
+            selectinload(ScheduleMembership.station_weights).joinedload(
+                MembershipStationWeight.station
+            ),
+            selectinload(ScheduleMembership.leaves),
+            selectinload(ScheduleMembership.exclusions).joinedload(
+                ScheduleExclusion.day
+            ),
+        )
+        .where(ScheduleMembership.schedule_id == schedule_id)
+        .order_by(ScheduleMembership.id)
+    ).all()
 
-    # 5. Build Final Response
+    # 6. Build Final Response
     return {
-        "schedule_id": schedule.id,
-        "schedule_name": schedule.name,
+        "schedule_id": header.id,
+        "schedule_name": header.name,
         "total_calendar_load": float(total_calendar_weight),
         "is_solvable": (
             all(s["assigned_members_count"] > 0 for s in station_analysis)
@@ -138,9 +152,8 @@ def get_schedule_summary_data(schedule_id):
         ),
         "warnings": warnings,
         "station_health": station_analysis,
-        "required_stations": [s.to_dict() for s in schedule.required_stations],
-        "memberships": [m.to_dict() for m in schedule.memberships],
-        "member_count": len(schedule.memberships),
-        # Removed "assignments" for performance.
-        # Create a separate endpoint like /api/schedules/<id>/assignments for the Calendar grid.
+        "required_stations": [s.to_dict() for s in required_stations],
+        "memberships": [m.to_dict() for m in memberships],
+        "member_count": len(memberships),
+        # Assignments are served by /api/schedules/<id>/assignments for the grid.
     }
@@ -9,7 +9,9 @@ from app.models import (
     Assignment,
 )
 from .holidays import get_holidays_with_breaks
+from .bulk_ops import insert_rows
 from datetime import timedelta, date
+from sqlalchemy import select
 
 
 def populate_holiday_table(start_date_str, end_date_str):
@@ -136,20 +138,56 @@ def generate_schedule_days(schedule):
             day_name = holiday_map[current_date]
             is_holiday = True
 
-        # --- Create Day ---
-        new_day = ScheduleDay(
-            schedule_id=schedule.id,
-            date=current_date,
-            weight=day_weight,
-            name=day_name,
-            label=None,
-            is_holiday=is_holiday,
-            is_lookback=is_lookback,  # Ensure your model has this column
+        # --- Create Day (plain row: inserted in one bulk statement) ---
+        days_to_add.append(
+            {
+                "schedule_id": schedule.id,
+                "date": current_date,
+                "weight": day_weight,
+                "name": day_name,
+                "label": None,
+                "is_holiday": is_holiday,
+                "is_lookback": is_lookback,
+                "availability_estimate": 1.0,
+            }
         )
-        days_to_add.append(new_day)
         current_date += timedelta(days=1)
 
-    db.session.add_all(days_to_add)
+    insert_rows(ScheduleDay, days_to_add, schedule_id=schedule.id)
+
+
+def find_weekend_clusters(days):
+    """
+    Groups date-sorted days into weekend blocks.
+    A block is a run of consecutive Sat/Sun/holiday days that contains at least
+    one Sat or Sun (so a Friday holiday + weekend is ONE long weekend).
+    `days` needs .id, .date and .is_holiday; returns lists of day ids.
+    """
+
+    def is_weekend_part(d):
+        return d.date.weekday() in [5, 6] or bool(d.is_holiday)
+
+    clusters = []
+    current = []
+    prev_date = None
+    for d in days:
+        if not is_weekend_part(d):
+            continue
+        if current and (d.date - prev_date).days == 1:
+            current.append(d)
+        else:
+            if current:
+                clusters.append(current)
+            current = [d]
+        prev_date = d.date
+    if current:
+        clusters.append(current)
+
+    return [
+        [d.id for d in cluster]
+        for cluster in clusters
+        if any(d.date.weekday() in [5, 6] for d in cluster)
+    ]
 
 
 # app/utils/schedule_utils.py
@@ -160,24 +198,19 @@ def generate_assignments_for_station(db_session, schedule, master_station_id):
     Generates empty Assignment slots for every day in a schedule.
     Uses master_station_id because the Assignment model links to MasterStation.
     """
-    new_slots = []
-
-    # Ensure schedule.days exists (the fixture must have added them)
-    if not schedule.days:
-        return 0
-
-    for day in schedule.days:
-        new_slots.append(
-            Assignment(
-                schedule_id=schedule.id,
-                day_id=day.id,
-                station_id=master_station_id,  # Correct FK for your model
-                membership_id=None,
-                availability_estimate=1.0,
-                is_locked=False,
-            )
-        )
+    day_ids = db_session.scalars(
+        select(ScheduleDay.id).where(ScheduleDay.schedule_id == schedule.id)
+    ).all()
 
-    db_session.add_all(new_slots)
-    db_session.flush()
-    return len(new_slots)
+    new_slots = [
+        {
+            "schedule_id": schedule.id,
+            "day_id": day_id,
+            "station_id": master_station_id,  # Correct FK for your model
+            "membership_id": None,
+            "availability_estimate": 1.0,
+            "is_locked": False,
+        }
+        for day_id in day_ids
+    ]
+    return insert_rows(Assignment, new_slots, schedule_id=schedule.id)
@@ -1,182 +1,710 @@
-from collections import defaultdict
+import threading
+from bisect import insort
 from datetime import timedelta
+from sqlalchemy import and_, exists, false, func, literal, not_, null, select, union_all
 from ..models import (
     Assignment,
     ScheduleDay,
     ScheduleMembership,
-    ScheduleLeave,
-    ScheduleExclusion,
     ScheduleStation,
     MasterStation,
     Person,
+    ScheduleLeave,
+    ScheduleExclusion,
+    ScheduleCandidate,
+    Group,
 )
 from ..database import db
+from . import change_tracking
+from .revisions import revision_token
+from .schedule_cache import (
+    cached_availability,
+    current_revisions,
+    get_schedule_cache,
+    memoize,
+)
+from .candidate_apply import candidate_slots
 
+# Everything an alert reads besides the assignments themselves.
+# Assignment edits are applied incrementally (see _track_assignment_changes).
+VALIDATOR_DEPS = frozenset(
+    {
+        "Schedule",
+        "ScheduleDay",
+        "ScheduleMembership",
+        "ScheduleStation",
+        "ScheduleLeave",
+        "ScheduleExclusion",
+        "MasterStation",
+        "Person",
+        "Qualification",
+    }
+)
 
-def validate_schedule(schedule_id):
+ALERT_ORDER = {
+    "LEAVE_CONFLICT": 0,
+    "EXCLUSION_CONFLICT": 1,
+    "DOUBLE_BOOKING": 2,
+    "BACK_TO_BACK": 3,
+}
+
+
+class ValidatorContext:
+    """Names, dates and lookback flags the alerts are rendered with."""
+
+    def __init__(self, schedule_id):
+        days = db.session.execute(
+            select(ScheduleDay.id, ScheduleDay.date, ScheduleDay.is_lookback).where(
+                ScheduleDay.schedule_id == schedule_id
+            )
+        ).all()
+        self.day_map = {d.id: d.date for d in days}
+        self.day_by_date = {d.date: d.id for d in days}
+        self.date_str_map = {d.id: d.date.strftime("%m/%d") for d in days}
+        # 🟢 Create a map to check if a day is a "Lookback" day
+        self.lookback_map = {d.id: bool(d.is_lookback) for d in days}
+
+        self.member_map = dict(
+            db.session.execute(
+                select(ScheduleMembership.id, Person.name)
+                .join(Person)
+                .where(ScheduleMembership.schedule_id == schedule_id)
+            ).all()
+        )
+
+        self.station_map = dict(
+            db.session.execute(
+                select(ScheduleStation.id, MasterStation.abbr)
+                .join(MasterStation, ScheduleStation.station_id == MasterStation.id)
+                .where(ScheduleStation.schedule_id == schedule_id)
+            ).all()
+        )
+
+        # Leaves & Exclusions (shared members x days matrix)
+        self.availability = cached_availability(schedule_id)
+
+    def next_day(self, day_id):
+        d_date = self.day_map.get(day_id)
+        if d_date is None:
+            return None
+        return self.day_by_date.get(d_date + timedelta(days=1))
+
+    def prev_day(self, day_id):
+        d_date = self.day_map.get(day_id)
+        if d_date is None:
+            return None
+        return self.day_by_date.get(d_date - timedelta(days=1))
+
+
+# --- ALERT BUILDERS (shared by the Python and SQL paths) ---
+
+
+def _entry(ctx, a_id, m_id, d_id, s_id):
+    return {
+        "id": a_id,
+        "day_id": d_id,
+        "date_str": ctx.date_str_map.get(d_id, "Unknown Date"),
+        "station_name": ctx.station_map.get(s_id, "UNK"),
+        "member_name": ctx.member_map.get(m_id, "Unknown"),
+    }
+
+
+def _leave_alert(e):
+    return {
+        "key": f"LEAVE_CONFLICT:{e['id']}",
+        "type": "LEAVE_CONFLICT",
+        "day_id": e["day_id"],
+        "date": e["date_str"],
+        "member": e["member_name"],
+        "assignment_ids": [e["id"]],
+        "message": f"Assigned to {e['station_name']} while on leave",
+    }
+
+
+def _exclusion_alert(e):
+    return {
+        "key": f"EXCLUSION_CONFLICT:{e['id']}",
+        "type": "EXCLUSION_CONFLICT",
+        "day_id": e["day_id"],
+        "date": e["date_str"],
+        "member": e["member_name"],
+        "assignment_ids": [e["id"]],
+        "message": f"Assigned to {e['station_name']} on an excluded day",
+    }
+
+
+def _double_booking_alert(ctx, m_id, d_id, entries):
+    stations_str = ", ".join([e["station_name"] for e in entries])
+    return {
+        "key": f"DOUBLE_BOOKING:{m_id}:{d_id}",
+        "type": "DOUBLE_BOOKING",
+        "day_id": d_id,
+        "date": ctx.date_str_map.get(d_id),
+        "member": entries[0]["member_name"],
+        "assignment_ids": [e["id"] for e in entries],
+        "message": f"Double booked: {stations_str}",
+    }
+
+
+def _back_to_back_alert(m_id, d_id, curr, next_asn):
+    return {
+        "key": f"BACK_TO_BACK:{m_id}:{d_id}",
+        "type": "BACK_TO_BACK",
+        "day_id": d_id,
+        "date": next_asn["date_str"],
+        "member": curr["member_name"],
+        "assignment_ids": [next_asn["id"]],
+        "message": f"Back-to-back: {curr['station_name']} ({curr['date_str']}) to {next_asn['station_name']} ({next_asn['date_str']})",
+    }
+
+
+# --- SQL PATH ---
+
+
+def _day_gap(later, earlier, dialect_name):
+    """Whole days between two DATE columns, per dialect."""
+    if dialect_name == "sqlite":
+        return func.julianday(later) - func.julianday(earlier)
+    return later - earlier
+
+
+def alert_rows_statement(schedule_id, dialect_name="sqlite"):
     """
-    Runs sanity checks on the schedule and returns a list of alerts.
-    Ignores conflicts that occur entirely within 'Lookback' days.
+    One UNION ALL statement producing every conflict as a flat row:
+    (kind, assignment_id, membership_id, day_id, station_id,
+     prev_assignment_id, prev_day_id, prev_station_id)
+
+    - LEAVE_CONFLICT:     range join against ScheduleLeave (EXISTS, so
+                          overlapping leaves still yield one row)
+    - EXCLUSION_CONFLICT: EXISTS on ScheduleExclusion (membership, day)
+    - DOUBLE_BOOKING:     GROUP BY day, member HAVING COUNT(*) > 1
+                          (one row per assignment in the booked cell)
+    - BACK_TO_BACK:       LAG() over the member's assignments by date
     """
-    alerts = []
+    is_lookback = func.coalesce(ScheduleDay.is_lookback, false())
+    a = (
+        select(
+            Assignment.id.label("a_id"),
+            Assignment.membership_id.label("m_id"),
+            Assignment.day_id.label("day_id"),
+            Assignment.station_id.label("station_id"),
+            ScheduleDay.date.label("date"),
+            is_lookback.label("is_lookback"),
+        )
+        .join(ScheduleDay, ScheduleDay.id == Assignment.day_id)
+        .where(Assignment.schedule_id == schedule_id)
+        .where(Assignment.membership_id.is_not(None))
+        .cte("a")
+    )
 
-    # 1. FETCH ALL DATA
-    assignments = db.session.query(Assignment).filter_by(schedule_id=schedule_id).all()
-    if not assignments:
-        return []
+    def _row(kind, src, prev_a=None, prev_d=None, prev_s=None):
+        return select(
+            literal(kind).label("kind"),
+            src.c.a_id,
+            src.c.m_id,
+            src.c.day_id,
+            src.c.station_id,
+            (prev_a if prev_a is not None else null()).label("prev_a_id"),
+            (prev_d if prev_d is not None else null()).label("prev_day_id"),
+            (prev_s if prev_s is not None else null()).label("prev_station_id"),
+        )
 
-    # Get Days & Lookback Status
-    days = ScheduleDay.query.filter_by(schedule_id=schedule_id).all()
-    day_map = {d.id: d.date for d in days}
-    date_str_map = {d.id: d.date.strftime("%m/%d") for d in days}
-    # 🟢 Create a map to check if a day is a "Lookback" day
-    lookback_map = {d.id: getattr(d, "is_lookback", False) for d in days}
-
-    # Get Members
-    members = (
-        db.session.query(ScheduleMembership)
-        .join(Person)
-        .filter(ScheduleMembership.schedule_id == schedule_id)
-        .all()
+    leave = _row("LEAVE_CONFLICT", a).where(
+        not_(a.c.is_lookback),
+        exists().where(
+            ScheduleLeave.membership_id == a.c.m_id,
+            ScheduleLeave.start_date <= a.c.date,
+            ScheduleLeave.end_date >= a.c.date,
+        ),
     )
-    member_map = {m.id: m.person.name for m in members}
-
-    # Get Station Names
-    st_records = (
-        db.session.query(ScheduleStation, MasterStation)
-        .join(MasterStation, ScheduleStation.station_id == MasterStation.id)
-        .filter(ScheduleStation.schedule_id == schedule_id)
-        .all()
+
+    exclusion = _row("EXCLUSION_CONFLICT", a).where(
+        not_(a.c.is_lookback),
+        exists().where(
+            ScheduleExclusion.membership_id == a.c.m_id,
+            ScheduleExclusion.day_id == a.c.day_id,
+        ),
     )
-    station_map = {s.ScheduleStation.id: s.MasterStation.abbr for s in st_records}
 
-    # Get Leaves
-    leaves = (
-        ScheduleLeave.query.join(ScheduleMembership)
-        .filter(ScheduleMembership.schedule_id == schedule_id)
-        .all()
+    booked = (
+        select(a.c.day_id, a.c.m_id)
+        .where(not_(a.c.is_lookback))
+        .group_by(a.c.day_id, a.c.m_id)
+        .having(func.count() > 1)
+        .subquery("booked")
     )
-    leave_map = defaultdict(list)
-    for l in leaves:
-        leave_map[l.membership_id].append((l.start_date, l.end_date))
-
-    # Get Exclusions
-    exclusions = (
-        ScheduleExclusion.query.join(ScheduleMembership)
-        .filter(ScheduleMembership.schedule_id == schedule_id)
-        .all()
+    double = _row("DOUBLE_BOOKING", a).join(
+        booked, and_(booked.c.day_id == a.c.day_id, booked.c.m_id == a.c.m_id)
     )
-    exclusion_set = {(e.day_id, e.membership_id) for e in exclusions}
 
-    # 2. PROCESS ASSIGNMENTS
-    member_assignments = defaultdict(list)
-    daily_load = defaultdict(list)
+    window = {"partition_by": a.c.m_id, "order_by": (a.c.date, a.c.a_id)}
+    lagged = select(
+        a,
+        func.lag(a.c.a_id).over(**window).label("prev_a_id"),
+        func.lag(a.c.day_id).over(**window).label("prev_day_id"),
+        func.lag(a.c.station_id).over(**window).label("prev_station_id"),
+        func.lag(a.c.date).over(**window).label("prev_date"),
+        func.lag(a.c.is_lookback).over(**window).label("prev_lookback"),
+    ).subquery("lagged")
+    back_to_back = _row(
+        "BACK_TO_BACK",
+        lagged,
+        lagged.c.prev_a_id,
+        lagged.c.prev_day_id,
+        lagged.c.prev_station_id,
+    ).where(
+        _day_gap(lagged.c.date, lagged.c.prev_date, dialect_name) == 1,
+        not_(and_(lagged.c.prev_lookback, lagged.c.is_lookback)),
+    )
 
-    for a in assignments:
-        if not a.membership_id:
-            continue
+    return union_all(leave, exclusion, double, back_to_back)
 
-        # 🟢 Check Lookback Status
-        is_lookback = lookback_map.get(a.day_id, False)
-
-        d_date = day_map.get(a.day_id)
-        m_name = member_map.get(a.membership_id, "Unknown")
-        s_name = station_map.get(a.station_id, "UNK")
-        d_str = date_str_map.get(a.day_id, "Unknown Date")
-
-        entry = {
-            "id": a.id,
-            "date": d_date,
-            "date_str": d_str,
-            "day_id": a.day_id,
-            "station_name": s_name,
-            "member_name": m_name,
-            "is_lookback": is_lookback,  # Store for B2B check
-        }
 
-        member_assignments[a.membership_id].append(entry)
-        daily_load[(a.day_id, a.membership_id)].append(entry)
+def alerts_from_rows(ctx, rows):
+    """Renders flat conflict rows into {(membership_id, day_id): [alert, ...]}."""
+    by_cell = {}
+    booked = {}
+    for kind, a_id, m_id, d_id, s_id, prev_a, prev_d, prev_s in rows:
+        e = _entry(ctx, a_id, m_id, d_id, s_id)
+        cell = by_cell.setdefault((m_id, d_id), [])
+        if kind == "LEAVE_CONFLICT":
+            cell.append(_leave_alert(e))
+        elif kind == "EXCLUSION_CONFLICT":
+            cell.append(_exclusion_alert(e))
+        elif kind == "DOUBLE_BOOKING":
+            booked.setdefault((m_id, d_id), []).append(e)
+        elif kind == "BACK_TO_BACK":
+            curr = _entry(ctx, prev_a, m_id, prev_d, prev_s)
+            cell.append(_back_to_back_alert(m_id, d_id, curr, e))
+
+    for (m_id, d_id), entries in booked.items():
+        entries.sort(key=lambda e: e["id"])
+        by_cell[(m_id, d_id)].append(_double_booking_alert(ctx, m_id, d_id, entries))
+    return by_cell
+
+
+def validate_schedule_sql(schedule_id):
+    """
+    SQL-native validation: all four checks in one round trip, no ORM objects.
+    Returns the same alert list as validate_schedule.
+    """
+    ctx = get_validator_context(schedule_id)
+    stmt = alert_rows_statement(schedule_id, db.session.get_bind().dialect.name)
+    by_cell = alerts_from_rows(ctx, db.session.execute(stmt).all())
+    return _sorted([a for alerts in by_cell.values() for a in alerts])
+
+
+class AlertState:
+    """
+    The schedule's alerts, bucketed by (membership_id, day_id) cell.
+
+    Every alert only looks at its own cell and the member's previous day, so a
+    changed assignment only needs its old/new cell and the following day
+    re-checked. refresh() does exactly that for the dirty assignment ids.
+    The initial set is seeded by the SQL checks (use_sql=False runs the same
+    checks in Python, cell by cell). Passing `rows` validates an in-memory
+    assignment set instead of the database (used for candidates).
+
+    `base` is the revision token (see revisions.revision_token) the alerts
+    were last refreshed at; clients send it back to get deltas against it.
+    """
+
+    def __init__(self, schedule_id, context, use_sql=True, rows=None):
+        self.schedule_id = schedule_id
+        self.context = context
+        self.rows = {}  # assignment_id -> (membership_id, day_id, station_id)
+        self.cells = {}  # (membership_id, day_id) -> sorted [assignment_id]
+        self.alerts = {}  # (membership_id, day_id) -> [alert, ...]
+        self.dirty = set()
+        self.base = None
+        self.lock = threading.RLock()  # autoflush may re-enter via the listener
+
+        in_memory = rows is not None
+        if not in_memory:
+            rows = db.session.execute(
+                select(
+                    Assignment.id,
+                    Assignment.membership_id,
+                    Assignment.day_id,
+                    Assignment.station_id,
+                )
+                .where(Assignment.schedule_id == schedule_id)
+                .where(Assignment.membership_id.is_not(None))
+            ).all()
+        for a_id, m_id, d_id, s_id in rows:
+            if m_id is not None:
+                self._add_row(a_id, m_id, d_id, s_id)
+
+        if use_sql and not in_memory:
+            stmt = alert_rows_statement(
+                schedule_id, db.session.get_bind().dialect.name
+            )
+            self.alerts = alerts_from_rows(context, db.session.execute(stmt).all())
+        else:
+            for cell in list(self.cells):
+                self._store(cell, self._check_cell(*cell))
+
+    # --- INDEX ---
+
+    def _add_row(self, a_id, m_id, d_id, s_id):
+        self.rows[a_id] = (m_id, d_id, s_id)
+        insort(self.cells.setdefault((m_id, d_id), []), a_id)
+
+    def _remove_row(self, a_id):
+        m_id, d_id, _ = self.rows.pop(a_id)
+        cell = self.cells[(m_id, d_id)]
+        cell.remove(a_id)
+        if not cell:
+            del self.cells[(m_id, d_id)]
+        return m_id, d_id
+
+    def _store(self, cell, alerts):
+        if alerts:
+            self.alerts[cell] = alerts
+        else:
+            self.alerts.pop(cell, None)
+
+    # --- CHECKS ---
+
+    def _entry(self, a_id):
+        m_id, d_id, s_id = self.rows[a_id]
+        return _entry(self.context, a_id, m_id, d_id, s_id)
+
+    def _check_cell(self, m_id, d_id):
+        """All alerts anchored on one member's day."""
+        ids = self.cells.get((m_id, d_id))
+        if not ids:
+            return []
 
+        ctx = self.context
+        alerts = []
+        entries = [self._entry(a_id) for a_id in ids]
         # 🟢 SKIP Single-Day Checks if this is a Lookback Day
-        if is_lookback:
-            continue
+        is_lookback = ctx.lookback_map.get(d_id, False)
+
+        if not is_lookback:
+            for e in entries:
+                # CHECK 3: LEAVE CONFLICT
+                if ctx.availability.is_on_leave(m_id, d_id):
+                    alerts.append(_leave_alert(e))
+
+                # CHECK 4: EXCLUSION CONFLICT
+                if ctx.availability.is_excluded(m_id, d_id):
+                    alerts.append(_exclusion_alert(e))
 
-        # CHECK 3: LEAVE CONFLICT
-        if a.membership_id in leave_map:
-            for start, end in leave_map[a.membership_id]:
-                if start <= d_date <= end:
-                    alerts.append(
-                        {
-                            "type": "LEAVE_CONFLICT",
-                            "day_id": a.day_id,
-                            "date": d_str,
-                            "member": m_name,
-                            "assignment_ids": [a.id],
-                            "message": f"Assigned to {s_name} while on leave",
-                        }
-                    )
-
-        # CHECK 4: EXCLUSION CONFLICT
-        if (a.day_id, a.membership_id) in exclusion_set:
+            # CHECK 1: DOUBLE BOOKING
+            # (we don't care about historical double bookings in Lookback)
+            if len(entries) > 1:
+                alerts.append(_double_booking_alert(ctx, m_id, d_id, entries))
+
+        # CHECK 2: BACK-TO-BACK (previous calendar day -> this day)
+        prev_id = ctx.prev_day(d_id)
+        prev_ids = self.cells.get((m_id, prev_id)) if prev_id is not None else None
+        # 🟢 LOGIC: Ignore only if BOTH are lookback days
+        if prev_ids and not (ctx.lookback_map.get(prev_id, False) and is_lookback):
             alerts.append(
-                {
-                    "type": "EXCLUSION_CONFLICT",
-                    "day_id": a.day_id,
-                    "date": d_str,
-                    "member": m_name,
-                    "assignment_ids": [a.id],
-                    "message": f"Assigned to {s_name} on an excluded day",
-                }
+                _back_to_back_alert(m_id, d_id, self._entry(prev_ids[-1]), entries[0])
             )
 
-    # CHECK 1: DOUBLE BOOKING
-    for (day_id, mem_id), entries in daily_load.items():
-        # 🟢 SKIP if Lookback Day (we don't care about historical double bookings)
-        if lookback_map.get(day_id, False):
-            continue
+        return alerts
 
-        if len(entries) > 1:
-            ids = [e["id"] for e in entries]
-            name = entries[0]["member_name"]
-            stations_str = ", ".join([e["station_name"] for e in entries])
-            alerts.append(
-                {
-                    "type": "DOUBLE_BOOKING",
-                    "day_id": day_id,
-                    "date": date_str_map.get(day_id),
-                    "member": name,
-                    "assignment_ids": ids,
-                    "message": f"Double booked: {stations_str}",
-                }
+    # --- INCREMENTAL UPDATE ---
+
+    def refresh(self, assignment_ids):
+        """
+        Re-reads the given assignments (one query) and re-checks only the
+        cells they left / entered plus the following day of each.
+        Returns (added, removed) alert lists.
+        """
+        assignment_ids = set(assignment_ids) | self.dirty
+        self.dirty = set()
+        if not assignment_ids:
+            return [], []
+
+        fresh = db.session.execute(
+            select(
+                Assignment.id,
+                Assignment.membership_id,
+                Assignment.day_id,
+                Assignment.station_id,
             )
+            .where(Assignment.id.in_(assignment_ids))
+            .where(Assignment.schedule_id == self.schedule_id)
+        ).all()
+
+        touched = set()
+        for a_id in assignment_ids:
+            if a_id in self.rows:
+                touched.add(self._remove_row(a_id))
+        for a_id, m_id, d_id, s_id in fresh:
+            if m_id is not None:
+                self._add_row(a_id, m_id, d_id, s_id)
+                touched.add((m_id, d_id))
+
+        affected = set(touched)
+        for m_id, d_id in touched:
+            next_id = self.context.next_day(d_id)
+            if next_id is not None:
+                affected.add((m_id, next_id))
+
+        added, removed = [], []
+        for cell in affected:
+            old = self.alerts.get(cell, [])
+            new = self._check_cell(*cell)
+            self._store(cell, new)
+            removed.extend(a for a in old if a not in new)
+            added.extend(a for a in new if a not in old)
+        return _sorted(added), _sorted(removed)
+
+    def all_alerts(self):
+        return _sorted([a for alerts in self.alerts.values() for a in alerts])
+
+
+def _sorted(alerts):
+    return sorted(alerts, key=lambda a: (ALERT_ORDER[a["type"]], a["assignment_ids"][0]))
+
+
+def get_validator_context(schedule_id):
+    return memoize(
+        schedule_id,
+        "validator_context",
+        VALIDATOR_DEPS,
+        lambda: ValidatorContext(schedule_id),
+    )
+
+
+def get_alert_state(schedule_id):
+    def compute():
+        return AlertState(schedule_id, get_validator_context(schedule_id))
+
+    return memoize(schedule_id, "alert_state", VALIDATOR_DEPS, compute)
+
+
+@change_tracking.register_listener
+def _track_assignment_changes(change_set):
+    """Marks edited assignments dirty; bulk edits (ids unknown) drop the state."""
+    cache = get_schedule_cache()
+    if cache is None:
+        return
+    if "Assignment" in change_set.global_models:
+        cache.discard_all("alert_state")
+        return
+
+    for s_id, name in change_set.untracked:
+        if name == "Assignment":
+            cache.discard(s_id, "alert_state")
+
+    for (s_id, name), ids in change_set.row_ids.items():
+        if name != "Assignment":
+            continue
+        state = cache.peek(s_id, "alert_state", check=False)
+        if state is not None:
+            with state.lock:
+                state.dirty.update(ids)
+
+
+def validate_schedule(schedule_id):
+    """
+    Runs sanity checks on the schedule and returns a list of alerts.
+    Ignores conflicts that occur entirely within 'Lookback' days.
+    The alert set is cached; edits since the last call are applied incrementally.
+    """
+    state = get_alert_state(schedule_id)
+    with state.lock:
+        _refresh_to_current(state, ())
+        return state.all_alerts()
+
+
+def _refresh_to_current(state, assignment_ids):
+    """
+    Refreshes the state and labels it with the current revisions. They are
+    read first: a write landing in between only makes the label older.
+    Returns (previous base, added, removed). Caller holds state.lock.
+    """
+    revisions = current_revisions(state.schedule_id)
+    seen = state.base
+    added, removed = state.refresh(assignment_ids)
+    state.base = revision_token(revisions) if revisions is not None else None
+    return seen, added, removed
+
+
+def validate_changes(schedule_id, assignment_ids, base=None, build=True):
+    """
+    Incremental mode: re-checks only the (member, day +/- 1) neighborhood of
+    the given assignments. `base` is the revision token the caller's alerts
+    are from (the GET /alerts ETag, or the "base" of its last delta).
+
+    Returns {"base", "added", "removed"} when the cached alert set was last
+    refreshed at `base`: the delta then covers every change since, whoever
+    made it. Otherwise (no / older base, rebuilt set) {"base", "alerts"} with
+    the full list. With build=False, returns None instead of building a cold
+    alert set.
+    """
+    cache = get_schedule_cache()
+    if not build and (cache is None or cache.peek(schedule_id, "alert_state") is None):
+        return None
+
+    state = get_alert_state(schedule_id)
+    with state.lock:
+        seen, added, removed = _refresh_to_current(state, assignment_ids)
+        if base is None or base != seen:
+            return {"base": state.base, "alerts": state.all_alerts()}
+        return {"base": state.base, "added": added, "removed": removed}
 
-    # CHECK 2: BACK-TO-BACK
-    for mem_id, entries in member_assignments.items():
-        entries.sort(key=lambda x: x["date"])
-        for i in range(len(entries) - 1):
-            curr, next_asn = entries[i], entries[i + 1]
 
-            # Check consecutive days
-            if (next_asn["date"] - curr["date"]) == timedelta(days=1):
+# --- CANDIDATES ---
 
-                # 🟢 LOGIC: Ignore only if BOTH are lookback days
-                if curr["is_lookback"] and next_asn["is_lookback"]:
-                    continue
 
-                # If 'curr' is Lookback and 'next' is Normal -> This IS a conflict (Fatigue carries over)
-                # If 'curr' is Normal and 'next' is Normal -> This IS a conflict
+class CandidateSnapshot:
+    """
+    Everything candidate validation reads, loaded once per schedule:
+    the slots (with locks), per-member min/max limits and the alert context.
+    """
+
+    def __init__(self, schedule_id):
+        self.schedule_id = schedule_id
+        self.context = get_validator_context(schedule_id)
+
+        # (day_id, station_id) -> (assignment_id, membership_id, is_locked)
+        self.slots = {
+            (d_id, s_id): (a_id, m_id, bool(locked))
+            for a_id, d_id, s_id, m_id, locked in db.session.execute(
+                select(
+                    Assignment.id,
+                    Assignment.day_id,
+                    Assignment.station_id,
+                    Assignment.membership_id,
+                    Assignment.is_locked,
+                ).where(Assignment.schedule_id == schedule_id)
+            ).all()
+        }
+
+        # Same limits the solver enforces (Override, else the Person's Group)
+        self.limits = {}
+        rows = db.session.execute(
+            select(
+                ScheduleMembership.id,
+                ScheduleMembership.override_min_assignments,
+                ScheduleMembership.override_max_assignments,
+                Group.min_assignments,
+                Group.max_assignments,
+            )
+            .join(Person, Person.id == ScheduleMembership.person_id)
+            .outerjoin(Group, Group.id == Person.group_id)
+            .where(ScheduleMembership.schedule_id == schedule_id)
+        ).all()
+        for m_id, o_min, o_max, g_min, g_max in rows:
+            if o_min is None:
+                o_min = g_min if g_min is not None else 0
+            if o_max is None:
+                o_max = g_max if g_max is not None else 999
+            self.limits[m_id] = (o_min, o_max)
+
+    def applied_rows(self, assignments_data):
+        """
+        The assignment rows apply_candidate would produce (locked slots keep
+        their member), plus LOCK_CONFLICT alerts where the candidate disagrees.
+        """
+        proposed = candidate_slots(assignments_data)
 
-                date_range = f"{curr['date_str']} -> {next_asn['date_str']}"
+        rows, lock_alerts = [], []
+        for (d_id, s_id), (a_id, m_id, locked) in self.slots.items():
+            if (d_id, s_id) not in proposed:
+                rows.append((a_id, m_id, d_id, s_id))
+                continue
 
+            wanted = proposed[(d_id, s_id)]
+            if locked and wanted != m_id:
+                e = _entry(self.context, a_id, m_id, d_id, s_id)
+                lock_alerts.append(
+                    {
+                        "key": f"LOCK_CONFLICT:{a_id}",
+                        "type": "LOCK_CONFLICT",
+                        "day_id": d_id,
+                        "date": e["date_str"],
+                        "member": e["member_name"],
+                        "assignment_ids": [a_id],
+                        "message": f"Candidate replaces the locked {e['station_name']} slot",
+                    }
+                )
+            rows.append((a_id, m_id if locked else wanted, d_id, s_id))
+        return rows, lock_alerts
+
+    def limit_alerts(self, rows):
+        counts = {}
+        for a_id, m_id, d_id, _ in rows:
+            if m_id is not None and not self.context.lookback_map.get(d_id, False):
+                counts.setdefault(m_id, []).append(a_id)
+
+        alerts = []
+        for m_id, (min_limit, max_limit) in self.limits.items():
+            ids = sorted(counts.get(m_id, []))
+            name = self.context.member_map.get(m_id, "Unknown")
+            if len(ids) > max_limit:
+                alerts.append(
+                    {
+                        "key": f"MAX_ASSIGNMENTS:{m_id}",
+                        "type": "MAX_ASSIGNMENTS",
+                        "day_id": None,
+                        "date": None,
+                        "member": name,
+                        "assignment_ids": ids,
+                        "message": f"{len(ids)} shifts exceeds the max of {max_limit}",
+                    }
+                )
+            elif len(ids) < min_limit:
                 alerts.append(
                     {
-                        "type": "BACK_TO_BACK",
-                        "day_id": next_asn["day_id"],
-                        "date": next_asn["date_str"],
-                        "member": curr["member_name"],
-                        "assignment_ids": [next_asn["id"]],
-                        "message": f"Back-to-back: {curr['station_name']} ({curr['date_str']}) to {next_asn['station_name']} ({next_asn['date_str']})",
+                        "key": f"MIN_ASSIGNMENTS:{m_id}",
+                        "type": "MIN_ASSIGNMENTS",
+                        "day_id": None,
+                        "date": None,
+                        "member": name,
+                        "assignment_ids": ids,
+                        "message": f"{len(ids)} shifts is below the min of {min_limit}",
                     }
                 )
+        return alerts
+
+    def validate(self, assignments_data):
+        rows, alerts = self.applied_rows(assignments_data)
+        state = AlertState(self.schedule_id, self.context, rows=rows)
+        return alerts + state.all_alerts() + self.limit_alerts(rows)
+
+
+def validate_candidates(schedule_id, run_id=None):
+    """
+    Validates every candidate (optionally of one run) in memory, as if it had
+    been applied. Returns [{candidate_id, run_id, score, alert_count, alerts}]
+    best score first.
+    """
+    stmt = (
+        select(
+            ScheduleCandidate.id,
+            ScheduleCandidate.run_id,
+            ScheduleCandidate.score,
+            ScheduleCandidate.assignments_data,
+        )
+        .where(ScheduleCandidate.schedule_id == schedule_id)
+        .order_by(ScheduleCandidate.score.asc())
+    )
+    if run_id is not None:
+        stmt = stmt.where(ScheduleCandidate.run_id == run_id)
+    candidates = db.session.execute(stmt).all()
+    if not candidates:
+        return []
 
-    return alerts
+    snapshot = CandidateSnapshot(schedule_id)
+    results = []
+    for c_id, c_run, score, assignments_data in candidates:
+        alerts = snapshot.validate(assignments_data)
+        results.append(
+            {
+                "candidate_id": c_id,
+                "run_id": c_run,
+                "score": score,
+                "alert_count": len(alerts),
+                "alerts": alerts,
+            }
+        )
+    return results
@@ -0,0 +1,443 @@
+"""
+What-if evaluation: applies hypothetical changes (leaves, overrides, group
+limits, day weights, memberships) to the cached schedule snapshot and reports
+the quota deltas, feasibility and quota-deviation score impact.
+
+Nothing is written and no transaction is opened. Everything is computed from
+the memoized QuotaInputs / AvailabilityMatrix plus a small cached context, so
+a warm request does not touch the database (except membership_add, which
+reads the new person's qualifications).
+"""
+
+from datetime import date
+
+import numpy as np
+from sqlalchemy import select
+
+from ..database import db
+from ..models import Assignment, Group, Person, Qualification, Schedule, ScheduleMembership
+from .availibility import AvailabilityMatrix
+from .quota_calculator import (
+    QuotaInputs,
+    QuotaLeave,
+    QuotaMember,
+    cached_quota_inputs,
+    calculate_schedule_quotas,
+    solve_quotas,
+)
+from .schedule_cache import cached_availability, memoize
+
+WHAT_IF_DEPS = frozenset(
+    {
+        "Schedule",
+        "ScheduleDay",
+        "ScheduleMembership",
+        "Assignment",
+        "Person",
+        "Group",
+    }
+)
+
+# request field -> (QuotaMember attribute, value type)
+OVERRIDE_FIELDS = {
+    "override_seniorityFactor": ("override_seniority", float),
+    "override_max_assignments": ("override_max", int),
+    "override_min_assignments": ("override_min", int),
+}
+GROUP_FIELDS = {
+    "seniorityFactor": ("group_seniority", float),
+    "max_assignments": ("group_max", int),
+    "min_assignments": ("group_min", int),
+}
+
+
+class WhatIfContext:
+    """Schedule data the score impact needs on top of the quota snapshot."""
+
+    def __init__(self, weight_quota, group_weights, priorities, assigned, groups):
+        self.weight_quota = weight_quota
+        self.group_weights = group_weights  # {str(group_id): weight}
+        self.priorities = priorities  # {membership_id: person's group weight}
+        self.assigned = assigned  # [(membership_id, day_id), ...]
+        self.groups = groups  # {group_id: (seniority, max, min)}
+
+
+def load_what_if_context(schedule_id):
+    schedule = db.session.execute(
+        select(Schedule.weight_quota_deviation, Schedule.group_weights).where(
+            Schedule.id == schedule_id
+        )
+    ).first()
+    if schedule is None:
+        return None
+
+    group_weights = {
+        str(k): float(v) for k, v in (schedule.group_weights or {}).items()
+    }
+
+    # Same rule as the optimizer: priority follows the Person's group
+    priorities = {}
+    rows = db.session.execute(
+        select(ScheduleMembership.id, Person.group_id)
+        .join(Person, Person.id == ScheduleMembership.person_id)
+        .where(ScheduleMembership.schedule_id == schedule_id)
+    ).all()
+    for m_id, group_id in rows:
+        priorities[m_id] = group_weights.get(str(group_id), 1.0) if group_id else 1.0
+
+    assigned = db.session.execute(
+        select(Assignment.membership_id, Assignment.day_id)
+        .where(Assignment.schedule_id == schedule_id)
+        .where(Assignment.membership_id.is_not(None))
+    ).all()
+
+    groups = {
+        g_id: (sen, g_max, g_min)
+        for g_id, sen, g_max, g_min in db.session.execute(
+            select(
+                Group.id,
+                Group.seniorityFactor,
+                Group.max_assignments,
+                Group.min_assignments,
+            )
+        ).all()
+    }
+
+    return WhatIfContext(
+        weight_quota=schedule.weight_quota_deviation or 1.0,
+        group_weights=group_weights,
+        priorities=priorities,
+        assigned=[tuple(a) for a in assigned],
+        groups=groups,
+    )
+
+
+def cached_what_if_context(schedule_id):
+    return memoize(
+        schedule_id,
+        "what_if_context",
+        WHAT_IF_DEPS,
+        lambda: load_what_if_context(schedule_id),
+    )
+
+
+def _parse_date(value, field):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an ISO date (YYYY-MM-DD).")
+
+
+def _require_int(change, field):
+    value = change.get(field)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"'{change.get('type')}' change requires an integer {field}.")
+    return value
+
+
+def _limit_updates(change, fields, nullable):
+    """
+    {attribute: value} for the limit fields present in the change. Counts
+    must be non-negative integers, factors non-negative numbers; null clears
+    an override. Raises ValueError.
+    """
+    updates = {}
+    for field, (attr, kind) in fields.items():
+        if field not in change:
+            continue
+        value = change[field]
+        if value is None and nullable:
+            updates[attr] = None
+            continue
+        allowed = (int,) if kind is int else (int, float)
+        if not isinstance(value, allowed) or isinstance(value, bool) or value < 0:
+            expected = "integer" if kind is int else "number"
+            suffix = " or null" if nullable else ""
+            raise ValueError(f"{field} must be a non-negative {expected}{suffix}.")
+        updates[attr] = kind(value)
+    return updates
+
+
+class Scenario:
+    """Mutable copy of a schedule snapshot that hypothetical changes are applied to."""
+
+    def __init__(self, inputs, context, matrix):
+        self.inputs = inputs
+        self.context = context
+        self.matrix = matrix
+
+        self.days = {d.id: d for d in inputs.days}
+        self.members = {m.id: m for m in inputs.members}
+        self.leaves = list(inputs.leaves)
+        self.priorities = dict(context.priorities)
+        self.added_people = set()  # person ids of membership_add changes
+
+        # Qualified station columns per member (master station ids)
+        self.qualifications = {
+            m_id: {
+                matrix.station_ids[k]
+                for k in np.flatnonzero(matrix.qualified[i])
+            }
+            for i, m_id in enumerate(matrix.member_ids)
+        }
+        self.excluded = {
+            (matrix.member_ids[i], matrix.day_ids[j])
+            for i, j in np.argwhere(matrix.excluded)
+        }
+        self._next_temp_id = -1
+
+    # --- CHANGES ---
+
+    def apply(self, change):
+        if not isinstance(change, dict):
+            raise ValueError("Each change must be an object.")
+        handler = getattr(self, f"_apply_{change.get('type')}", None)
+        if handler is None:
+            raise ValueError(f"Unknown change type: {change.get('type')!r}")
+        handler(change)
+
+    def _member(self, change):
+        m_id = _require_int(change, "membership_id")
+        if m_id not in self.members:
+            raise ValueError(f"Membership {m_id} is not part of this schedule.")
+        return m_id
+
+    def _apply_leave(self, change):
+        m_id = self._member(change)
+        start = _parse_date(change.get("start_date"), "start_date")
+        end = _parse_date(change.get("end_date", change.get("start_date")), "end_date")
+        if end < start:
+            raise ValueError("end_date must be on or after start_date.")
+        self.leaves.append(QuotaLeave(None, m_id, start, end))
+
+    def _apply_leave_remove(self, change):
+        leave_id = _require_int(change, "leave_id")
+        remaining = [l for l in self.leaves if l.id != leave_id]
+        if len(remaining) == len(self.leaves):
+            raise ValueError(f"Leave {leave_id} is not part of this schedule.")
+        self.leaves = remaining
+
+    def _apply_override(self, change):
+        m_id = self._member(change)
+        updates = _limit_updates(change, OVERRIDE_FIELDS, nullable=True)
+        self.members[m_id] = self.members[m_id]._replace(**updates)
+
+    def _apply_group(self, change):
+        group_id = _require_int(change, "group_id")
+        if group_id not in self.context.groups:
+            raise ValueError(f"Group {group_id} not found.")
+        updates = _limit_updates(change, GROUP_FIELDS, nullable=False)
+        for m_id, member in self.members.items():
+            if member.group_id == group_id:
+                self.members[m_id] = member._replace(**updates)
+
+    def _apply_day_weight(self, change):
+        day_id = _require_int(change, "day_id")
+        if day_id not in self.days:
+            raise ValueError(f"Day {day_id} is not part of this schedule.")
+        try:
+            weight = float(change["weight"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("'day_weight' change requires a numeric weight.")
+        self.days[day_id] = self.days[day_id]._replace(weight=weight)
+
+    def _apply_membership_add(self, change):
+        person_id = _require_int(change, "person_id")
+        group_id = _require_int(change, "group_id")
+        if group_id not in self.context.groups:
+            raise ValueError(f"Group {group_id} not found.")
+
+        person = db.session.execute(
+            select(Person.id, Person.group_id, ScheduleMembership.id)
+            .outerjoin(
+                ScheduleMembership,
+                (ScheduleMembership.person_id == Person.id)
+                & (ScheduleMembership.schedule_id == self.inputs.schedule_id),
+            )
+            .where(Person.id == person_id)
+        ).first()
+        if person is None:
+            raise ValueError("Person not found.")
+        # Already a member (unless removed earlier in this scenario)
+        if person_id in self.added_people or person[2] in self.members:
+            raise ValueError(
+                f"Person {person_id} is already a member of this schedule."
+            )
+        self.added_people.add(person_id)
+
+        m_id = self._next_temp_id
+        self._next_temp_id -= 1
+        g_sen, g_max, g_min = self.context.groups[group_id]
+        self.members[m_id] = QuotaMember(
+            m_id, group_id, None, None, None, g_sen, g_max, g_min
+        )
+        self.priorities[m_id] = self.context.group_weights.get(str(person.group_id), 1.0)
+        self.qualifications[m_id] = set(
+            db.session.scalars(
+                select(Qualification.station_id).where(
+                    Qualification.person_id == person_id,
+                    Qualification.is_active.is_(True),
+                )
+            ).all()
+        )
+
+    def _apply_membership_remove(self, change):
+        m_id = self._member(change)
+        del self.members[m_id]
+        self.leaves = [l for l in self.leaves if l.membership_id != m_id]
+
+    # --- RESULTING SNAPSHOTS ---
+
+    def to_inputs(self):
+        return QuotaInputs(
+            schedule_id=self.inputs.schedule_id,
+            days=[self.days[d.id] for d in self.inputs.days],
+            slots_per_day=self.inputs.slots_per_day,
+            members=list(self.members.values()),
+            leaves=self.leaves,
+        )
+
+    def to_matrix(self, inputs):
+        leaves_by_member = {}
+        for l in self.leaves:
+            leaves_by_member.setdefault(l.membership_id, []).append(
+                (l.start_date, l.end_date)
+            )
+        return AvailabilityMatrix(
+            member_ids=inputs.member_ids,
+            days=inputs.days,
+            stations=list(
+                zip(self.matrix.schedule_station_ids, self.matrix.station_ids)
+            ),
+            leaves_by_member=leaves_by_member,
+            exclusion_pairs=[p for p in self.excluded if p[0] in self.members],
+            qualification_pairs=[
+                (m_id, st_id)
+                for m_id in inputs.member_ids
+                for st_id in self.qualifications.get(m_id, ())
+            ],
+        )
+
+
+# --- EVALUATION ---
+
+
+def check_feasibility(inputs, matrix):
+    """
+    Same hard rules as the optimizer's pre-flight: every active day/station
+    needs someone qualified who is not on leave, and the limits must fit.
+    """
+    active = matrix.active_days
+    n_active = int(active.sum())
+    required = n_active * len(matrix.station_ids)
+
+    active_ids = [matrix.day_ids[j] for j in np.flatnonzero(active)]
+    can_work = (~matrix.on_leave[:, active]).astype(np.int64)
+    supply = can_work.T @ matrix.qualified.astype(np.int64)
+    uncovered = [
+        {"day_id": active_ids[j], "station_id": matrix.station_ids[k]}
+        for j, k in np.argwhere(supply == 0)
+    ]
+
+    capacity = float(np.minimum(inputs.shift_cap, n_active).sum())
+    minimum = float(
+        sum(
+            (m.override_min if m.override_min is not None else m.group_min) or 0
+            for m in inputs.members
+        )
+    )
+
+    issues = []
+    if uncovered:
+        issues.append(f"{len(uncovered)} slot(s) have no qualified member available.")
+    if capacity < required:
+        issues.append(
+            f"Max assignments allow {int(capacity)} shift(s) but {required} are required."
+        )
+    if minimum > required:
+        issues.append(
+            f"Min assignments need {int(minimum)} shift(s) but only {required} exist."
+        )
+
+    return {
+        "feasible": not issues,
+        "required_slots": required,
+        "shift_capacity": int(capacity),
+        "min_assignments": int(minimum),
+        "uncovered_slots": uncovered,
+        "issues": issues,
+    }
+
+
+def quota_penalty(inputs, quotas, priorities, assigned, weight_quota):
+    """
+    Quota Deviation cost of the CURRENT assignments, mirroring the solver:
+    prio * w_quota * (shortage + 2 * excess).
+    """
+    weights = {d.id: float(d.weight) for d in inputs.days if not d.is_lookback}
+    points = {m_id: 0.0 for m_id in inputs.member_ids}
+    for m_id, d_id in assigned:
+        if m_id in points and d_id in weights:
+            points[m_id] += weights[d_id]
+
+    total = 0.0
+    for m_id, actual in points.items():
+        target = quotas.get(m_id, 0.0)
+        shortage = max(0.0, target - actual)
+        excess = max(0.0, actual - target)
+        total += priorities.get(m_id, 1.0) * weight_quota * (shortage + 2.0 * excess)
+    return round(total, 2)
+
+
+def evaluate_what_if(schedule_id, changes):
+    """
+    Returns the impact report, or None if the schedule doesn't exist.
+    Raises ValueError for malformed or unknown changes.
+    """
+    inputs = cached_quota_inputs(schedule_id)
+    if inputs is None:
+        return None
+    context = cached_what_if_context(schedule_id)
+    matrix = cached_availability(schedule_id)
+
+    scenario = Scenario(inputs, context, matrix)
+    for change in changes:
+        scenario.apply(change)
+
+    after_inputs = scenario.to_inputs()
+    before = calculate_schedule_quotas(schedule_id)
+    after = solve_quotas(after_inputs)
+
+    quotas = {}
+    for m_id in list(before) + [m for m in after if m not in before]:
+        old = before.get(m_id)
+        new = after.get(m_id)
+        quotas[m_id] = {
+            "before": old,
+            "after": new,
+            "delta": round((new or 0.0) - (old or 0.0), 2),
+        }
+
+    score_before = quota_penalty(
+        inputs, before, context.priorities, context.assigned, context.weight_quota
+    )
+    score_after = quota_penalty(
+        after_inputs,
+        after,
+        scenario.priorities,
+        context.assigned,
+        context.weight_quota,
+    )
+
+    return {
+        "schedule_id": schedule_id,
+        "quotas": quotas,
+        "feasibility": check_feasibility(
+            after_inputs, scenario.to_matrix(after_inputs)
+        ),
+        "score": {
+            "before": score_before,
+            "after": score_after,
+            "delta": round(score_after - score_before, 2),
+        },
+    }
@@ -0,0 +1,78 @@
+"""
+CPU versus bytes for response compression on the typical payloads of the
+serialization benchmark schedule (60 members, 6 stations, 31 days).
+
+    cd backend && python -m benchmarks.compression [--runs 20]
+
+For each payload and codec/level: compressed size, ratio and median encode
+time. brotli rows appear only when the optional package is installed.
+"""
+
+import argparse
+import statistics
+import time
+
+from app import create_app
+from app.database import db
+from app.utils import compression
+from app.utils.row_serializers import (
+    serialize_assignments,
+    serialize_assignments_columnar,
+    serialize_memberships,
+    serialize_schedule,
+)
+from config import TestConfig
+from .serialization import build
+
+
+def codecs():
+    out = [
+        (f"gzip-{lvl}", lambda b, lvl=lvl: compression.gzip_encode(b, lvl))
+        for lvl in (1, 6, 9)
+    ]
+    if compression.brotli is not None:
+        out += [
+            (f"br-{q}", lambda b, q=q: compression.brotli_encode(b, q))
+            for q in (1, 4, 11)
+        ]
+    return out
+
+
+def median_ms(fn, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app(config_class=TestConfig)
+    with app.app_context():
+        db.create_all()
+        s_id = build()
+        encode = app.json.dumps
+        payloads = [
+            ("/schedules/<id>", serialize_schedule(s_id)),
+            ("/schedules/<id>/assignments", serialize_assignments(s_id)),
+            ("  ?format=columnar", serialize_assignments_columnar(s_id)),
+            ("/schedule-memberships", serialize_memberships(s_id)),
+        ]
+
+        print(f"{'payload':30} {'codec':8} {'bytes':>9} {'ratio':>7} {'ms':>7}")
+        for name, obj in payloads:
+            body = encode(obj).encode()
+            print(f"{name:30} {'none':8} {len(body):9d} {1:7.1f} {0:7.2f}")
+            for codec, fn in codecs():
+                size = len(fn(body))
+                ms = median_ms(lambda: fn(body), args.runs)
+                print(f"{'':30} {codec:8} {size:9d} {len(body) / size:7.1f} {ms:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
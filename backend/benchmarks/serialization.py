@@ -0,0 +1,193 @@
+"""
+Before/after timings for the heavy JSON endpoints on a 60-member,
+6-station, 31-day schedule (in-memory SQLite).
+
+    cd backend && python -m benchmarks.serialization [--runs 30]
+
+"before" = ORM load + to_dict() + Flask's stdlib JSON provider (the previous
+route bodies); "after" = row_serializers + the orjson provider.
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from app import create_app
+from app.database import db
+from app.models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleMembership,
+    ScheduleStation,
+    ScheduleLeave,
+    MembershipStationWeight,
+    Assignment,
+    Person,
+    Group,
+    MasterStation,
+    Qualification,
+)
+from app.utils.load_plans import load_schedule
+from app.utils.row_serializers import (
+    serialize_assignments,
+    serialize_assignments_columnar,
+    serialize_memberships,
+    serialize_schedule,
+)
+from config import TestConfig
+
+N_MEMBERS, N_STATIONS, N_DAYS = 60, 6, 31
+
+
+def build():
+    groups = [Group(name=f"G{i}") for i in range(3)]
+    stations = [
+        MasterStation(name=f"Station {k}", abbr=f"S{k}") for k in range(N_STATIONS)
+    ]
+    people = [Person(name=f"Person {i}") for i in range(N_MEMBERS)]
+    db.session.add_all(groups + stations + people)
+    db.session.flush()
+    for i, p in enumerate(people):
+        p.group_id = groups[i % 3].id
+        db.session.add_all(
+            Qualification(person_id=p.id, station_id=s.id)
+            for s in stations[i % N_STATIONS : i % N_STATIONS + 2]
+        )
+
+    start = date(2026, 1, 1)
+    sch = Schedule(
+        name="Bench", start_date=start, end_date=start + timedelta(days=N_DAYS - 1)
+    )
+    db.session.add(sch)
+    db.session.flush()
+    days = [
+        ScheduleDay(schedule_id=sch.id, date=start + timedelta(days=i))
+        for i in range(N_DAYS)
+    ]
+    members = [
+        ScheduleMembership(schedule_id=sch.id, person_id=p.id, group_id=p.group_id)
+        for p in people
+    ]
+    db.session.add_all(days + members)
+    db.session.add_all(
+        ScheduleStation(schedule_id=sch.id, station_id=s.id) for s in stations
+    )
+    db.session.flush()
+    for i, m in enumerate(members):
+        db.session.add(
+            MembershipStationWeight(
+                membership_id=m.id, station_id=stations[i % N_STATIONS].id, weight=1.0
+            )
+        )
+        if i % 5 == 0:
+            d0 = start + timedelta(days=i % N_DAYS)
+            db.session.add(
+                ScheduleLeave(
+                    membership_id=m.id, start_date=d0, end_date=d0 + timedelta(days=2)
+                )
+            )
+    db.session.add_all(
+        Assignment(
+            schedule_id=sch.id,
+            day_id=d.id,
+            station_id=s.id,
+            membership_id=members[(i * N_STATIONS + k) % N_MEMBERS].id,
+        )
+        for i, d in enumerate(days)
+        for k, s in enumerate(stations)
+    )
+    db.session.commit()
+    return sch.id
+
+
+# --- previous route bodies ---
+
+
+def legacy_schedule(s_id):
+    return load_schedule(s_id, "full").to_dict(summary_only=False, explode_leaves=True)
+
+
+def legacy_assignments(s_id):
+    rows = db.session.scalars(
+        select(Assignment)
+        .filter_by(schedule_id=s_id)
+        .options(
+            joinedload(Assignment.master_station),
+            joinedload(Assignment.day),
+            joinedload(Assignment.membership).joinedload(ScheduleMembership.person),
+        )
+    ).unique()
+    return [a.to_dict() for a in rows]
+
+
+def legacy_memberships(s_id):
+    rows = db.session.scalars(
+        select(ScheduleMembership)
+        .filter_by(schedule_id=s_id)
+        .options(
+            joinedload(ScheduleMembership.person),
+            joinedload(ScheduleMembership.group),
+            joinedload(ScheduleMembership.exclusions),
+            joinedload(ScheduleMembership.leaves),
+        )
+    ).unique()
+    return [m.to_dict() for m in rows]
+
+
+def timed(fn, encode, runs):
+    samples = []
+    for _ in range(runs):
+        db.session.expunge_all()
+        t0 = time.perf_counter()
+        encode(fn())
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    app = create_app(config_class=TestConfig)
+    with app.app_context():
+        db.create_all()
+        s_id = build()
+        stdlib = DefaultJSONProvider(app).dumps
+        fast = app.json.dumps
+
+        cases = [
+            ("/schedules/<id>", legacy_schedule, serialize_schedule),
+            ("/schedules/<id>/assignments", legacy_assignments, serialize_assignments),
+            ("/schedule-memberships", legacy_memberships, serialize_memberships),
+        ]
+        print(f"{'endpoint':32} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+        for name, before_fn, after_fn in cases:
+            before = timed(lambda: before_fn(s_id), stdlib, args.runs)
+            after = timed(lambda: after_fn(s_id), fast, args.runs)
+            print(f"{name:32} {before:10.2f} {after:10.2f} {before / after:7.1f}x")
+
+        rows = fast(serialize_assignments(s_id))
+        columnar = fast(serialize_assignments_columnar(s_id))
+        ms = timed(lambda: serialize_assignments_columnar(s_id), fast, args.runs)
+        print(
+            f"\n?format=columnar: {len(columnar)} bytes vs {len(rows)} "
+            f"({len(rows) / len(columnar):.1f}x smaller), {ms:.2f} ms"
+        )
+
+        exploded = fast(serialize_schedule(s_id, explode_leaves=True))
+        compact = fast(serialize_schedule(s_id))
+        print(
+            f"/schedules/<id> leave intervals: {len(compact)} bytes vs "
+            f"{len(exploded)} with ?leaves=exploded "
+            f"({len(exploded) / len(compact):.1f}x smaller)"
+        )
+
+
+if __name__ == "__main__":
+    main()
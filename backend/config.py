@@ -17,11 +17,70 @@ class Config:
             os.makedirs(INSTANCE_PATH)
         DB_PATH = os.path.join(INSTANCE_PATH, "watchbill.db")
         SQLALCHEMY_DATABASE_URI = f"sqlite:///{DB_PATH}"
+        # GET endpoints read through a query_only connection of the same file
+        SQLALCHEMY_READONLY_URI = f"sqlite:///file:{DB_PATH}?mode=ro&uri=true"
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Applied to every new SQLite connection. WAL lets readers run while the
+    # optimizer or an edit is committing; busy_timeout waits instead of
+    # failing with "database is locked". cache_size < 0 is in KiB.
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+    }
+
+    # Per-schedule memo cache for quotas / availability (0 disables it)
+    SCHEDULE_CACHE_MAX_ENTRIES = 512
+
+    # Encoded bodies of schedule-scoped GETs, keyed by schedule revision
+    # (0 entries disables it). RESPONSE_CACHE_DIR adds a disk tier shared by
+    # all worker processes.
+    RESPONSE_CACHE_MAX_ENTRIES = 1024
+    RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    RESPONSE_CACHE_DIR = os.environ.get("RESPONSE_CACHE_DIR")
+
+    # gzip / brotli (optional package) for buffered JSON bodies >= MIN_SIZE bytes;
+    # streamed responses are never compressed (see utils/compression.py)
+    COMPRESS_RESPONSES = True
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_GZIP_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 4
+
+    # X-SQL-Query-Count / -Row-Count / -Time-Ms headers + a JSON log line per request
+    SQL_INSTRUMENTATION = os.environ.get("SQL_INSTRUMENTATION", "0") == "1"
+
+
+class PostgresConfig(Config):
+    """
+    Multi-writer deployment: create_app(PostgresConfig).
+    DATABASE_URL e.g. postgresql+psycopg://watchbill:secret@db/watchbill
+    (the psycopg driver also enables COPY for bulk inserts, see bulk_ops).
+    """
+
+    SQLALCHEMY_DATABASE_URI = os.environ.get(
+        "DATABASE_URL", "postgresql+psycopg://watchbill@localhost/watchbill"
+    )
+    # Optional replica / read-only role for GET endpoints
+    SQLALCHEMY_READONLY_URI = os.environ.get("DATABASE_READONLY_URL")
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 20)),
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        # Drop connections the server closed (restarts, idle timeouts)
+        "pool_pre_ping": True,
+    }
+
 
 class TestConfig(Config):
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    # TEST_DATABASE_URL=postgresql+psycopg://... runs the suite against Postgres
+    SQLALCHEMY_DATABASE_URI = os.environ.get("TEST_DATABASE_URL", "sqlite:///:memory:")
+    SQLALCHEMY_READONLY_URI = None
     WTF_CSRF_ENABLED = False
+    SQL_INSTRUMENTATION = True
@@ -0,0 +1,82 @@
+"""Composite indexes and unique pairs for the hot access paths
+
+Revision ID: 3f1c2a7b9d04
+Revises: d9d9519470a5
+Create Date: 2026-10-19 10:12:41.208114
+
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a7b9d04'
+down_revision = 'd9d9519470a5'
+branch_labels = None
+depends_on = None
+
+
+log = logging.getLogger('alembic.runtime.migration')
+
+# (table, columns that must be unique together, which duplicate to keep first)
+UNIQUE_PAIRS = [
+    (
+        'assignments',
+        ('day_id', 'station_id'),
+        # a filled / locked slot wins over an empty copy
+        'membership_id IS NULL, CASE WHEN is_locked THEN 0 ELSE 1 END, id',
+    ),
+    ('schedule_exclusions', ('day_id', 'membership_id'), 'id'),
+    ('membership_station_weights', ('membership_id', 'station_id'), 'id'),
+]
+
+
+def _drop_duplicates(table, columns, keep_order):
+    """
+    Keeps the first row (by keep_order) of each duplicate group so the unique
+    index can build, and logs every row it deletes.
+    """
+    cols = ', '.join(columns)
+    bind = op.get_bind()
+    extra = bind.execute(
+        sa.text(
+            f'SELECT * FROM (SELECT *, ROW_NUMBER() OVER '
+            f'(PARTITION BY {cols} ORDER BY {keep_order}) AS dup_rank '
+            f'FROM {table}) ranked WHERE dup_rank > 1 ORDER BY id'
+        )
+    ).mappings().all()
+    for row in extra:
+        values = {k: v for k, v in row.items() if k != 'dup_rank'}
+        log.warning('Deleting duplicate %s row: %s', table, values)
+    if extra:
+        bind.execute(
+            sa.text(f'DELETE FROM {table} WHERE id IN :ids').bindparams(
+                sa.bindparam('ids', expanding=True)
+            ),
+            {'ids': [row['id'] for row in extra]},
+        )
+
+
+def upgrade():
+    for table, columns, keep_order in UNIQUE_PAIRS:
+        _drop_duplicates(table, columns, keep_order)
+
+    op.create_index('ux_assignments_day_station', 'assignments', ['day_id', 'station_id'], unique=True)
+    op.create_index('ix_assignments_schedule_locked', 'assignments', ['schedule_id', 'is_locked'], unique=False)
+    op.create_index('ix_schedule_days_schedule_date_lookback', 'schedule_days', ['schedule_id', 'date', 'is_lookback'], unique=False)
+    op.create_index('ix_schedule_leaves_member_range', 'schedule_leaves', ['membership_id', 'start_date', 'end_date'], unique=False)
+    op.create_index('ux_schedule_exclusions_day_member', 'schedule_exclusions', ['day_id', 'membership_id'], unique=True)
+    op.create_index('ix_schedule_candidates_schedule_score', 'schedule_candidates', ['schedule_id', 'score'], unique=False)
+    op.create_index('ux_membership_station_weights_member_station', 'membership_station_weights', ['membership_id', 'station_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ux_membership_station_weights_member_station', table_name='membership_station_weights')
+    op.drop_index('ix_schedule_candidates_schedule_score', table_name='schedule_candidates')
+    op.drop_index('ux_schedule_exclusions_day_member', table_name='schedule_exclusions')
+    op.drop_index('ix_schedule_leaves_member_range', table_name='schedule_leaves')
+    op.drop_index('ix_schedule_days_schedule_date_lookback', table_name='schedule_days')
+    op.drop_index('ix_assignments_schedule_locked', table_name='assignments')
+    op.drop_index('ux_assignments_day_station', table_name='assignments')
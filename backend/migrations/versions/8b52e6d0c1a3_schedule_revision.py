@@ -0,0 +1,26 @@
+"""Per-schedule revision counter (ETags on schedule-scoped GETs)
+
+Revision ID: 8b52e6d0c1a3
+Revises: 3f1c2a7b9d04
+Create Date: 2026-10-19 14:03:27.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b52e6d0c1a3'
+down_revision = '3f1c2a7b9d04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('revision', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('schedules', schema=None) as batch_op:
+        batch_op.drop_column('revision')
@@ -0,0 +1,26 @@
+"""Indexes for keyset pagination of the schedule and personnel lists
+
+Revision ID: c47d1e9a2f60
+Revises: 8b52e6d0c1a3
+Create Date: 2026-10-19 15:21:08.664310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47d1e9a2f60'
+down_revision = '8b52e6d0c1a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_schedules_start_date_id', 'schedules', ['start_date', 'id'], unique=False)
+    op.create_index('ix_personnel_name_id', 'personnel', ['name', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_personnel_name_id', table_name='personnel')
+    op.drop_index('ix_schedules_start_date_id', table_name='schedules')
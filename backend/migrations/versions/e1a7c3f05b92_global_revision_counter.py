@@ -0,0 +1,29 @@
+"""Global revision counter for master-data changes
+
+Revision ID: e1a7c3f05b92
+Revises: c47d1e9a2f60
+Create Date: 2026-10-19 17:02:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a7c3f05b92'
+down_revision = 'c47d1e9a2f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    counters = op.create_table('revision_counters',
+    sa.Column('name', sa.String(length=32), nullable=False),
+    sa.Column('value', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(counters, [{'name': 'global', 'value': 0}])
+
+
+def downgrade():
+    op.drop_table('revision_counters')
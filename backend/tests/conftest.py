@@ -1,6 +1,8 @@
 import pytest
+from contextlib import contextmanager
 from app import create_app
 from app.database import db
+from app.utils.query_stats import capture_queries
 from config import TestConfig  # <--- ADD THIS LINE
 
 
@@ -37,3 +39,23 @@ def session(app):
         yield db.session
         db.session.rollback()
         db.session.remove()
+
+
+@pytest.fixture
+def query_budget(app):
+    """
+    Usage: with query_budget(3): client.get(...)
+    Fails the test (listing the statements) if the block runs more queries.
+    """
+
+    @contextmanager
+    def budget(max_queries):
+        with capture_queries() as stats:
+            yield stats
+        if stats.count > max_queries:
+            pytest.fail(
+                f"Query budget exceeded: {stats.count} > {max_queries}\n"
+                + stats.report()
+            )
+
+    return budget
@@ -0,0 +1,211 @@
+import pytest
+from datetime import date
+from sqlalchemy import select
+from app.models import (
+    Assignment,
+    Schedule,
+    ScheduleDay,
+    ScheduleMembership,
+    ScheduleLeave,
+    ScheduleExclusion,
+    ScheduleStation,
+    Person,
+    Group,
+    MasterStation,
+    MembershipStationWeight,
+    Qualification,
+)
+from app.utils.availibility import build_availability, merge_intervals
+
+
+@pytest.fixture
+def availability_env(session):
+    grp = Group(name="Avail Group")
+    sdo = MasterStation(name="Staff Duty Officer", abbr="SDO")
+    edo = MasterStation(name="Engineering Duty Officer", abbr="EDO")
+    alice = Person(name="Alice")
+    bob = Person(name="Bob")
+    session.add_all([grp, sdo, edo, alice, bob])
+    session.flush()
+
+    sch = Schedule(
+        name="Avail Test", start_date=date(2026, 3, 1), end_date=date(2026, 3, 7)
+    )
+    session.add(sch)
+    session.flush()
+
+    days = []
+    for i in range(1, 8):
+        d = ScheduleDay(schedule_id=sch.id, date=date(2026, 3, i), weight=float(i))
+        days.append(d)
+    session.add_all(days)
+    session.add(ScheduleStation(schedule_id=sch.id, station_id=sdo.id))
+    session.add(ScheduleStation(schedule_id=sch.id, station_id=edo.id))
+
+    session.add(Qualification(person_id=alice.id, station_id=sdo.id))
+    session.add(Qualification(person_id=bob.id, station_id=sdo.id))
+    session.add(Qualification(person_id=bob.id, station_id=edo.id))
+
+    m_alice = ScheduleMembership(
+        schedule_id=sch.id, person_id=alice.id, group_id=grp.id
+    )
+    m_bob = ScheduleMembership(schedule_id=sch.id, person_id=bob.id, group_id=grp.id)
+    session.add_all([m_alice, m_bob])
+    session.flush()
+
+    # Overlapping leaves for Alice: 2nd-3rd and 3rd-4th -> merged 2nd-4th
+    session.add(
+        ScheduleLeave(
+            membership_id=m_alice.id,
+            start_date=date(2026, 3, 2),
+            end_date=date(2026, 3, 3),
+        )
+    )
+    session.add(
+        ScheduleLeave(
+            membership_id=m_alice.id,
+            start_date=date(2026, 3, 3),
+            end_date=date(2026, 3, 4),
+        )
+    )
+    # Bob is excluded on the 7th
+    session.add(ScheduleExclusion(membership_id=m_bob.id, day_id=days[6].id))
+    session.commit()
+
+    return {
+        "schedule": sch,
+        "days": days,
+        "alice": m_alice,
+        "bob": m_bob,
+        "sdo": sdo,
+        "edo": edo,
+    }
+
+
+def test_merge_intervals_coalesces_overlapping_and_adjacent():
+    merged = merge_intervals(
+        [
+            (date(2026, 1, 10), date(2026, 1, 12)),
+            (date(2026, 1, 1), date(2026, 1, 3)),
+            (date(2026, 1, 2), date(2026, 1, 5)),
+            (date(2026, 1, 6), date(2026, 1, 6)),
+        ]
+    )
+    assert merged == [
+        (date(2026, 1, 1), date(2026, 1, 6)),
+        (date(2026, 1, 10), date(2026, 1, 12)),
+    ]
+
+
+def test_matrix_marks_leave_ranges(availability_env):
+    env = availability_env
+    matrix = build_availability(env["schedule"].id)
+
+    leave_days = [
+        d.date.day
+        for d in env["days"]
+        if matrix.is_on_leave(env["alice"].id, d.id)
+    ]
+    assert leave_days == [2, 3, 4]
+    assert not any(matrix.is_on_leave(env["bob"].id, d.id) for d in env["days"])
+
+
+def test_matrix_marks_exclusions_and_qualifications(availability_env):
+    env = availability_env
+    matrix = build_availability(env["schedule"].id)
+
+    assert matrix.is_excluded(env["bob"].id, env["days"][6].id)
+    assert not matrix.is_excluded(env["alice"].id, env["days"][6].id)
+
+    assert matrix.is_qualified(env["alice"].id, env["sdo"].id)
+    assert not matrix.is_qualified(env["alice"].id, env["edo"].id)
+    assert matrix.is_qualified(env["bob"].id, env["edo"].id)
+
+
+def test_inactive_qualification_does_not_qualify(session, availability_env):
+    env = availability_env
+    qual = session.scalars(
+        select(Qualification).filter_by(
+            person_id=env["bob"].person_id, station_id=env["edo"].id
+        )
+    ).one()
+    qual.is_active = False
+    session.commit()
+
+    matrix = build_availability(env["schedule"].id)
+    assert not matrix.is_qualified(env["bob"].id, env["edo"].id)
+    assert matrix.is_qualified(env["bob"].id, env["sdo"].id)
+
+
+def test_unknown_ids_are_not_blocked(availability_env):
+    matrix = build_availability(availability_env["schedule"].id)
+    assert matrix.is_on_leave(99999, 99999) is False
+    assert matrix.is_excluded(99999, 99999) is False
+    assert matrix.is_qualified(99999, 99999) is False
+
+
+def test_slot_grid_endpoint(client, session, availability_env):
+    env = availability_env
+    sch_id = env["schedule"].id
+
+    res = client.get(f"/api/schedules/{sch_id}/availability-grid")
+    assert res.status_code == 200
+    grid = res.get_json()
+
+    assert grid["day_ids"] == [d.id for d in env["days"]]
+    assert grid["station_ids"] == [env["sdo"].id, env["edo"].id]
+
+    sdo_col = grid["station_ids"].index(env["sdo"].id)
+    edo_col = grid["station_ids"].index(env["edo"].id)
+
+    # Day 1: Alice + Bob available for SDO, only Bob for EDO
+    assert grid["supply"][0][sdo_col] == 2
+    assert grid["supply"][0][edo_col] == 1
+    # Day 3: Alice on leave
+    assert grid["supply"][2][sdo_col] == 1
+    # Day 7: Bob excluded
+    assert grid["supply"][6][edo_col] == 0
+
+    # Day 1 has only a next-day neighbor: 2 supply - 1 load -> 1
+    assert grid["availability"][0][sdo_col] == 1.0
+    # Interior days carry two neighbor loads
+    assert grid["availability"][2][sdo_col] == 0.0
+
+
+def test_slot_grid_supply_is_a_count_and_demand_one_per_type(
+    client, session, availability_env
+):
+    env = availability_env
+    sch_id = env["schedule"].id
+    days = env["days"]
+    # Bob fills the SDO slot on day 2; station weights do not change supply
+    session.add(
+        Assignment(
+            schedule_id=sch_id,
+            day_id=days[1].id,
+            station_id=env["sdo"].id,
+            membership_id=env["bob"].id,
+        )
+    )
+    session.add(
+        MembershipStationWeight(
+            membership_id=env["bob"].id, station_id=env["sdo"].id, weight=3.0
+        )
+    )
+    session.commit()
+
+    grid = client.get(f"/api/schedules/{sch_id}/availability-grid").get_json()
+    sdo_col = grid["station_ids"].index(env["sdo"].id)
+    edo_col = grid["station_ids"].index(env["edo"].id)
+
+    assert grid["supply"][0][sdo_col] == 2
+    assert grid["assigned"][1] == [1, 0]  # the SDO slot loads only SDO
+    assert grid["demand"] == [[1, 1]] * 7
+    # Day 2: 1 supply (Alice on leave) - 1 - 1 neighbor load - 1 assigned
+    assert grid["availability"][1][sdo_col] == 0.0
+    assert grid["availability"][0][edo_col] == 0.0
+
+
+def test_slot_grid_missing_schedule(client):
+    res = client.get("/api/schedules/9999/availability-grid")
+    assert res.status_code == 404
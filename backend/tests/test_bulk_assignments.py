@@ -0,0 +1,202 @@
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from app.routes import assignment_routes
+from app.models import (
+    Assignment,
+    Schedule,
+    MasterStation,
+    ScheduleDay,
+    Person,
+    Group,
+    ScheduleMembership,
+)
+
+START = date(2026, 10, 5)
+
+
+@pytest.fixture
+def week(session):
+    """Two members, seven days x two stations of empty slots."""
+    g = Group(name="Bulk Group")
+    stations = [MasterStation(name=f"Bulk {k}", abbr=f"BK{k}") for k in range(2)]
+    people = [Person(name=f"Bulk Person {i}") for i in range(2)]
+    sch = Schedule(name="Bulk", start_date=START, end_date=START + timedelta(6))
+    other = Schedule(name="Other", start_date=START, end_date=START + timedelta(6))
+    session.add_all([g, *stations, *people, sch, other])
+    session.flush()
+
+    days = [
+        ScheduleDay(schedule_id=sch.id, date=START + timedelta(days=i))
+        for i in range(7)
+    ]
+    members = [
+        ScheduleMembership(schedule_id=sch.id, person_id=p.id, group_id=g.id)
+        for p in people
+    ]
+    stranger = ScheduleMembership(
+        schedule_id=other.id, person_id=people[0].id, group_id=g.id
+    )
+    session.add_all([*days, *members, stranger])
+    session.flush()
+    slots = [
+        Assignment(schedule_id=sch.id, day_id=d.id, station_id=s.id)
+        for d in days
+        for s in stations
+    ]
+    session.add_all(slots)
+    session.commit()
+    return {
+        "schedule_id": sch.id,
+        "slots": [a.id for a in slots],  # day-major: (day 0, st 0), (day 0, st 1)...
+        "members": [m.id for m in members],
+        "stranger": stranger.id,
+    }
+
+
+def _slot_state(session, ids):
+    session.expire_all()
+    rows = session.execute(
+        select(Assignment.id, Assignment.membership_id, Assignment.is_locked).where(
+            Assignment.id.in_(ids)
+        )
+    )
+    return {a_id: (m_id, locked) for a_id, m_id, locked in rows}
+
+
+def test_drag_member_across_week(client, session, week):
+    column = week["slots"][::2]  # station 0, every day
+    member = week["members"][0]
+    # Warm the alert set; the ETag carries the client's base revision
+    alerts = client.get(f"/api/schedules/{week['schedule_id']}/alerts")
+    assert alerts.json == []
+    base = alerts.headers["ETag"].rsplit("-", 1)[1].rstrip('"')
+    res = client.patch(
+        f"/api/schedules/{week['schedule_id']}/assignments?alerts_base={base}",
+        json=[{"id": a_id, "membership_id": member} for a_id in column],
+    )
+
+    assert res.status_code == 200
+    assert [a["id"] for a in res.json["assignments"]] == column
+    names = {a["assigned_person_name"] for a in res.json["assignments"]}
+    assert names == {"Bulk Person 0"}
+    # Picking a member locks the slot, as the single-slot PATCH does
+    assert set(_slot_state(session, column).values()) == {(member, True)}
+    # Same person on consecutive days: the delta carries the new alerts
+    delta = res.json["alerts_delta"]
+    assert {a["type"] for a in delta["added"]} == {"BACK_TO_BACK"}
+    assert delta["removed"] == []
+
+
+def test_mixed_edits_follow_single_patch_rules(client, session, week):
+    a, b, c = week["slots"][:3]
+    member = week["members"][1]
+    client.patch(
+        f"/api/schedules/{week['schedule_id']}/assignments",
+        json=[{"id": a, "membership_id": member}],
+    )
+    res = client.patch(
+        f"/api/schedules/{week['schedule_id']}/assignments",
+        json=[
+            {"id": a, "membership_id": None},  # clearing unlocks
+            {"id": b, "membership_id": member, "is_locked": False},  # explicit wins
+            {"id": c, "availability_estimate": 3.5},
+        ],
+    )
+
+    assert res.status_code == 200
+    assert _slot_state(session, [a, b, c]) == {
+        a: (None, False),
+        b: (member, False),
+        c: (None, False),
+    }
+    estimates = {r["id"]: r["availability_estimate"] for r in res.json["assignments"]}
+    assert estimates[c] == 3.5
+
+
+def test_unknown_slot_or_member_rejects_whole_batch(client, session, week):
+    url = f"/api/schedules/{week['schedule_id']}/assignments"
+    first = week["slots"][0]
+
+    res = client.patch(
+        url,
+        json=[
+            {"id": first, "membership_id": week["members"][0]},
+            {"id": 999999, "membership_id": week["members"][0]},
+        ],
+    )
+    assert res.status_code == 404
+    assert "999999" in res.json["error"]
+
+    # A member of another schedule is not a valid pick
+    res = client.patch(url, json=[{"id": first, "membership_id": week["stranger"]}])
+    assert res.status_code == 404
+    assert _slot_state(session, [first]) == {first: (None, False)}
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"id": 1},
+        [{"membership_id": 1}],
+        [{"id": 1}],
+        [{"id": 1, "membership_id": "abc"}],
+        [{"id": 1, "availability_estimate": "lots"}],
+        [{"id": 1, "is_locked": True}, {"id": 1, "is_locked": False}],
+        [{"id": True, "membership_id": None}],
+        [{"id": 1, "membership_id": False}],
+        [{"id": 1, "is_locked": "false"}],
+        [{"id": 1, "is_locked": 0}],
+        [{"id": 1, "availability_estimate": True}],
+        [{"id": 1, "availability_estimate": "0.5"}],
+    ],
+)
+def test_invalid_payloads(client, week, payload):
+    url = f"/api/schedules/{week['schedule_id']}/assignments"
+    assert client.patch(url, json=payload).status_code == 400
+
+
+def test_mixed_columns_are_one_update(client, week, query_budget):
+    a, b, c = week["slots"][:3]
+    with query_budget(12) as stats:
+        res = client.patch(
+            f"/api/schedules/{week['schedule_id']}/assignments",
+            json=[
+                {"id": a, "membership_id": week["members"][0]},
+                {"id": b, "is_locked": True},
+                {"id": c, "availability_estimate": 2.0},
+            ],
+        )
+    assert res.status_code == 200
+    statements = [sql.lstrip() for sql, _ in stats.statements]
+    assert sum(sql.startswith("UPDATE assignments") for sql in statements) == 1
+
+
+def test_database_error_is_a_500(client, week, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OperationalError("UPDATE assignments", {}, Exception("disk I/O error"))
+
+    monkeypatch.setattr(assignment_routes, "update_rows_by_key", fail)
+    res = client.patch(
+        f"/api/schedules/{week['schedule_id']}/assignments",
+        json=[{"id": week["slots"][0], "is_locked": True}],
+    )
+    assert res.status_code == 500
+    assert res.json == {"error": "Batch update failed"}
+
+
+def test_batch_size_does_not_change_query_count(client, session, week, query_budget):
+    url = f"/api/schedules/{week['schedule_id']}/assignments"
+    member = week["members"][0]
+
+    counts = []
+    for slots in (week["slots"][:2], week["slots"]):
+        session.expunge_all()
+        with query_budget(12) as stats:
+            res = client.patch(
+                url, json=[{"id": a_id, "membership_id": member} for a_id in slots]
+            )
+        assert res.status_code == 200
+        counts.append(stats.count)
+    assert counts[0] == counts[1]
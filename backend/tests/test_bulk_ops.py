@@ -0,0 +1,104 @@
+from datetime import date
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from app.database import db
+from app.models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleStation,
+    Assignment,
+    MasterStation,
+)
+from app.utils import change_tracking
+from app.utils.bulk_ops import (
+    insert_rows,
+    update_rows_by_key,
+    values_update_statement,
+)
+from app.utils.schedule_utils import generate_assignments_for_station
+
+
+def _schedule(session, n_days=5):
+    stn = MasterStation(name="Bulk Station", abbr="BLK")
+    sch = Schedule(
+        name="Bulk", start_date=date(2026, 2, 1), end_date=date(2026, 2, n_days)
+    )
+    session.add_all([stn, sch])
+    session.flush()
+    insert_rows(
+        ScheduleDay,
+        [
+            {"schedule_id": sch.id, "date": date(2026, 2, i), "weight": 1.0}
+            for i in range(1, n_days + 1)
+        ],
+        schedule_id=sch.id,
+    )
+    session.add(ScheduleStation(schedule_id=sch.id, station_id=stn.id))
+    generate_assignments_for_station(session, sch, stn.id)
+    session.commit()
+    return sch.id, stn.id
+
+
+def test_slot_generation_inserts_one_row_per_day(session):
+    s_id, stn_id = _schedule(session)
+    slots = session.scalars(select(Assignment).filter_by(schedule_id=s_id)).all()
+    assert len(slots) == 5
+    assert {a.station_id for a in slots} == {stn_id}
+    assert all(a.membership_id is None and not a.is_locked for a in slots)
+
+
+def test_keyed_update_skips_locked_and_reports_changes(session):
+    s_id, stn_id = _schedule(session)
+    days = session.scalars(
+        select(ScheduleDay.id).filter_by(schedule_id=s_id).order_by(ScheduleDay.date)
+    ).all()
+    locked = session.scalars(select(Assignment).filter_by(day_id=days[0])).one()
+    locked.is_locked = True
+    session.commit()
+
+    seen = []
+    change_tracking._listeners.append(seen.append)
+    try:
+        updated = update_rows_by_key(
+            Assignment,
+            ("day_id", "station_id"),
+            ("availability_estimate",),
+            [
+                {"day_id": d, "station_id": stn_id, "availability_estimate": 0.25}
+                for d in days
+            ],
+            schedule_id=s_id,
+            where=(Assignment.is_locked.is_(False),),
+        )
+        session.commit()
+    finally:
+        change_tracking._listeners.remove(seen.append)
+
+    assert updated == 4
+    estimates = dict(
+        session.execute(
+            select(Assignment.day_id, Assignment.availability_estimate).filter_by(
+                schedule_id=s_id
+            )
+        ).all()
+    )
+    assert estimates[days[0]] == 1.0
+    assert {estimates[d] for d in days[1:]} == {0.25}
+    assert any((s_id, "Assignment") in c.untracked for c in seen if c)
+
+
+def test_postgres_update_is_one_values_join():
+    stmt = values_update_statement(
+        Assignment,
+        ("day_id", "station_id"),
+        ("membership_id",),
+        [
+            {"day_id": 1, "station_id": 2, "membership_id": 3},
+            {"day_id": 4, "station_id": 2, "membership_id": None},
+        ],
+        where=(Assignment.is_locked.is_(False),),
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "UPDATE assignments SET membership_id=v.membership_id" in sql
+    assert "FROM (VALUES" in sql
+    assert "AS v (day_id, station_id, membership_id)" in sql
@@ -0,0 +1,190 @@
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import select, update
+from app.models import (
+    Assignment,
+    Schedule,
+    MasterStation,
+    ScheduleCandidate,
+    ScheduleDay,
+    Person,
+    Group,
+    ScheduleMembership,
+)
+from app.utils import candidate_apply
+from app.utils.candidate_apply import apply_candidate_slots, candidate_slots
+
+START = date(2026, 11, 2)
+
+
+def _build(session, n_days, n_stations, name="Apply"):
+    g = Group(name=f"{name} Group")
+    stations = [
+        MasterStation(name=f"{name} {k}", abbr=f"{name[:2]}{k}")
+        for k in range(n_stations)
+    ]
+    people = [Person(name=f"{name} Person {i}") for i in range(3)]
+    sch = Schedule(
+        name=name, start_date=START, end_date=START + timedelta(n_days - 1)
+    )
+    session.add_all([g, *stations, *people, sch])
+    session.flush()
+    days = [
+        ScheduleDay(schedule_id=sch.id, date=START + timedelta(days=i))
+        for i in range(n_days)
+    ]
+    members = [
+        ScheduleMembership(schedule_id=sch.id, person_id=p.id, group_id=g.id)
+        for p in people
+    ]
+    session.add_all(days + members)
+    session.flush()
+    slots = [
+        Assignment(schedule_id=sch.id, day_id=d.id, station_id=s.id)
+        for d in days
+        for s in stations
+    ]
+    session.add_all(slots)
+    session.flush()
+    return sch.id, slots, [m.id for m in members]
+
+
+@pytest.fixture
+def small(session):
+    """Four slots: one already right, one locked, one to change, one left out."""
+    s_id, slots, members = _build(session, 2, 2)
+    same, locked, change, left_out = slots
+    same.membership_id = members[0]
+    locked.membership_id = members[1]
+    locked.is_locked = True
+    left_out.membership_id = members[2]
+    data = {
+        f"{same.day_id}_{same.station_id}": members[0],
+        f"{locked.day_id}_{locked.station_id}": members[2],
+        f"{change.day_id}_{change.station_id}": members[1],
+        "999_999": members[0],
+    }
+    cand = ScheduleCandidate(
+        schedule_id=s_id, run_id="run-1", score=1.0, assignments_data=data
+    )
+    session.add(cand)
+    session.commit()
+    return {
+        "schedule_id": s_id,
+        "candidate_id": cand.id,
+        "slots": [a.id for a in slots],
+        "members": members,
+    }
+
+
+def _members(session, ids):
+    session.expire_all()
+    rows = session.execute(
+        select(Assignment.id, Assignment.membership_id).where(Assignment.id.in_(ids))
+    )
+    return dict(rows.all())
+
+
+def test_candidate_slots_parses_keys():
+    assert candidate_slots({"12_3": 7, "4_15": None}) == {(12, 3): 7, (4, 15): None}
+    assert candidate_slots(None) == {}
+
+
+def test_apply_reports_diff(client, session, small):
+    same, locked, change, left_out = small["slots"]
+    m0, m1, m2 = small["members"]
+    res = client.post(
+        f"/api/schedules/{small['schedule_id']}/apply",
+        json={"candidate_id": small["candidate_id"]},
+    )
+
+    assert res.status_code == 200
+    body = res.json
+    assert body["updated"] == 1
+    assert [(c["id"], c["from"], c["to"]) for c in body["changed"]] == [
+        (change, None, m1)
+    ]
+    assert body["unchanged"] == [same]
+    skipped = [
+        (s["id"], s["membership_id"], s["wanted"]) for s in body["skipped_locked"]
+    ]
+    assert skipped == [(locked, m1, m2)]
+    assert body["cleared"] == []
+    assert body["unknown"] == ["999_999"]
+    # Slots the candidate leaves out are untouched by default
+    assert _members(session, small["slots"]) == {
+        same: m0,
+        locked: m1,
+        change: m1,
+        left_out: m2,
+    }
+
+
+def test_apply_can_clear_missing_slots(client, session, small):
+    left_out = small["slots"][3]
+    res = client.post(
+        f"/api/schedules/{small['schedule_id']}/apply",
+        json={"candidate_id": small["candidate_id"], "clear_missing": True},
+    )
+
+    assert res.status_code == 200
+    assert res.json["cleared"] == [left_out]
+    assert res.json["updated"] == 2
+    assert _members(session, [left_out]) == {left_out: None}
+
+
+def test_slot_locked_after_the_read_is_reported_skipped(
+    session, small, monkeypatch
+):
+    same, locked, change, left_out = small["slots"]
+    m0, m1, m2 = small["members"]
+    real_update = candidate_apply.update_rows_by_key
+
+    def lock_first(*args, **kwargs):
+        # A concurrent edit locks the slot between the SELECT and the UPDATE
+        session.execute(
+            update(Assignment)
+            .where(Assignment.id == change)
+            .values(membership_id=m0, is_locked=True)
+            .execution_options(synchronize_session=False)
+        )
+        return real_update(*args, **kwargs)
+
+    monkeypatch.setattr(candidate_apply, "update_rows_by_key", lock_first)
+    cand = session.get(ScheduleCandidate, small["candidate_id"])
+    diff = apply_candidate_slots(small["schedule_id"], cand.assignments_data)
+
+    assert diff["updated"] == 0
+    assert diff["changed"] == []
+    skipped = [
+        (s["id"], s["membership_id"], s["wanted"]) for s in diff["skipped_locked"]
+    ]
+    assert skipped == [(locked, m1, m2), (change, m0, m1)]
+    assert _members(session, [change]) == {change: m0}
+    session.rollback()
+
+
+def test_apply_rejects_foreign_candidate(client, session, small):
+    other, _, _ = _build(session, 1, 1, name="Foreign")
+    session.commit()
+    res = client.post(
+        f"/api/schedules/{other}/apply", json={"candidate_id": small["candidate_id"]}
+    )
+    assert res.status_code == 404
+    res = client.post(f"/api/schedules/{other}/apply", json={})
+    assert res.status_code == 404
+
+
+def test_quarterly_apply_is_one_read_and_one_write(session, query_budget):
+    s_id, slots, members = _build(session, 91, 6, name="Quarter")
+    session.commit()
+    data = {
+        f"{a.day_id}_{a.station_id}": members[i % 3] for i, a in enumerate(slots)
+    }
+
+    with query_budget(4) as stats:
+        diff = apply_candidate_slots(s_id, data)
+    assert diff["updated"] == len(slots) == 91 * 6
+    statements = [sql for sql, _ in stats.statements]
+    assert sum(sql.lstrip().startswith("UPDATE assignments") for sql in statements) == 1
+    session.rollback()
@@ -0,0 +1,60 @@
+import gzip
+import json
+import pytest
+from flask import Response, jsonify
+from app.utils import compression
+
+BIG = {"rows": [{"date": "2026-07-01", "name": f"Person {i}"} for i in range(200)]}
+
+
+@pytest.fixture
+def routes(app):
+    app.add_url_rule("/t/big", "big", lambda: jsonify(BIG))
+    app.add_url_rule("/t/small", "small", lambda: jsonify({"ok": True}))
+    app.add_url_rule(
+        "/t/stream",
+        "stream",
+        lambda: Response(
+            (json.dumps(r) + "\n" for r in BIG["rows"]),
+            mimetype="application/x-ndjson",
+        ),
+    )
+    app.add_url_rule(
+        "/t/text",
+        "text",
+        lambda: Response("x" * 5000, mimetype="application/octet-stream"),
+    )
+    return app.test_client()
+
+
+def test_large_json_is_gzipped(routes, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    res = routes.get("/t/big", headers={"Accept-Encoding": "gzip, deflate"})
+    assert res.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in res.headers["Vary"]
+    assert json.loads(gzip.decompress(res.data)) == BIG
+    assert int(res.headers["Content-Length"]) == len(res.data)
+
+
+@pytest.mark.parametrize(
+    "url, accept",
+    [
+        ("/t/big", None),  # client did not ask
+        ("/t/big", "gzip;q=0, identity"),
+        ("/t/small", "gzip"),  # below COMPRESS_MIN_SIZE
+        ("/t/stream", "gzip"),  # streamed NDJSON
+        ("/t/text", "gzip"),  # not in the mimetype allowlist
+    ],
+)
+def test_left_uncompressed(routes, url, accept):
+    headers = {"Accept-Encoding": accept} if accept else {}
+    res = routes.get(url, headers=headers)
+    assert res.status_code == 200
+    assert "Content-Encoding" not in res.headers
+
+
+@pytest.mark.skipif(compression.brotli is None, reason="brotli not installed")
+def test_brotli_preferred_when_available(routes):
+    res = routes.get("/t/big", headers={"Accept-Encoding": "gzip, br"})
+    assert res.headers["Content-Encoding"] == "br"
+    assert json.loads(compression.brotli.decompress(res.data)) == BIG
@@ -0,0 +1,134 @@
+import pytest
+from datetime import date, timedelta
+from app.models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleMembership,
+    ScheduleLeave,
+    ScheduleExclusion,
+    Assignment,
+    Person,
+    Group,
+    MasterStation,
+)
+from app.utils.load_plans import load_schedule
+from app.utils.row_serializers import serialize_assignments, serialize_days
+
+START = date(2026, 6, 1)
+
+
+@pytest.fixture
+def month(session):
+    grp = Group(name="Window Group")
+    stations = [MasterStation(name=f"Window {k}", abbr=f"W{k}") for k in range(2)]
+    people = [Person(name=f"Window Person {i}") for i in range(3)]
+    sch = Schedule(name="Window", start_date=START, end_date=START + timedelta(29))
+    session.add_all([grp, *stations, *people, sch])
+    session.flush()
+    days = [
+        ScheduleDay(schedule_id=sch.id, date=START + timedelta(days=i))
+        for i in range(30)
+    ]
+    members = [
+        ScheduleMembership(schedule_id=sch.id, person_id=p.id, group_id=grp.id)
+        for p in people
+    ]
+    session.add_all(days + members)
+    session.flush()
+    session.add_all(
+        Assignment(
+            schedule_id=sch.id,
+            day_id=d.id,
+            station_id=st.id,
+            membership_id=members[i % 3].id,
+        )
+        for i, d in enumerate(days)
+        for st in stations
+    )
+    session.add_all(
+        [
+            # Straddles the start of the window (Jun 8-14)
+            ScheduleLeave(
+                membership_id=members[0].id,
+                start_date=date(2026, 6, 5),
+                end_date=date(2026, 6, 9),
+            ),
+            # Inside
+            ScheduleLeave(
+                membership_id=members[1].id,
+                start_date=date(2026, 6, 10),
+                end_date=date(2026, 6, 10),
+            ),
+            # Outside
+            ScheduleLeave(
+                membership_id=members[2].id,
+                start_date=date(2026, 6, 20),
+                end_date=date(2026, 6, 25),
+            ),
+            ScheduleExclusion(membership_id=members[2].id, day_id=days[9].id),
+            ScheduleExclusion(membership_id=members[2].id, day_id=days[20].id),
+        ]
+    )
+    session.commit()
+    return sch.id
+
+
+WEEK = "from=2026-06-08&to=2026-06-14"
+
+
+def test_full_days_match_grid_plan(session, month):
+    schedule = load_schedule(month, "grid")
+    leaves = schedule._get_leaves_by_date()
+    expected = [
+        d.to_dict(day_leaves=leaves.get(d.date.isoformat(), []))
+        for d in sorted(schedule.days, key=lambda d: d.id)
+    ]
+    assert serialize_days(month) == expected
+    assert serialize_days(99999) is None
+
+
+def test_days_window(client, month):
+    res = client.get(f"/api/schedules/{month}/days")
+    full = {d["date"]: d for d in res.get_json()}
+    week = client.get(f"/api/schedules/{month}/days?{WEEK}").get_json()
+
+    assert [d["date"] for d in week] == [f"2026-06-{n:02d}" for n in range(8, 15)]
+    # Clipped leaves and in-window exclusions are identical to the full view
+    assert week == [full[d["date"]] for d in week]
+    assert sum(len(d["leaves"]) for d in week) == 3  # Jun 8, 9 and 10
+    assert sum(len(d["exclusions"]) for d in week) == 1
+
+
+def test_assignments_and_exclusions_window(client, month):
+    rows = client.get(f"/api/schedules/{month}/assignments?{WEEK}").get_json()
+    assert len(rows) == 14
+    assert {r["date"] for r in rows} == {f"2026-06-{n:02d}" for n in range(8, 15)}
+    in_week = [
+        r
+        for r in serialize_assignments(month)
+        if "2026-06-08" <= r["date"] <= "2026-06-14"
+    ]
+    assert rows == in_week
+
+    col = client.get(
+        f"/api/schedules/{month}/assignments?format=columnar&{WEEK}"
+    ).get_json()
+    assert col["count"] == 14 and len(col["days"]) == 7
+
+    excl = client.get(f"/api/exclusions/schedule/{month}?{WEEK}").get_json()
+    assert [e["date"] for e in excl] == ["2026-06-10"]
+
+    leaves = client.get(f"/api/leaves?schedule_id={month}&{WEEK}").get_json()
+    assert len(leaves) == 2
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/schedules/{id}/assignments?from=06-01-2026",
+        "/api/schedules/{id}/days?from=2026-06-10&to=2026-06-01",
+        "/api/exclusions/schedule/{id}?to=tomorrow",
+    ],
+)
+def test_bad_window(client, month, url):
+    assert client.get(url.format(id=month)).status_code == 400
@@ -0,0 +1,117 @@
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import select, text
+from app.database import db
+from app.utils.row_serializers import day_window
+from app.models import (
+    Schedule,
+    Person,
+    Assignment,
+    ScheduleDay,
+    ScheduleLeave,
+    ScheduleExclusion,
+    ScheduleCandidate,
+    MembershipStationWeight,
+)
+
+D = date(2026, 5, 1)
+
+# (hot query, index it must use)
+HOT_QUERIES = [
+    (
+        select(Assignment).where(Assignment.schedule_id == 1),
+        "ix_assignments_schedule_locked",
+    ),
+    (
+        select(Assignment).where(
+            Assignment.schedule_id == 1, Assignment.is_locked.is_(True)
+        ),
+        "ix_assignments_schedule_locked",
+    ),
+    (
+        select(Assignment).where(Assignment.day_id == 1, Assignment.station_id == 2),
+        "ux_assignments_day_station",
+    ),
+    (
+        select(ScheduleDay.id, ScheduleDay.date)
+        .where(ScheduleDay.schedule_id == 1, ScheduleDay.is_lookback.is_(False))
+        .order_by(ScheduleDay.date),
+        "ix_schedule_days_schedule_date_lookback",
+    ),
+    (
+        select(ScheduleLeave).where(
+            ScheduleLeave.membership_id == 1,
+            ScheduleLeave.start_date <= D,
+            ScheduleLeave.end_date >= D,
+        ),
+        "ix_schedule_leaves_member_range",
+    ),
+    (
+        select(ScheduleExclusion).where(
+            ScheduleExclusion.day_id == 1, ScheduleExclusion.membership_id == 2
+        ),
+        "ux_schedule_exclusions_day_member",
+    ),
+    (
+        select(ScheduleCandidate)
+        .where(ScheduleCandidate.schedule_id == 1)
+        .order_by(ScheduleCandidate.score),
+        "ix_schedule_candidates_schedule_score",
+    ),
+    (
+        select(MembershipStationWeight).where(
+            MembershipStationWeight.membership_id == 1,
+            MembershipStationWeight.station_id == 2,
+        ),
+        "ux_membership_station_weights_member_station",
+    ),
+    # Date-windowed grid reads: day range scan, then slots by day
+    (
+        select(Assignment.id).where(
+            Assignment.day_id.in_(day_window(1, D, D + timedelta(days=6)))
+        ),
+        "ux_assignments_day_station",
+    ),
+    (
+        day_window(1, D, D + timedelta(days=6)),
+        "ix_schedule_days_schedule_date_lookback",
+    ),
+    # Keyset pages (utils/pagination.py): cursor predicate + ORDER BY + LIMIT
+    (
+        select(Schedule)
+        .where(
+            (Schedule.start_date < D)
+            | ((Schedule.start_date == D) & (Schedule.id < 10))
+        )
+        .order_by(Schedule.start_date.desc(), Schedule.id.desc())
+        .limit(51),
+        "ix_schedules_start_date_id",
+    ),
+    (
+        select(Person)
+        .where((Person.name > "M") | ((Person.name == "M") & (Person.id > 10)))
+        .order_by(Person.name, Person.id)
+        .limit(51),
+        "ix_personnel_name_id",
+    ),
+]
+
+
+@pytest.fixture(autouse=True)
+def _sqlite_only(app):
+    if db.engine.dialect.name != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN is SQLite syntax")
+
+
+def _plan(stmt):
+    sql = stmt.compile(db.engine, compile_kwargs={"literal_binds": True})
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return [row[-1] for row in rows]
+
+
+@pytest.mark.parametrize("stmt,index", HOT_QUERIES, ids=[i for _, i in HOT_QUERIES])
+def test_hot_query_uses_its_index(session, stmt, index):
+    plan = _plan(stmt)
+    assert any(index in step for step in plan), plan
+    # Ordered reads come straight off the index, without a sort step
+    assert not any("TEMP B-TREE" in step for step in plan), plan
@@ -0,0 +1,110 @@
+import pytest
+from datetime import date, timedelta
+from app.models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleMembership,
+    ScheduleLeave,
+    Person,
+    Group,
+)
+from app.utils.leave_intervals import leave_counts_by_date
+
+START = date(2026, 8, 1)
+
+
+def test_sweep_counts_overlaps_and_clips():
+    dates = [START + timedelta(days=i) for i in range(5)]
+    spans = [
+        (START - timedelta(days=3), START + timedelta(days=1)),  # starts before
+        (START + timedelta(days=1), START + timedelta(days=3)),
+        (START + timedelta(days=3), START + timedelta(days=9)),  # ends after
+        (START + timedelta(days=20), START + timedelta(days=21)),  # outside
+    ]
+    counts = leave_counts_by_date(spans, dates)
+    assert [counts[d] for d in dates] == [1, 2, 1, 2, 1]
+    assert leave_counts_by_date(spans, []) == {}
+
+
+def test_sweep_matches_exploded_count():
+    dates = [START + timedelta(days=i) for i in range(0, 30, 2)]  # gaps
+    spans = [
+        (START + timedelta(days=i), START + timedelta(days=i + i % 5))
+        for i in range(25)
+    ]
+    counts = leave_counts_by_date(spans, dates)
+    for d in dates:
+        assert counts[d] == sum(1 for s, e in spans if s <= d <= e)
+
+
+@pytest.fixture
+def on_leave(session):
+    grp = Group(name="Interval Group")
+    people = [Person(name=f"Interval {i}") for i in range(2)]
+    sch = Schedule(name="Intervals", start_date=START, end_date=START + timedelta(4))
+    session.add_all([grp, *people, sch])
+    session.flush()
+    # One lookback day before the schedule proper
+    session.add_all(
+        ScheduleDay(
+            schedule_id=sch.id,
+            date=START + timedelta(days=i),
+            is_lookback=i == -1,
+        )
+        for i in range(-1, 5)
+    )
+    members = [
+        ScheduleMembership(schedule_id=sch.id, person_id=p.id, group_id=grp.id)
+        for p in people
+    ]
+    session.add_all(members)
+    session.flush()
+    session.add_all(
+        [
+            ScheduleLeave(
+                membership_id=members[0].id,
+                start_date=START - timedelta(days=2),
+                end_date=START + timedelta(days=1),
+                reason="Travel",
+            ),
+            ScheduleLeave(
+                membership_id=members[1].id,
+                start_date=START + timedelta(days=1),
+                end_date=START + timedelta(days=9),
+                reason="Course",
+            ),
+        ]
+    )
+    session.commit()
+    return sch.id
+
+
+def test_schedule_sends_intervals_by_default(client, on_leave):
+    data = client.get(f"/api/schedules/{on_leave}").get_json()
+    assert "leaves_exploded" not in data
+    spans = [
+        (i["person_name"], i["start_date"], i["end_date"])
+        for i in data["leave_intervals"]
+    ]
+    assert spans == [
+        ("Interval 0", "2026-07-30", "2026-08-02"),
+        ("Interval 1", "2026-08-02", "2026-08-10"),
+    ]
+    assert [d["leave_count"] for d in data["days"]] == [1, 1, 2, 1, 1, 1]
+    assert all("leaves" not in d for d in data["days"])
+
+
+def test_exploded_flag_matches_intervals(client, on_leave):
+    compact = client.get(f"/api/schedules/{on_leave}").get_json()
+    legacy = client.get(f"/api/schedules/{on_leave}?leaves=exploded").get_json()
+    assert "leave_intervals" not in legacy
+    assert [len(d["leaves"]) for d in legacy["days"]] == [
+        d["leave_count"] for d in compact["days"]
+    ]
+    # Exploded entries cover every leave day, even outside the schedule's days
+    assert len(legacy["leaves_exploded"]) == 4 + 9
+
+
+def test_unknown_leaves_format(client, on_leave):
+    res = client.get(f"/api/schedules/{on_leave}?leaves=daily")
+    assert res.status_code == 400
@@ -0,0 +1,167 @@
+import pytest
+from datetime import date, timedelta
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from app.database import db
+from app.models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleMembership,
+    ScheduleStation,
+    ScheduleLeave,
+    ScheduleExclusion,
+    Assignment,
+    Person,
+    Group,
+    MasterStation,
+)
+from app.utils.load_plans import load_schedule
+
+
+def _build_schedule(session, n_days, n_members, n_stations=2):
+    grp = Group(name=f"Plan Group {n_days}")
+    stations = [
+        MasterStation(name=f"Plan Station {n_days}-{k}", abbr=f"P{n_days}{k}")
+        for k in range(n_stations)
+    ]
+    people = [Person(name=f"Plan Person {n_days}-{i}") for i in range(n_members)]
+    session.add_all([grp, *stations, *people])
+    session.flush()
+
+    start = date(2026, 3, 1)
+    sch = Schedule(
+        name=f"Plan {n_days}",
+        start_date=start,
+        end_date=start + timedelta(days=n_days - 1),
+    )
+    session.add(sch)
+    session.flush()
+
+    days = [
+        ScheduleDay(schedule_id=sch.id, date=start + timedelta(days=i))
+        for i in range(n_days)
+    ]
+    members = [
+        ScheduleMembership(schedule_id=sch.id, person_id=p.id, group_id=grp.id)
+        for p in people
+    ]
+    session.add_all(days + members)
+    session.add_all(
+        ScheduleStation(schedule_id=sch.id, station_id=st.id) for st in stations
+    )
+    session.flush()
+
+    session.add_all(
+        ScheduleLeave(
+            membership_id=m.id, start_date=start, end_date=start + timedelta(days=1)
+        )
+        for m in members
+    )
+    session.add_all(
+        ScheduleExclusion(membership_id=m.id, day_id=days[-1].id) for m in members
+    )
+    session.add_all(
+        Assignment(
+            schedule_id=sch.id,
+            day_id=d.id,
+            station_id=st.id,
+            membership_id=members[(i + k) % n_members].id,
+        )
+        for i, d in enumerate(days)
+        for k, st in enumerate(stations)
+    )
+    session.commit()
+    return sch.id
+
+
+class QueryLog:
+    """Records every SELECT, then replays them to count the rows returned."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(db.engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, "before_cursor_execute", self)
+
+    @property
+    def selects(self):
+        return [s for s, _ in self.statements if s.lstrip().upper().startswith("SELECT")]
+
+    def row_counts(self):
+        conn = db.session.connection()
+        return [
+            len(conn.exec_driver_sql(s, p).fetchall())
+            for s, p in self.statements
+            if s.lstrip().upper().startswith("SELECT")
+        ]
+
+
+def test_plain_get_is_one_unjoined_row(session):
+    s_id = _build_schedule(session, n_days=6, n_members=4)
+    session.expunge_all()
+
+    with QueryLog() as log:
+        schedule = db.session.get(Schedule, s_id)
+        assert schedule.name == "Plan 6"
+
+    assert len(log.selects) == 1
+    assert "JOIN" not in log.selects[0]
+    assert log.row_counts() == [1]
+
+
+def test_summary_plan_raises_on_collections(session):
+    s_id = _build_schedule(session, n_days=3, n_members=2)
+    schedule = load_schedule(s_id, "summary")
+
+    assert schedule.to_dict()["id"] == s_id
+    with pytest.raises(InvalidRequestError):
+        schedule.days
+    with pytest.raises(InvalidRequestError):
+        schedule.memberships
+
+
+def test_solver_plan_loads_only_stations(session):
+    s_id = _build_schedule(session, n_days=3, n_members=2)
+    schedule = load_schedule(s_id, "solver")
+
+    assert len(schedule.required_stations) == 2
+    with pytest.raises(InvalidRequestError):
+        schedule.assignments
+
+
+ENDPOINTS = [
+    ("get", "/api/schedules"),
+    ("get", "/api/schedules/{id}"),
+    ("get", "/api/schedules/{id}/days"),
+    ("get", "/api/exclusions/schedule/{id}"),
+    ("patch", "/api/schedules/{id}"),
+]
+
+
+@pytest.mark.parametrize("method,url", ENDPOINTS)
+def test_endpoint_queries_do_not_scale_or_multiply(client, session, method, url):
+    small = _build_schedule(session, n_days=3, n_members=2)
+    large = _build_schedule(session, n_days=20, n_members=8)
+
+    def run(s_id):
+        session.expunge_all()
+        kwargs = {"json": {"name": "Renamed"}} if method == "patch" else {}
+        with QueryLog() as log:
+            res = getattr(client, method)(url.format(id=s_id), **kwargs)
+        assert res.status_code == 200
+        return log
+
+    small_log = run(small)
+    large_log = run(large)
+    assert len(large_log.selects) == len(small_log.selects)
+
+    # No statement returns more rows than the largest child table
+    # (20 days x 2 stations of assignments), never days x members x stations.
+    assert max(large_log.row_counts()) <= 40
@@ -0,0 +1,185 @@
+import pytest
+from datetime import date, timedelta
+from app.models import (
+    Schedule,
+    ScheduleMembership,
+    ScheduleLeave,
+    Person,
+    Group,
+    Holiday,
+)
+from app.utils.pagination import DEFAULT_LIMIT, decode_cursor, encode_cursor
+
+
+def _walk(client, url, limit):
+    """Follows next_cursor to the end; returns all items and the page count."""
+    sep = "&" if "?" in url else "?"
+    items, pages, cursor = [], 0, None
+    while True:
+        page_url = f"{url}{sep}limit={limit}"
+        if cursor:
+            page_url += f"&cursor={cursor}"
+        res = client.get(page_url)
+        assert res.status_code == 200, res.get_json()
+        body = res.get_json()
+        assert len(body["items"]) <= limit
+        items += body["items"]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+def _items(res):
+    """Bare list (schedule-scoped endpoints) or the items of a page."""
+    body = res.get_json()
+    return body if isinstance(body, list) else body["items"]
+
+
+@pytest.fixture
+def listing(session):
+    groups = [Group(name="Page A"), Group(name="Page B")]
+    session.add_all(groups)
+    session.flush()
+    # Duplicate names / start dates exercise the id tiebreak
+    people = [
+        Person(
+            name=f"Sailor {i % 4}",
+            group_id=groups[i % 2].id,
+            is_active=i % 3 != 0,
+        )
+        for i in range(11)
+    ]
+    start = date(2026, 1, 1)
+    schedules = [
+        Schedule(
+            name=f"Page {i}",
+            start_date=start + timedelta(days=30 * (i // 2)),
+            end_date=start + timedelta(days=30 * (i // 2) + 27),
+            status="published" if i % 2 else "draft",
+        )
+        for i in range(7)
+    ]
+    session.add_all(people + schedules)
+    session.add_all(
+        Holiday(date=start + timedelta(days=7 * i), name=f"H{i}") for i in range(9)
+    )
+    session.flush()
+    members = [
+        ScheduleMembership(
+            schedule_id=schedules[0].id, person_id=p.id, group_id=p.group_id
+        )
+        for p in people
+    ]
+    session.add_all(members)
+    session.flush()
+    session.add_all(
+        ScheduleLeave(
+            membership_id=m.id,
+            start_date=start + timedelta(days=i),
+            end_date=start + timedelta(days=i + 2),
+        )
+        for i, m in enumerate(members)
+    )
+    session.commit()
+    return {"schedule": schedules[0].id, "group": groups[0].id}
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/api/schedules",
+        "/api/personnel",
+        "/api/holidays",
+        "/api/schedule-memberships",
+        "/api/leaves?schedule_id={schedule}",
+    ],
+)
+def test_pages_cover_the_full_list_in_order(client, listing, url):
+    url = url.format(**listing)
+    full = _items(client.get(url))
+    assert len(full) >= 7
+
+    items, pages = _walk(client, url, limit=3)
+    assert items == full
+    assert pages == -(-len(full) // 3)
+
+
+def test_filters_and_total(client, listing):
+    res = client.get("/api/schedules?status=draft&limit=2&total=1").get_json()
+    assert res["total"] == 4
+    assert all(s["status"] == "draft" for s in res["items"])
+
+    # Overlapping the range, not contained in it
+    res = _items(client.get("/api/schedules?from=2026-01-20&to=2026-02-05"))
+    assert {s["name"] for s in res} == {"Page 0", "Page 1", "Page 2", "Page 3"}
+
+    people = client.get(f"/api/personnel?group_id={listing['group']}&active=true")
+    assert len(_items(people)) == 4
+
+    holidays = _items(client.get("/api/holidays?from=2026-01-08&to=2026-01-22"))
+    assert [h["name"] for h in holidays] == ["H1", "H2", "H3"]
+
+    leaves = client.get(
+        f"/api/leaves?schedule_id={listing['schedule']}&from=2026-01-10&total=1"
+        "&limit=1"
+    ).get_json()
+    assert leaves["total"] == 4  # leaves starting Jan 8..11 overlap Jan 10+
+
+    members = client.get(f"/api/schedule-memberships?group_id={listing['group']}")
+    assert len(_items(members)) == 6
+
+
+def test_unscoped_lists_are_always_paged(client, session, listing):
+    start = date(2027, 1, 1)
+    session.add_all(
+        Holiday(date=start + timedelta(days=i), name=f"Bulk {i}")
+        for i in range(DEFAULT_LIMIT + 1)
+    )
+    session.commit()
+
+    page = client.get("/api/holidays").get_json()
+    assert len(page["items"]) == DEFAULT_LIMIT
+    assert page["next_cursor"] is not None
+
+    # Scoped to one schedule: still the plain list
+    scoped = client.get(f"/api/schedule-memberships?schedule_id={listing['schedule']}")
+    assert isinstance(scoped.get_json(), list)
+    assert "items" in client.get("/api/schedule-memberships").get_json()
+
+
+def test_page_cost_is_flat(client, listing, query_budget):
+    first = client.get("/api/personnel?limit=2").get_json()
+    # Page (group joined) + qualifications selectin, whatever the cursor
+    with query_budget(2):
+        res = client.get(f"/api/personnel?limit=2&cursor={first['next_cursor']}")
+    assert len(res.get_json()["items"]) == 2
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "limit=0",
+        "limit=abc",
+        "limit=5000",
+        "cursor=%%%",
+        "from=2026-13-01",
+        "from=2026-02-01&to=2026-01-01",
+    ],
+)
+def test_bad_paging_args(client, query):
+    assert client.get(f"/api/schedules?{query}").status_code == 400
+
+
+@pytest.mark.parametrize("values", [[1], ["a", 1, 2], ["a", [1]], [{"id": 1}, 2]])
+def test_malformed_cursor_is_rejected(client, listing, values):
+    res = client.get(f"/api/personnel?cursor={encode_cursor(values)}")
+    assert res.status_code == 400
+    assert res.get_json() == {"error": "Invalid cursor"}
+
+
+def test_cursor_round_trip():
+    token = encode_cursor([date(2026, 1, 2), 7])
+    assert decode_cursor(token) == ["2026-01-02", 7]
+    with pytest.raises(ValueError):
+        decode_cursor("bm90LWEtbGlzdA")  # "not-a-list"
@@ -21,7 +21,7 @@ def test_personnel_crud_lifecycle(client):
 
     response = client.get("/api/personnel")
     assert response.status_code == 200
-    data = response.get_json()
+    data = response.get_json()["items"]
     assert len(data) == 2
     # Since our route sorts by name, ENS Smith should be first
     assert data[0]["name"] == "ENS Smith"
@@ -0,0 +1,98 @@
+import logging
+import pytest
+from datetime import date, timedelta
+from app.models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleMembership,
+    Assignment,
+    Person,
+    Group,
+    MasterStation,
+    Qualification,
+)
+
+
+def _populate(session, n):
+    """n groups x n people each, plus an n-day schedule fully assigned."""
+    stn = MasterStation(name=f"Budget Station {n}", abbr=f"B{n}")
+    groups = [Group(name=f"Budget Group {n}-{i}") for i in range(n)]
+    session.add_all([stn, *groups])
+    session.flush()
+
+    people = [
+        Person(name=f"Budget Person {n}-{g.id}-{i}", group_id=g.id)
+        for g in groups
+        for i in range(n)
+    ]
+    session.add_all(people)
+    session.flush()
+    session.add_all(Qualification(person_id=p.id, station_id=stn.id) for p in people)
+
+    start = date(2026, 9, 1)
+    sch = Schedule(
+        name=f"Budget {n}", start_date=start, end_date=start + timedelta(days=n - 1)
+    )
+    session.add(sch)
+    session.flush()
+    days = [
+        ScheduleDay(schedule_id=sch.id, date=start + timedelta(days=i))
+        for i in range(n)
+    ]
+    members = [
+        ScheduleMembership(schedule_id=sch.id, person_id=p.id, group_id=p.group_id)
+        for p in people
+    ]
+    session.add_all(days + members)
+    session.flush()
+    session.add_all(
+        Assignment(
+            schedule_id=sch.id,
+            day_id=d.id,
+            station_id=stn.id,
+            membership_id=members[i].id,
+        )
+        for i, d in enumerate(days)
+    )
+    session.commit()
+    return sch.id
+
+
+def test_response_carries_sql_headers(client, session, caplog):
+    _populate(session, 2)
+    with caplog.at_level(logging.INFO):
+        res = client.get("/api/groups")
+
+    assert res.status_code == 200
+    assert int(res.headers["X-SQL-Query-Count"]) >= 1
+    assert int(res.headers["X-SQL-Row-Count"]) >= 2
+    assert float(res.headers["X-SQL-Time-Ms"]) >= 0
+    assert any('"event": "sql_stats"' in r.getMessage() for r in caplog.records)
+
+
+def test_budget_fixture_fails_when_exceeded(client, query_budget):
+    with pytest.raises(pytest.fail.Exception, match="Query budget exceeded"):
+        with query_budget(0):
+            client.get("/api/groups")
+
+
+@pytest.mark.parametrize(
+    "url,budget",
+    [
+        ("/api/groups", 2),
+        ("/api/personnel", 2),
+        ("/api/schedules/{id}/assignments", 4),
+        ("/api/schedules/{id}/days", 5),
+    ],
+)
+def test_list_endpoints_stay_within_budget(client, session, query_budget, url, budget):
+    small = _populate(session, 2)
+    large = _populate(session, 6)
+
+    counts = []
+    for s_id in (small, large):
+        session.expunge_all()
+        with query_budget(budget) as stats:
+            assert client.get(url.format(id=s_id)).status_code == 200
+        counts.append(stats.count)
+    assert counts[0] == counts[1]
@@ -1,4 +1,5 @@
 import pytest
+import random
 from datetime import date
 from app.models import (
     Schedule,
@@ -10,7 +11,11 @@ from app.models import (
     Group,
     MasterStation,  # 🟢 Add this import (or Station)
 )
-from app.utils.quota_calculator import calculate_schedule_quotas
+from app.utils.quota_calculator import (
+    calculate_schedule_quotas,
+    calculate_quotas_for_schedules,
+    water_fill,
+)
 from app import db
 
 
@@ -180,3 +185,62 @@ def test_quota_api_route(client, quota_test_data):
     assert str(ids["A"]) in data
     assert str(ids["B"]) in data
     assert isinstance(data[str(ids["A"])], (int, float))
+
+
+def _reference_waterfall(weights, caps, demand):
+    """The original iterative waterfall loop, kept as a test oracle."""
+    pool = [
+        {"weight": w, "max_load": c, "assigned_quota": 0.0, "is_locked": False}
+        for w, c in zip(weights, caps)
+    ]
+    remaining = demand
+    while True:
+        active = [p for p in pool if not p["is_locked"]]
+        if not active:
+            break
+        total = sum(p["weight"] for p in active)
+        if total == 0:
+            break
+        offenders = [p for p in active if (p["weight"] / total) * remaining > p["max_load"]]
+        if not offenders:
+            for p in active:
+                p["assigned_quota"] = (p["weight"] / total) * remaining
+            break
+        for p in offenders:
+            p["assigned_quota"] = p["max_load"]
+            p["is_locked"] = True
+            remaining -= p["max_load"]
+    return [p["assigned_quota"] for p in pool]
+
+
+def test_water_fill_matches_iterative_waterfall():
+    rng = random.Random(42)
+    for _ in range(300):
+        n = rng.randint(1, 40)
+        weights = [rng.choice([0.0, rng.uniform(0.1, 2.0)]) for _ in range(n)]
+        caps = [rng.choice([0.0, 2.0, 4.0, rng.uniform(0, 30)]) for _ in range(n)]
+        demand = rng.uniform(0, 300)
+
+        expected = _reference_waterfall(weights, caps, demand)
+        actual = water_fill(weights, caps, demand)
+
+        assert actual == pytest.approx(expected, abs=1e-6)
+
+
+def test_batch_quotas_match_single(app, quota_test_data):
+    with app.app_context():
+        s_id = quota_test_data["schedule_id"]
+        batch = calculate_quotas_for_schedules([s_id, 9999])
+
+        assert 9999 not in batch
+        assert batch[s_id] == calculate_schedule_quotas(s_id)
+
+
+def test_batch_quota_api_route(client, quota_test_data):
+    s_id = quota_test_data["schedule_id"]
+    res = client.get(f"/api/schedules/quotas?ids={s_id}")
+    assert res.status_code == 200
+    data = res.get_json()
+    assert str(quota_test_data["members"]["A"]) in data[str(s_id)]
+
+    assert client.get("/api/schedules/quotas?ids=abc").status_code == 400
@@ -0,0 +1,124 @@
+import gzip
+import pytest
+from datetime import date
+from app.models import Schedule, ScheduleDay
+from app.utils import compression
+from app.utils.change_tracking import ChangeSet
+from app.utils.query_stats import capture_queries
+from app.utils.response_cache import DiskTier, ResponseCache, get_response_cache
+
+
+@pytest.fixture
+def schedule_id(session):
+    sch = Schedule(
+        name="Cached", start_date=date(2026, 5, 1), end_date=date(2026, 5, 3)
+    )
+    session.add(sch)
+    session.flush()
+    session.add_all(
+        ScheduleDay(schedule_id=sch.id, date=date(2026, 5, d)) for d in (1, 2, 3)
+    )
+    session.commit()
+    return sch.id
+
+
+def test_second_reader_is_served_from_cache(client, schedule_id):
+    url = f"/api/schedules/{schedule_id}"
+    first = client.get(url)
+    assert first.headers["X-Cache"] == "MISS"
+
+    with capture_queries() as stats:
+        second = client.get(url)
+    assert second.headers["X-Cache"] == "HIT"
+    assert stats.count == 1  # the revision lookup
+    assert second.data == first.data
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+    # Query strings are part of the key
+    res = client.get(f"/api/schedules/{schedule_id}/assignments?format=columnar")
+    assert res.headers["X-Cache"] == "MISS"
+
+
+def test_write_evicts_schedule_entries(client, session, schedule_id):
+    url = f"/api/schedules/{schedule_id}"
+    client.get(url)
+    client.get(f"/api/schedules/{schedule_id}/days")
+    cache = get_response_cache()
+    assert len(cache) == 2
+
+    session.get(Schedule, schedule_id).name = "Renamed"
+    session.commit()
+    assert len(cache) == 0
+
+    res = client.get(url)
+    assert res.headers["X-Cache"] == "MISS"
+    assert res.get_json()["name"] == "Renamed"
+
+
+def test_hits_are_served_compressed(app, client, schedule_id, monkeypatch):
+    monkeypatch.setattr(app.extensions["compression"], "min_size", 0)
+    monkeypatch.setattr(compression, "brotli", None)
+    calls = []
+    real_gzip = compression.gzip_encode
+    monkeypatch.setattr(
+        compression, "gzip_encode", lambda *a: calls.append(a) or real_gzip(*a)
+    )
+    url = f"/api/schedules/{schedule_id}"
+    gz = {"Accept-Encoding": "gzip"}
+
+    first = client.get(url, headers=gz)
+    second = client.get(url, headers=gz)
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert second.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in second.headers["Vary"]
+    assert second.data == first.data
+    assert len(calls) == 1  # compressed once, before it was stored
+
+    # Other encodings are cached separately
+    plain = client.get(url)
+    assert plain.headers["X-Cache"] == "MISS"
+    assert "Content-Encoding" not in plain.headers
+    assert gzip.decompress(second.data) == plain.data
+
+
+def test_lru_is_bounded_by_bytes():
+    cache = ResponseCache(max_entries=10, max_bytes=10)
+    cache.put(("a", "", 1, 0, None), "application/json", b"12345")
+    cache.put(("b", "", 1, 0, None), "application/json", b"12345")
+    cache.get(("a", "", 1, 0, None))
+    cache.put(("c", "", 2, 0, None), "application/json", b"123")
+    assert cache.get(("b", "", 1, 0, None)) is None
+    assert cache.nbytes == 8
+    assert cache.stats()["evictions"] == 1
+    # Larger than the whole budget: never stored
+    cache.put(("d", "", 2, 0, None), "application/json", b"x" * 11)
+    assert cache.get(("d", "", 2, 0, None)) is None
+
+
+def test_disk_tier_is_shared_between_processes(tmp_path):
+    key = ("schedules.get_single_schedule", "", 7, 3, None)
+    worker_a = ResponseCache(disk=DiskTier(str(tmp_path)))
+    worker_b = ResponseCache(disk=DiskTier(str(tmp_path)))
+
+    worker_a.put(key, "application/json", b'{"id": 7}')
+    assert worker_b.get(key) == ("application/json", b'{"id": 7}', None)
+    assert worker_b.stats()["disk_hits"] == 1
+
+    changes = ChangeSet()
+    changes.add(7, "Assignment")
+    worker_b.invalidate(changes)
+    assert worker_a.disk.get(key) is None
+
+    gzip_key = key[:4] + ("gzip",)
+    worker_a.put(gzip_key, "application/json", b"\x1f\x8b", "gzip")
+    assert worker_b.get(gzip_key) == ("application/json", b"\x1f\x8b", "gzip")
+
+
+def test_metrics_endpoint(client, schedule_id):
+    client.get(f"/api/schedules/{schedule_id}/summary")
+    client.get(f"/api/schedules/{schedule_id}/summary")
+    stats = client.get("/api/metrics/caches").get_json()
+    rc = stats["response_cache"]
+    assert (rc["hits"], rc["misses"], rc["hit_ratio"]) == (1, 1, 0.5)
+    assert rc["bytes"] > 0
+    assert "hit_ratio" in stats["schedule_cache"]
@@ -0,0 +1,179 @@
+import pytest
+from datetime import date
+from sqlalchemy import update
+from app.models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleMembership,
+    ScheduleLeave,
+    Assignment,
+    Person,
+    Group,
+    MasterStation,
+)
+from app.utils.query_stats import capture_queries
+from app.utils.revisions import get_global_revision, get_revision
+
+
+@pytest.fixture
+def rev_env(session):
+    grp = Group(name="Revision Group")
+    person = Person(name="Revision Person")
+    stn = MasterStation(name="Revision Station", abbr="REV")
+    sch = Schedule(
+        name="Revision", start_date=date(2026, 8, 1), end_date=date(2026, 8, 2)
+    )
+    other = Schedule(
+        name="Other", start_date=date(2026, 8, 1), end_date=date(2026, 8, 2)
+    )
+    session.add_all([grp, person, stn, sch, other])
+    session.flush()
+    day = ScheduleDay(schedule_id=sch.id, date=date(2026, 8, 1))
+    mem = ScheduleMembership(
+        schedule_id=sch.id, person_id=person.id, group_id=grp.id
+    )
+    session.add_all([day, mem])
+    session.flush()
+    slot = Assignment(schedule_id=sch.id, day_id=day.id, station_id=stn.id)
+    session.add(slot)
+    session.commit()
+    return {
+        "schedule": sch.id,
+        "other": other.id,
+        "slot": slot.id,
+        "mem": mem.id,
+        "person": person.id,
+    }
+
+
+def test_child_rows_bump_only_their_schedule(session, rev_env):
+    s_id, other = rev_env["schedule"], rev_env["other"]
+    before, other_before = get_revision(s_id), get_revision(other)
+
+    session.get(Assignment, rev_env["slot"]).is_locked = True
+    session.commit()
+    after_slot = get_revision(s_id)
+    assert after_slot > before
+
+    # Reaches the schedule through membership_id
+    session.add(
+        ScheduleLeave(
+            membership_id=rev_env["mem"],
+            start_date=date(2026, 8, 1),
+            end_date=date(2026, 8, 1),
+        )
+    )
+    session.commit()
+    assert get_revision(s_id) > after_slot
+    assert get_revision(other) == other_before
+
+
+def test_bulk_and_master_data_changes(session, rev_env):
+    s_id, other = rev_env["schedule"], rev_env["other"]
+    before, other_before = get_revision(s_id), get_revision(other)
+
+    session.execute(
+        update(Assignment)
+        .where(Assignment.schedule_id == s_id)
+        .values(is_locked=True)
+        .execution_options(schedule_id=s_id)
+    )
+    session.commit()
+    assert get_revision(s_id) == before + 1
+    assert get_revision(other) == other_before
+
+    # Master data bumps the shared counter, not every schedule row
+    global_before = get_global_revision()
+    with capture_queries() as stats:
+        session.get(Person, rev_env["person"]).name = "Renamed"
+        session.commit()
+    assert get_global_revision() == global_before + 1
+    assert get_revision(other) == other_before
+    assert not any("UPDATE schedules" in sql for sql, _ in stats.statements)
+
+
+def test_master_data_changes_every_etag(client, session, rev_env):
+    url = f"/api/schedules/{rev_env['other']}/days"
+    etag = client.get(url).headers["ETag"]
+    session.get(Person, rev_env["person"]).name = "Renamed"
+    session.commit()
+    res = client.get(url, headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+
+def test_rollback_discards_bump(session, rev_env):
+    s_id = rev_env["schedule"]
+    before = get_revision(s_id)
+    session.get(Assignment, rev_env["slot"]).is_locked = True
+    session.flush()
+    assert get_revision(s_id) == before + 1
+    session.rollback()
+    assert get_revision(s_id) == before
+    assert get_revision(99999) is None
+
+
+SCOPED_URLS = [
+    "/api/schedules/{id}",
+    "/api/schedules/{id}/summary",
+    "/api/schedules/{id}/quotas",
+    "/api/schedules/{id}/availability-grid",
+    "/api/schedules/{id}/alerts",
+    "/api/schedules/{id}/candidates",
+    "/api/schedules/{id}/candidates/validation",
+    "/api/schedules/{id}/assignments",
+    "/api/schedules/{id}/days",
+    "/api/exclusions/schedule/{id}",
+    "/api/leaves?schedule_id={id}",
+    "/api/schedule-memberships?schedule_id={id}",
+]
+
+
+@pytest.mark.parametrize("url", SCOPED_URLS)
+def test_scoped_gets_answer_304_with_one_query(client, rev_env, url):
+    url = url.format(id=rev_env["schedule"])
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "no-cache" in first.headers["Cache-Control"]
+
+    with capture_queries() as stats:
+        res = client.get(url, headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.data == b""
+    assert res.headers["ETag"] == etag
+    assert stats.count == 1
+
+
+def test_etag_changes_after_write(client, rev_env):
+    url = f"/api/schedules/{rev_env['schedule']}/assignments"
+    etag = client.get(url).headers["ETag"]
+
+    res = client.patch(f"/api/assignments/{rev_env['slot']}", json={"is_locked": True})
+    assert res.status_code == 200
+
+    res = client.get(url, headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+    assert res.get_json()[0]["is_locked"] is True
+
+
+def test_clearing_a_schedule_keeps_other_etags(client, rev_env):
+    url = f"/api/schedules/{rev_env['other']}"
+    first = client.get(url)
+    grev = get_global_revision()
+
+    res = client.post(f"/api/schedules/{rev_env['schedule']}/clear")
+    assert res.status_code == 200
+    assert get_global_revision() == grev
+
+    res = client.get(url)
+    assert res.headers["ETag"] == first.headers["ETag"]
+    assert res.headers["X-Cache"] == "HIT"
+
+
+def test_missing_schedule_has_no_etag(client):
+    res = client.get("/api/schedules/99999")
+    assert res.status_code == 404
+    assert "ETag" not in res.headers
@@ -0,0 +1,209 @@
+import json
+import pytest
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import select
+from app.models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleMembership,
+    ScheduleStation,
+    ScheduleLeave,
+    ScheduleExclusion,
+    MembershipStationWeight,
+    Assignment,
+    Person,
+    Group,
+    MasterStation,
+    Qualification,
+)
+from app.utils.load_plans import load_schedule
+from app.utils.row_serializers import (
+    row_mapper,
+    serialize_assignments,
+    serialize_assignments_columnar,
+    serialize_day,
+    serialize_memberships,
+    serialize_schedule,
+)
+
+
+@pytest.fixture
+def rich_schedule(session):
+    grp = Group(name="Serializer Group", max_assignments=7)
+    ood = MasterStation(name="Serializer OOD", abbr="SOD")
+    jood = MasterStation(name="Serializer JOOD", abbr="SJD")
+    people = [Person(name=f"Serializer {i}") for i in range(3)]
+    session.add_all([grp, ood, jood, *people])
+    session.flush()
+    session.add_all(
+        [
+            Qualification(person_id=people[0].id, station_id=ood.id),
+            Qualification(person_id=people[0].id, station_id=jood.id, is_active=False),
+            Qualification(person_id=people[1].id, station_id=jood.id),
+        ]
+    )
+
+    sch = Schedule(
+        name="Serializer", start_date=date(2026, 7, 1), end_date=date(2026, 7, 4)
+    )
+    session.add(sch)
+    session.flush()
+    days = [
+        ScheduleDay(schedule_id=sch.id, date=date(2026, 7, i), weight=1.0 + i)
+        for i in range(1, 5)
+    ]
+    members = [
+        ScheduleMembership(
+            schedule_id=sch.id,
+            person_id=p.id,
+            group_id=grp.id,
+            override_max_assignments=3 if i == 0 else None,
+        )
+        for i, p in enumerate(people)
+    ]
+    session.add_all(days + members)
+    session.add_all(
+        ScheduleStation(schedule_id=sch.id, station_id=s.id) for s in (ood, jood)
+    )
+    session.flush()
+
+    session.add_all(
+        [
+            ScheduleLeave(
+                membership_id=members[0].id,
+                start_date=date(2026, 7, 2),
+                end_date=date(2026, 7, 3),
+                reason="Leave",
+            ),
+            ScheduleExclusion(
+                membership_id=members[1].id, day_id=days[3].id, reason="Training"
+            ),
+            MembershipStationWeight(
+                membership_id=members[0].id, station_id=ood.id, weight=0.75
+            ),
+            MembershipStationWeight(
+                membership_id=members[1].id, station_id=jood.id, weight=1.0
+            ),
+        ]
+    )
+    session.add_all(
+        Assignment(
+            schedule_id=sch.id,
+            day_id=d.id,
+            station_id=st.id,
+            membership_id=members[i % 3].id if st is ood else None,
+            is_locked=i == 1,
+        )
+        for i, d in enumerate(days)
+        for st in (ood, jood)
+    )
+    session.commit()
+    return sch.id
+
+
+def test_row_mapper_applies_converters():
+    to_dict = row_mapper("id", ("day", lambda d: d.isoformat()))
+    assert to_dict((4, date(2026, 1, 2))) == {"id": 4, "day": "2026-01-02"}
+
+
+def test_assignments_match_orm(session, rich_schedule):
+    orm = session.scalars(
+        select(Assignment).filter_by(schedule_id=rich_schedule).order_by(Assignment.id)
+    ).all()
+    assert serialize_assignments(rich_schedule) == [a.to_dict() for a in orm]
+
+
+def test_columnar_assignments_expand_to_rows(client, rich_schedule):
+    rows = serialize_assignments(rich_schedule)
+    res = client.get(f"/api/schedules/{rich_schedule}/assignments?format=columnar")
+    assert res.status_code == 200
+    data = res.get_json()
+    assert data["count"] == len(rows) == 8
+
+    cols = data["columns"]
+    expanded = [
+        {
+            "id": cols["id"][i],
+            "day_id": cols["day_id"][i],
+            "date": data["days"][str(cols["day_id"][i])],
+            "station_id": cols["station_id"][i],
+            "station_name": data["stations"][str(cols["station_id"][i])],
+            "membership_id": cols["membership_id"][i],
+            "assigned_person_name": (
+                data["members"][str(cols["membership_id"][i])]
+                if cols["membership_id"][i] is not None
+                else None
+            ),
+            "is_locked": cols["is_locked"][i],
+            "availability_estimate": cols["availability_estimate"][i],
+        }
+        for i in range(data["count"])
+    ]
+    assert expanded == rows
+    full = client.get(f"/api/schedules/{rich_schedule}/assignments")
+    assert len(res.data) < len(full.data)
+
+
+def test_columnar_assignments_empty_and_bad_format(client):
+    empty = serialize_assignments_columnar(99999)
+    assert empty["count"] == 0
+    assert empty["columns"]["id"] == [] and empty["members"] == {}
+    res = client.get("/api/schedules/1/assignments?format=xml")
+    assert res.status_code == 400
+
+
+def test_memberships_match_orm(session, rich_schedule):
+    orm = session.scalars(
+        select(ScheduleMembership)
+        .filter_by(schedule_id=rich_schedule)
+        .order_by(ScheduleMembership.id)
+    ).all()
+    assert serialize_memberships(rich_schedule) == [m.to_dict() for m in orm]
+    assert len(serialize_memberships()) == 3
+
+
+def test_schedule_matches_full_plan(session, rich_schedule):
+    expected = load_schedule(rich_schedule, "full").to_dict(summary_only=False)
+    assert serialize_schedule(rich_schedule) == expected
+    assert serialize_schedule(99999) is None
+
+
+def test_exploded_schedule_matches_full_plan(session, rich_schedule):
+    expected = load_schedule(rich_schedule, "full").to_dict(
+        summary_only=False, explode_leaves=True
+    )
+    assert serialize_schedule(rich_schedule, explode_leaves=True) == expected
+
+
+def test_day_matches_orm_without_loading_assignments(
+    session, rich_schedule, query_budget
+):
+    days = session.scalars(
+        select(ScheduleDay)
+        .filter_by(schedule_id=rich_schedule)
+        .order_by(ScheduleDay.id)
+    ).all()
+    expected = [d.to_dict() for d in days]
+    session.expunge_all()
+    with query_budget(3) as stats:
+        actual = [serialize_day(d["id"]) for d in expected[:1]]
+    assert stats.count == 3
+    # Assignments are only ever counted, never loaded
+    touching = [sql for sql, _ in stats.statements if "FROM assignments" in sql]
+    assert touching and all("count(assignments.id)" in sql for sql in touching)
+    assert actual == expected[:1]
+    assert [serialize_day(d["id"]) for d in expected] == expected
+    assert serialize_day(99999) is None
+
+
+def test_orjson_provider_keeps_flask_output(app, client, rich_schedule):
+    sample = {"b": 1, "a": date(2026, 1, 2), "nested": [1.5, None]}
+    assert json.loads(app.json.dumps(sample)) == json.loads(
+        DefaultJSONProvider(app).dumps(sample)
+    )
+    assert json.loads(app.json.dumps({2: "x"})) == {"2": "x"}
+
+    res = client.get(f"/api/schedules/{rich_schedule}/assignments")
+    assert res.status_code == 200
+    assert res.get_json() == serialize_assignments(rich_schedule)
@@ -0,0 +1,225 @@
+import pytest
+from datetime import date
+from sqlalchemy import event, text, update
+from app.database import db
+from app.models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleMembership,
+    ScheduleLeave,
+    ScheduleStation,
+    Assignment,
+    Person,
+    Group,
+    MasterStation,
+)
+from app.utils.schedule_cache import ScheduleCache, get_schedule_cache
+from app.utils.quota_calculator import calculate_schedule_quotas
+from app.utils.change_tracking import ChangeSet
+
+
+@pytest.fixture
+def cache_env(session):
+    grp = Group(name="Cache Group", max_assignments=10)
+    stn = MasterStation(name="Cache Station", abbr="CS")
+    p1 = Person(name="Cache One")
+    p2 = Person(name="Cache Two")
+    session.add_all([grp, stn, p1, p2])
+    session.flush()
+
+    sch = Schedule(
+        name="Cache Test", start_date=date(2026, 5, 1), end_date=date(2026, 5, 4)
+    )
+    session.add(sch)
+    session.flush()
+
+    days = [
+        ScheduleDay(schedule_id=sch.id, date=date(2026, 5, i), weight=1.0)
+        for i in range(1, 5)
+    ]
+    session.add_all(days)
+    session.add(ScheduleStation(schedule_id=sch.id, station_id=stn.id))
+    m1 = ScheduleMembership(schedule_id=sch.id, person_id=p1.id, group_id=grp.id)
+    m2 = ScheduleMembership(schedule_id=sch.id, person_id=p2.id, group_id=grp.id)
+    session.add_all([m1, m2])
+    session.flush()
+
+    slot = Assignment(schedule_id=sch.id, day_id=days[0].id, station_id=stn.id)
+    session.add(slot)
+    session.commit()
+
+    return {"schedule": sch, "m1": m1, "m2": m2, "group": grp, "slot": slot}
+
+
+@pytest.fixture
+def count_queries(app):
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    yield statements
+    event.remove(db.engine, "before_cursor_execute", _count)
+
+
+def test_lru_bound_evicts_oldest():
+    cache = ScheduleCache(max_entries=2)
+    cache.get_or_compute(1, "a", {"ScheduleDay"}, lambda: "one")
+    cache.get_or_compute(2, "a", {"ScheduleDay"}, lambda: "two")
+    cache.get_or_compute(1, "a", {"ScheduleDay"}, lambda: "stale")  # touch 1
+    cache.get_or_compute(3, "a", {"ScheduleDay"}, lambda: "three")
+
+    assert len(cache) == 2
+    assert cache.peek(1, "a") == "one"
+    assert cache.peek(2, "a") is None
+
+
+def test_invalidation_is_scoped_by_model_and_schedule():
+    cache = ScheduleCache()
+    cache.put(1, "quotas", {"ScheduleLeave"}, "q1")
+    cache.put(1, "alerts", {"Assignment"}, "a1")
+    cache.put(2, "quotas", {"ScheduleLeave"}, "q2")
+
+    changes = ChangeSet()
+    changes.add(1, "ScheduleLeave")
+    cache.invalidate(changes)
+
+    assert cache.peek(1, "quotas") is None
+    assert cache.peek(1, "alerts") == "a1"
+    assert cache.peek(2, "quotas") == "q2"
+
+
+def test_value_invalidated_while_computing_is_not_stored():
+    cache = ScheduleCache()
+    changes = ChangeSet()
+    changes.add(1, "ScheduleLeave")
+
+    def compute():
+        cache.invalidate(changes)  # a write lands mid-computation
+        return "stale"
+
+    assert cache.get_or_compute(1, "quotas", {"ScheduleLeave"}, compute) == "stale"
+    assert cache.peek(1, "quotas") is None
+
+    token = cache.snapshot([1])[1]
+    cache.discard(1, "quotas")
+    cache.put(1, "quotas", {"ScheduleLeave"}, "stale", token)
+    assert cache.peek(1, "quotas") is None
+
+
+def test_entries_are_checked_against_stamps():
+    stamps = {1: (1, 0)}
+    cache = ScheduleCache(
+        stamp_fn=lambda ids: {s_id: stamps.get(s_id) for s_id in ids}
+    )
+    cache.put(1, "quotas", {"ScheduleLeave"}, "q1")
+    cache.put(1, "alerts", {"Assignment"}, "a1")
+
+    # Local write: the untouched entry follows the new revision
+    changes = ChangeSet()
+    changes.add(1, "ScheduleLeave")
+    changes.revisions = {1: 2}
+    cache.invalidate(changes)
+    stamps[1] = (2, 0)
+    assert cache.peek(1, "alerts") == "a1"
+
+    # Write elsewhere (another process): nothing matches anymore
+    stamps[1] = (3, 0)
+    assert cache.peek(1, "alerts") is None
+
+
+def test_rollback_drops_the_schedules_entries():
+    cache = ScheduleCache()
+    cache.put(1, "alerts", {"Assignment"}, "a1")
+    cache.put(2, "alerts", {"Assignment"}, "a2")
+    changes = ChangeSet()
+    changes.add(1, "ScheduleLeave")
+    changes.rolled_back = True
+    cache.invalidate(changes)
+
+    assert cache.peek(1, "alerts") is None
+    assert cache.peek(2, "alerts") == "a2"
+
+
+def test_repeated_quota_calls_hit_the_cache(cache_env, count_queries):
+    s_id = cache_env["schedule"].id
+    first = calculate_schedule_quotas(s_id)
+
+    count_queries.clear()
+    second = calculate_schedule_quotas(s_id)
+
+    assert second == first
+    assert count_queries == []
+
+
+def test_leave_change_invalidates_quotas(session, cache_env):
+    s_id = cache_env["schedule"].id
+    before = calculate_schedule_quotas(s_id)
+
+    session.add(
+        ScheduleLeave(
+            membership_id=cache_env["m1"].id,
+            start_date=date(2026, 5, 1),
+            end_date=date(2026, 5, 2),
+        )
+    )
+    session.commit()
+
+    after = calculate_schedule_quotas(s_id)
+    assert after[cache_env["m1"].id] < before[cache_env["m1"].id]
+
+
+def test_assignment_edit_keeps_quotas_cached(session, cache_env):
+    s_id = cache_env["schedule"].id
+    calculate_schedule_quotas(s_id)
+
+    cache_env["slot"].membership_id = cache_env["m1"].id
+    session.commit()
+
+    assert get_schedule_cache().peek(s_id, "quotas") is not None
+
+
+def test_group_change_invalidates_every_schedule(session, cache_env):
+    s_id = cache_env["schedule"].id
+    calculate_schedule_quotas(s_id)
+
+    cache_env["group"].max_assignments = 1
+    session.commit()
+
+    assert get_schedule_cache().peek(s_id, "quotas") is None
+
+
+def test_scoped_bulk_update_invalidates(session, cache_env):
+    s_id = cache_env["schedule"].id
+    calculate_schedule_quotas(s_id)
+
+    session.execute(
+        update(ScheduleDay)
+        .where(ScheduleDay.schedule_id == s_id)
+        .values(weight=2.0)
+        .execution_options(schedule_id=s_id)
+    )
+    session.commit()
+
+    assert get_schedule_cache().peek(s_id, "quotas") is None
+
+
+def test_write_from_another_process_invalidates(session, cache_env):
+    s_id = cache_env["schedule"].id
+    calculate_schedule_quotas(s_id)
+    session.commit()
+    cache = get_schedule_cache()
+    assert cache.peek(s_id, "quotas") is not None
+    session.commit()
+
+    # Bypasses this process's session, as another worker's commit would
+    with db.engine.begin() as conn:
+        conn.execute(
+            text("UPDATE schedules SET revision = revision + 1 WHERE id = :id"),
+            {"id": s_id},
+        )
+
+    assert cache.peek(s_id, "quotas") is None
+    calculate_schedule_quotas(s_id)
+    assert cache.peek(s_id, "quotas") is not None
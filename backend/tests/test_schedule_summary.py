@@ -1,5 +1,7 @@
 import pytest
 from datetime import date
+from sqlalchemy import event
+from app.database import db
 from app.models import (
     Schedule,
     ScheduleDay,
@@ -10,6 +12,7 @@ from app.models import (
     Group,
     Qualification,
     ScheduleStation,
+    Assignment,
 )
 from app.utils.schedule_summary_util import get_schedule_summary_data
 
@@ -78,3 +81,62 @@ def test_summary_calculates_load_factor(session, summary_env):
     ood_stats = next(s for s in res["station_health"] if s["abbr"] == "OOD")
     assert ood_stats["supply_weight"] == 2.0
     assert ood_stats["load_factor"] == 5.0  # 10.0 load / 2.0 supply
+
+
+def test_summary_flags_over_assigned_member(session, summary_env):
+    mem_id = summary_env["membership"].id
+    session.add_all(
+        [
+            MembershipStationWeight(
+                membership_id=mem_id, station_id=summary_env["ood"].id, weight=0.75
+            ),
+            MembershipStationWeight(
+                membership_id=mem_id, station_id=summary_env["jood"].id, weight=0.5
+            ),
+        ]
+    )
+    session.commit()
+
+    res = get_schedule_summary_data(summary_env["schedule"].id)
+    assert "Member John Smith is over-assigned (Total Weight: 1.25)." in res["warnings"]
+    assert res["is_solvable"] is True
+    assert res["member_count"] == 1
+    assert len(res["memberships"][0]["station_weights"]) == 2
+
+
+def test_summary_query_count_ignores_assignments(session, summary_env):
+    s_id = summary_env["schedule"].id
+
+    def count_summary_queries():
+        statements = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", _count)
+        try:
+            get_schedule_summary_data(s_id)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _count)
+        return statements
+
+    get_schedule_summary_data(s_id)  # warm the availability cache
+    empty = count_summary_queries()
+
+    days = session.query(ScheduleDay).filter_by(schedule_id=s_id).all()
+    for d in days:
+        for st in (summary_env["ood"], summary_env["jood"]):
+            session.add(
+                Assignment(
+                    schedule_id=s_id,
+                    day_id=d.id,
+                    station_id=st.id,
+                    membership_id=summary_env["membership"].id,
+                )
+            )
+    session.commit()
+    get_schedule_summary_data(s_id)
+
+    filled = count_summary_queries()
+    assert len(filled) == len(empty)
+    assert not any(" assignments" in stmt for stmt in filled)
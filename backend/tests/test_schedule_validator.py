@@ -1,4 +1,6 @@
+import random
 import pytest
+from sqlalchemy import event, update
 from datetime import date, timedelta
 from app.models import (
     Schedule,
@@ -11,8 +13,17 @@ from app.models import (
     Person,
     Group,
     MasterStation,
+    ScheduleCandidate,
 )
-from app.utils.schedule_validator import validate_schedule
+from app.utils.schedule_validator import (
+    AlertState,
+    get_validator_context,
+    validate_changes,
+    validate_schedule,
+    validate_schedule_sql,
+    validate_candidates,
+)
+from app.utils.schedule_cache import get_schedule_cache
 from app import db
 
 
@@ -306,3 +317,380 @@ def test_lookback_transition_fatigue_caught(app, validator_base_data):
         assert alerts[0]["type"] == "BACK_TO_BACK"
         # The alert should flag the Current Day (Day 2), not the historical one
         assert alerts[0]["day_id"] == data["day2_id"]
+
+
+# --- INCREMENTAL MODE ---
+
+
+def _token_from_etag(etag):
+    """W/"<schedule id>-<revision token>" -> revision token."""
+    return etag.rsplit("-", 1)[1].rstrip('"')
+
+
+def _alerts_base(client, schedule_id):
+    res = client.get(f"/api/schedules/{schedule_id}/alerts")
+    return _token_from_etag(res.headers["ETag"])
+
+
+def test_patch_returns_alert_delta(app, client, validator_base_data):
+    with app.app_context():
+        data = validator_base_data
+        a1 = Assignment(
+            schedule_id=data["schedule_id"],
+            day_id=data["day1_id"],
+            station_id=data["stationA_id"],
+            membership_id=data["member_id"],
+        )
+        a2 = Assignment(
+            schedule_id=data["schedule_id"],
+            day_id=data["day2_id"],
+            station_id=data["stationA_id"],
+        )
+        db.session.add_all([a1, a2])
+        db.session.commit()
+
+        # Warm the cached alert set; the ETag carries the client's base
+        base = _alerts_base(client, data["schedule_id"])
+
+        res = client.patch(
+            f"/api/assignments/{a2.id}?alerts_base={base}",
+            json={"membership_id": data["member_id"]},
+        )
+        delta = res.get_json()["alerts_delta"]
+        assert [a["type"] for a in delta["added"]] == ["BACK_TO_BACK"]
+        assert delta["removed"] == []
+
+        res = client.patch(
+            f"/api/assignments/{a2.id}?alerts_base={delta['base']}",
+            json={"membership_id": None},
+        )
+        delta = res.get_json()["alerts_delta"]
+        assert delta["added"] == []
+        assert [a["type"] for a in delta["removed"]] == ["BACK_TO_BACK"]
+
+        assert validate_schedule(data["schedule_id"]) == []
+
+
+def test_stale_base_gets_the_full_list(app, client, validator_base_data):
+    with app.app_context():
+        data = validator_base_data
+        a1, a2 = (
+            Assignment(
+                schedule_id=data["schedule_id"],
+                day_id=day_id,
+                station_id=data["stationA_id"],
+            )
+            for day_id in (data["day1_id"], data["day2_id"])
+        )
+        db.session.add_all([a1, a2])
+        db.session.commit()
+        base = _alerts_base(client, data["schedule_id"])
+
+        # Client A edits a1: its delta is relative to the base both clients saw
+        res = client.patch(
+            f"/api/assignments/{a1.id}?alerts_base={base}",
+            json={"membership_id": data["member_id"]},
+        )
+        assert res.get_json()["alerts_delta"]["added"] == []
+
+        # Client B, still on the old base, must not miss A's change
+        res = client.patch(
+            f"/api/assignments/{a2.id}?alerts_base={base}",
+            json={"membership_id": data["member_id"]},
+        )
+        delta = res.get_json()["alerts_delta"]
+        assert "added" not in delta
+        assert [a["type"] for a in delta["alerts"]] == ["BACK_TO_BACK"]
+
+        # No base at all: full list as well
+        res = client.patch(f"/api/assignments/{a2.id}", json={"is_locked": False})
+        assert [a["type"] for a in res.get_json()["alerts_delta"]["alerts"]] == [
+            "BACK_TO_BACK"
+        ]
+
+
+def test_changed_param_returns_delta(app, client, validator_base_data):
+    with app.app_context():
+        data = validator_base_data
+        a1 = Assignment(
+            schedule_id=data["schedule_id"],
+            day_id=data["day1_id"],
+            station_id=data["stationA_id"],
+        )
+        db.session.add(a1)
+        db.session.commit()
+        validate_schedule(data["schedule_id"])
+
+        db.session.add(
+            ScheduleLeave(
+                membership_id=data["member_id"],
+                start_date=data["date1"],
+                end_date=data["date1"],
+            )
+        )
+        db.session.commit()  # Leave change rebuilds the alert set on next use
+
+        res = client.get(f"/api/schedules/{data['schedule_id']}/alerts")
+        assert res.get_json() == []
+        base = _token_from_etag(res.headers["ETag"])
+
+        a1.membership_id = data["member_id"]
+        db.session.commit()
+
+        res = client.get(
+            f"/api/schedules/{data['schedule_id']}/alerts"
+            f"?changed={a1.id}&base={base}"
+        )
+        delta = res.get_json()
+        assert [a["type"] for a in delta["added"]] == ["LEAVE_CONFLICT"]
+
+        res = client.get(f"/api/schedules/{data['schedule_id']}/alerts?changed=x")
+        assert res.status_code == 400
+
+
+@pytest.fixture
+def parity_schedule(session):
+    """10 days (2 lookback), 2 stations, 3 members, leaves + an exclusion, empty slots."""
+    grp = Group(name="Parity Group")
+    stations = [MasterStation(name=f"Parity {i}", abbr=f"P{i}") for i in range(2)]
+    people = [Person(name=f"Parity Person {i}") for i in range(3)]
+    session.add_all([grp] + stations + people)
+    session.flush()
+
+    sch = Schedule(
+        name="Parity", start_date=date(2025, 3, 1), end_date=date(2025, 3, 10)
+    )
+    session.add(sch)
+    session.flush()
+
+    days = [
+        ScheduleDay(
+            schedule_id=sch.id,
+            date=date(2025, 3, 1) + timedelta(days=i),
+            weight=1.0,
+            is_lookback=i < 2,
+        )
+        for i in range(10)
+    ]
+    sched_stations = [
+        ScheduleStation(schedule_id=sch.id, station_id=st.id) for st in stations
+    ]
+    members = [
+        ScheduleMembership(schedule_id=sch.id, person_id=p.id, group_id=grp.id)
+        for p in people
+    ]
+    session.add_all(days + sched_stations + members)
+    session.flush()
+
+    session.add(
+        ScheduleLeave(
+            membership_id=members[0].id,
+            start_date=date(2025, 3, 4),
+            end_date=date(2025, 3, 6),
+        )
+    )
+    session.add(
+        ScheduleLeave(
+            membership_id=members[0].id,
+            start_date=date(2025, 3, 6),
+            end_date=date(2025, 3, 7),
+        )
+    )
+    session.add(
+        ScheduleLeave(
+            membership_id=members[2].id,
+            start_date=date(2025, 2, 25),
+            end_date=date(2025, 3, 2),
+        )
+    )
+    session.add(ScheduleExclusion(membership_id=members[1].id, day_id=days[8].id))
+    session.add(ScheduleExclusion(membership_id=members[2].id, day_id=days[1].id))
+
+    slots = [
+        Assignment(schedule_id=sch.id, day_id=d.id, station_id=ss.id)
+        for d in days
+        for ss in sched_stations
+    ]
+    session.add_all(slots)
+    session.commit()
+    return {"schedule": sch, "slots": slots, "members": members}
+
+
+def _random_fill(rng, env, density):
+    for slot in env["slots"]:
+        if rng.random() < density:
+            slot.membership_id = rng.choice(env["members"]).id
+        else:
+            slot.membership_id = None
+
+
+def test_incremental_alerts_match_full_rebuild(app, session, parity_schedule):
+    """Random edits applied incrementally must match a from-scratch validation."""
+    rng = random.Random(7)
+    sch = parity_schedule["schedule"]
+    slots = parity_schedule["slots"]
+    members = parity_schedule["members"]
+
+    validate_schedule(sch.id)
+    for _ in range(60):
+        slot = rng.choice(slots)
+        choice = rng.choice(members + [None])
+        slot.membership_id = choice.id if choice else None
+        session.commit()
+
+        incremental = validate_schedule(sch.id)
+        get_schedule_cache().discard(sch.id, "alert_state")
+        assert incremental == validate_schedule(sch.id)
+
+
+def test_bulk_assignment_update_rebuilds_alerts(app, session, validator_base_data):
+    data = validator_base_data
+    a1 = Assignment(
+        schedule_id=data["schedule_id"],
+        day_id=data["day1_id"],
+        station_id=data["stationA_id"],
+    )
+    a2 = Assignment(
+        schedule_id=data["schedule_id"],
+        day_id=data["day2_id"],
+        station_id=data["stationA_id"],
+    )
+    session.add_all([a1, a2])
+    session.commit()
+    assert validate_schedule(data["schedule_id"]) == []
+
+    session.execute(
+        update(Assignment)
+        .where(Assignment.schedule_id == data["schedule_id"])
+        .values(membership_id=data["member_id"])
+        .execution_options(schedule_id=data["schedule_id"])
+    )
+    session.commit()
+
+    assert validate_changes(data["schedule_id"], [], build=False) is None
+    assert [a["type"] for a in validate_schedule(data["schedule_id"])] == [
+        "BACK_TO_BACK"
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sql_validation_matches_python(app, session, parity_schedule, seed):
+    rng = random.Random(seed)
+    sch = parity_schedule["schedule"]
+    _random_fill(rng, parity_schedule, density=0.3 + 0.15 * seed)
+    session.commit()
+
+    python_alerts = AlertState(
+        sch.id, get_validator_context(sch.id), use_sql=False
+    ).all_alerts()
+    assert python_alerts  # the fill should produce some conflicts
+    assert validate_schedule_sql(sch.id) == python_alerts
+    assert validate_schedule(sch.id) == python_alerts
+
+
+def test_sql_validation_is_one_round_trip(app, session, parity_schedule):
+    _random_fill(random.Random(1), parity_schedule, density=0.8)
+    session.commit()
+    s_id = parity_schedule["schedule"].id
+    get_validator_context(s_id)  # warm names / dates
+
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        alerts = validate_schedule_sql(s_id)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert alerts
+    assert len(statements) == 1
+
+
+# --- CANDIDATES ---
+
+
+def test_candidates_validated_without_applying(app, client, session, validator_base_data):
+    data = validator_base_data
+    d1, d2 = data["day1_id"], data["day2_id"]
+    st = data["stationA_id"]
+    a1 = Assignment(schedule_id=data["schedule_id"], day_id=d1, station_id=st)
+    a2 = Assignment(
+        schedule_id=data["schedule_id"], day_id=d2, station_id=st, is_locked=True
+    )
+    session.add_all([a1, a2])
+    member = session.get(ScheduleMembership, data["member_id"])
+    member.override_max_assignments = 1
+    session.add_all(
+        [
+            ScheduleCandidate(
+                schedule_id=data["schedule_id"],
+                run_id="run-a",
+                score=1.0,
+                assignments_data={f"{d1}_{st}": data["member_id"]},
+            ),
+            ScheduleCandidate(
+                schedule_id=data["schedule_id"],
+                run_id="run-a",
+                score=2.0,
+                assignments_data={
+                    f"{d1}_{st}": data["member_id"],
+                    f"{d2}_{st}": data["member_id"],
+                },
+            ),
+            ScheduleCandidate(
+                schedule_id=data["schedule_id"],
+                run_id="run-b",
+                score=0.5,
+                assignments_data={},
+            ),
+        ]
+    )
+    session.commit()
+
+    results = validate_candidates(data["schedule_id"], run_id="run-a")
+    assert [r["score"] for r in results] == [1.0, 2.0]
+    assert results[0]["alert_count"] == 0
+
+    # The locked empty slot keeps its (empty) member: no B2B, no max breach
+    assert [a["type"] for a in results[1]["alerts"]] == ["LOCK_CONFLICT"]
+    assert results[1]["alerts"][0]["assignment_ids"] == [a2.id]
+
+    # Nothing was written
+    assert session.get(Assignment, a1.id).membership_id is None
+
+    # Unlocked, the same candidate double-counts against the max of 1
+    a2.is_locked = False
+    session.commit()
+    res = client.get(
+        f"/api/schedules/{data['schedule_id']}/candidates/validation?run_id=run-a"
+    )
+    assert res.status_code == 200
+    types = [a["type"] for a in res.get_json()[1]["alerts"]]
+    assert types == ["BACK_TO_BACK", "MAX_ASSIGNMENTS"]
+
+    assert len(validate_candidates(data["schedule_id"])) == 3
+    assert client.get("/api/schedules/9999/candidates/validation").status_code == 404
+
+
+def test_candidate_override_of_zero_is_enforced(app, session, validator_base_data):
+    data = validator_base_data
+    d1, st = data["day1_id"], data["stationA_id"]
+    session.add(Assignment(schedule_id=data["schedule_id"], day_id=d1, station_id=st))
+    member = session.get(ScheduleMembership, data["member_id"])
+    member.override_max_assignments = 0
+    session.add(
+        ScheduleCandidate(
+            schedule_id=data["schedule_id"],
+            run_id="run-zero",
+            score=1.0,
+            assignments_data={f"{d1}_{st}": data["member_id"]},
+        )
+    )
+    session.commit()
+
+    [result] = validate_candidates(data["schedule_id"], run_id="run-zero")
+    alerts = [(a["type"], a["message"]) for a in result["alerts"]]
+    assert alerts == [("MAX_ASSIGNMENTS", "1 shifts exceeds the max of 0")]
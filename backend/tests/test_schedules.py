@@ -35,9 +35,10 @@ def test_get_schedules_list(client, session):
 
     response = client.get("/api/schedules")
     assert response.status_code == 200
-    assert len(response.json) >= 2
+    items = response.json["items"]
+    assert len(items) >= 2
     # Verify summary mode doesn't include deep nested data by default
-    assert "days" not in response.json[0]
+    assert "days" not in items[0]
 
 
 def test_get_single_schedule_full_load(client, session):
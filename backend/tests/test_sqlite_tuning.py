@@ -0,0 +1,90 @@
+import sqlite3
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app import create_app
+from app.database import db, read_session
+from app.models import Group
+from config import TestConfig
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    path = tmp_path / "tuning.db"
+
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SQLALCHEMY_READONLY_URI = f"sqlite:///file:{path}?mode=ro&uri=true"
+        # Fail fast if a reader would block
+        SQLITE_PRAGMAS = {**TestConfig.SQLITE_PRAGMAS, "busy_timeout": 200}
+
+    app = create_app(config_class=FileConfig)
+    with app.app_context():
+        db.create_all()
+        db.session.add(Group(name="Committed"))
+        db.session.commit()
+        yield app, path
+        db.session.remove()
+        db.engine.dispose()
+
+
+def test_pragmas_applied_on_connect(file_app):
+    pragmas = {
+        name: db.session.execute(text(f"PRAGMA {name}")).scalar()
+        for name in ("journal_mode", "synchronous", "busy_timeout", "temp_store")
+    }
+    assert pragmas == {
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "busy_timeout": 200,
+        "temp_store": 2,  # MEMORY
+    }
+
+
+def test_read_session_is_read_only(file_app):
+    assert read_session() is not db.session
+    assert read_session().execute(text("SELECT COUNT(*) FROM groups")).scalar() == 1
+    with pytest.raises(OperationalError):
+        read_session().execute(text("DELETE FROM groups"))
+
+
+def test_reads_proceed_during_exclusive_write(file_app):
+    app, path = file_app
+    writer = sqlite3.connect(path, isolation_level=None)
+    try:
+        # A solve committing holds the write lock; in rollback-journal mode
+        # this would make every reader fail with "database is locked".
+        writer.execute("BEGIN EXCLUSIVE")
+        writer.execute(
+            "INSERT INTO groups (name, priority, \"seniorityFactor\", "
+            "min_assignments, max_assignments) VALUES ('Pending', 2, 1.0, 0, 5)"
+        )
+
+        res = app.test_client().get("/api/groups")
+        assert res.status_code == 200
+        assert [g["name"] for g in res.get_json()] == ["Committed"]
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+
+def test_readers_work_on_a_file_not_yet_in_wal_mode(tmp_path):
+    path = tmp_path / "fresh.db"
+    setup = sqlite3.connect(path)
+    setup.execute("CREATE TABLE groups (id INTEGER PRIMARY KEY, name VARCHAR)")
+    setup.close()
+
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+        SQLALCHEMY_READONLY_URI = f"sqlite:///file:{path}?mode=ro&uri=true"
+
+    app = create_app(config_class=FileConfig)
+    with app.app_context():
+        reader = read_session()
+        try:
+            # The write engine switched the file; readers leave journal_mode alone
+            assert reader.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert reader.execute(text("SELECT COUNT(*) FROM groups")).scalar() == 0
+        finally:
+            reader.remove()
+            db.engine.dispose()
@@ -0,0 +1,261 @@
+import pytest
+from datetime import date
+from sqlalchemy import event, func, select
+from app.database import db
+from app.models import (
+    Schedule,
+    ScheduleDay,
+    ScheduleMembership,
+    ScheduleLeave,
+    ScheduleStation,
+    Assignment,
+    Person,
+    Group,
+    MasterStation,
+    Qualification,
+)
+from app.utils.what_if import evaluate_what_if
+
+
+@pytest.fixture
+def what_if_env(session):
+    grp = Group(name="What If Group", max_assignments=10)
+    stn = MasterStation(name="What If Station", abbr="WI")
+    p1 = Person(name="Planner One")
+    p2 = Person(name="Planner Two")
+    p3 = Person(name="Planner Three")
+    session.add_all([grp, stn, p1, p2, p3])
+    session.flush()
+
+    sch = Schedule(
+        name="What If Test", start_date=date(2026, 6, 1), end_date=date(2026, 6, 4)
+    )
+    session.add(sch)
+    session.flush()
+
+    days = [
+        ScheduleDay(schedule_id=sch.id, date=date(2026, 6, i), weight=1.0)
+        for i in range(1, 5)
+    ]
+    session.add_all(days)
+    session.add(ScheduleStation(schedule_id=sch.id, station_id=stn.id))
+    session.add(Qualification(person_id=p1.id, station_id=stn.id))
+    session.add(Qualification(person_id=p3.id, station_id=stn.id))
+
+    m1 = ScheduleMembership(schedule_id=sch.id, person_id=p1.id, group_id=grp.id)
+    m2 = ScheduleMembership(schedule_id=sch.id, person_id=p2.id, group_id=grp.id)
+    session.add_all([m1, m2])
+    session.flush()
+
+    session.add(
+        Assignment(
+            schedule_id=sch.id,
+            day_id=days[0].id,
+            station_id=stn.id,
+            membership_id=m1.id,
+        )
+    )
+    session.commit()
+
+    return {
+        "schedule": sch,
+        "days": days,
+        "m1": m1,
+        "m2": m2,
+        "p3": p3,
+        "group": grp,
+    }
+
+
+def _post(client, schedule_id, changes):
+    return client.post(
+        f"/api/schedules/{schedule_id}/what-if", json={"changes": changes}
+    )
+
+
+def test_no_changes_reports_zero_deltas(client, what_if_env):
+    res = _post(client, what_if_env["schedule"].id, [])
+    assert res.status_code == 200
+    data = res.get_json()
+
+    m1 = str(what_if_env["m1"].id)
+    assert data["quotas"][m1] == {"before": 2.0, "after": 2.0, "delta": 0.0}
+    assert data["score"]["delta"] == 0.0
+    assert data["feasibility"]["feasible"] is True
+
+
+def test_hypothetical_leave_shifts_quota_without_writing(client, what_if_env):
+    env = what_if_env
+    res = _post(
+        client,
+        env["schedule"].id,
+        [
+            {
+                "type": "leave",
+                "membership_id": env["m1"].id,
+                "start_date": "2026-06-01",
+                "end_date": "2026-06-02",
+            }
+        ],
+    )
+    assert res.status_code == 200
+    quotas = res.get_json()["quotas"]
+
+    assert quotas[str(env["m1"].id)]["delta"] < 0
+    assert quotas[str(env["m2"].id)]["delta"] > 0
+    assert db.session.scalar(select(func.count(ScheduleLeave.id))) == 0
+
+
+def test_group_limit_caps_quota(client, what_if_env):
+    env = what_if_env
+    res = _post(
+        client,
+        env["schedule"].id,
+        [{"type": "override", "membership_id": env["m2"].id, "override_max_assignments": 1}],
+    )
+    quotas = res.get_json()["quotas"]
+    assert quotas[str(env["m2"].id)]["after"] == 1.0
+    assert quotas[str(env["m1"].id)]["after"] == 3.0
+
+    res = _post(
+        client,
+        env["schedule"].id,
+        [{"type": "group", "group_id": env["group"].id, "max_assignments": 1}],
+    )
+    feasibility = res.get_json()["feasibility"]
+    assert feasibility["feasible"] is False
+    assert feasibility["shift_capacity"] == 2
+
+
+def test_leave_for_only_qualified_member_is_infeasible(client, what_if_env):
+    env = what_if_env
+    res = _post(
+        client,
+        env["schedule"].id,
+        [
+            {
+                "type": "leave",
+                "membership_id": env["m1"].id,
+                "start_date": "2026-06-03",
+            }
+        ],
+    )
+    feasibility = res.get_json()["feasibility"]
+    assert feasibility["feasible"] is False
+    assert [slot["day_id"] for slot in feasibility["uncovered_slots"]] == [
+        env["days"][2].id
+    ]
+
+    # Adding another qualified member restores coverage
+    res = _post(
+        client,
+        env["schedule"].id,
+        [
+            {
+                "type": "leave",
+                "membership_id": env["m1"].id,
+                "start_date": "2026-06-03",
+            },
+            {
+                "type": "membership_add",
+                "person_id": env["p3"].id,
+                "group_id": env["group"].id,
+            },
+        ],
+    )
+    data = res.get_json()
+    assert data["feasibility"]["feasible"] is True
+    assert "-1" in data["quotas"]
+
+
+def test_score_impact_mirrors_quota_penalty(client, what_if_env):
+    env = what_if_env
+    res = _post(
+        client,
+        env["schedule"].id,
+        [{"type": "day_weight", "day_id": env["days"][0].id, "weight": 3.0}],
+    )
+    data = res.get_json()
+    assert data["quotas"][str(env["m1"].id)]["after"] == 3.0
+    # m1 now holds 3 points against a 3 point target; m2 is 3 short
+    assert data["score"] == {"before": 3.0, "after": 3.0, "delta": 0.0}
+
+    # m1's single shift becomes excess (counted twice), m2 is 4 short
+    res = _post(
+        client,
+        env["schedule"].id,
+        [{"type": "override", "membership_id": env["m1"].id, "override_max_assignments": 0}],
+    )
+    assert res.get_json()["score"] == {"before": 3.0, "after": 6.0, "delta": 3.0}
+
+
+def test_warm_request_does_not_query(client, app, what_if_env):
+    s_id = what_if_env["schedule"].id
+    change = [{"type": "membership_remove", "membership_id": what_if_env["m2"].id}]
+    evaluate_what_if(s_id, change)
+
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        evaluate_what_if(s_id, change)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+    assert statements == []
+
+
+def test_bad_changes_are_rejected(client, what_if_env):
+    s_id = what_if_env["schedule"].id
+    assert _post(client, s_id, [{"type": "teleport"}]).status_code == 400
+    assert (
+        _post(client, s_id, [{"type": "override", "membership_id": 99999}]).status_code
+        == 400
+    )
+    assert _post(client, 99999, []).status_code == 404
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"type": "override", "override_max_assignments": "3"},
+        {"type": "override", "override_max_assignments": 1.5},
+        {"type": "override", "override_min_assignments": True},
+        {"type": "override", "override_seniorityFactor": -1},
+        {"type": "group", "max_assignments": None},
+        {"type": "group", "seniorityFactor": "high"},
+        {"type": "group", "min_assignments": [1]},
+    ],
+)
+def test_bad_limit_values_are_rejected(client, what_if_env, change):
+    key = "group_id" if change["type"] == "group" else "membership_id"
+    target = what_if_env["group"] if key == "group_id" else what_if_env["m1"]
+    res = _post(client, what_if_env["schedule"].id, [{**change, key: target.id}])
+    assert res.status_code == 400
+    assert "must be a non-negative" in res.get_json()["error"]
+
+
+def test_membership_add_rejects_existing_member(client, what_if_env):
+    env = what_if_env
+    s_id = env["schedule"].id
+    existing = env["m1"].person_id
+    add = {"type": "membership_add", "person_id": existing, "group_id": env["group"].id}
+
+    res = _post(client, s_id, [add])
+    assert res.status_code == 400
+    assert "already a member" in res.get_json()["error"]
+
+    # Fine once the scenario removed them, but not twice
+    remove = {"type": "membership_remove", "membership_id": env["m1"].id}
+    assert _post(client, s_id, [remove, add]).status_code == 200
+    assert _post(client, s_id, [remove, add, add]).status_code == 400
+
+    # Clearing an override with null is allowed
+    clear = {
+        "type": "override",
+        "membership_id": env["m1"].id,
+        "override_max_assignments": None,
+    }
+    assert _post(client, s_id, [clear]).status_code == 200
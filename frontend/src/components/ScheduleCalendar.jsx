@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useMemo } from 'react';
 import { Box } from '@mui/material';
 import ScheduleDayCell from './ScheduleDayCell';
 
@@ -12,9 +12,25 @@ export default function ScheduleCalendar({
     memberships,
     requiredStations,
     alerts,
+    availabilityGrid,
     highlightedMemberId,
     onToggleLock // 🟢 Ensure this is passed down
 }) {
+    // Server-computed grid -> { day_id: { station_id: score } }
+    const availabilityByDay = useMemo(() => {
+        const lookup = {};
+        if (!availabilityGrid) return lookup;
+        const { day_ids, station_ids, availability } = availabilityGrid;
+        day_ids.forEach((dayId, row) => {
+            const byStation = {};
+            station_ids.forEach((stationId, col) => {
+                byStation[stationId] = availability[row][col];
+            });
+            lookup[dayId] = byStation;
+        });
+        return lookup;
+    }, [availabilityGrid]);
+
     return (
         <Box sx={{
             flex: 1,
@@ -47,10 +63,8 @@ export default function ScheduleCalendar({
                     dayAlerts={alerts ? alerts.filter(a => a.day_id === day.id) : []}
                     highlightedMemberId={highlightedMemberId}
 
-                    // Pass full arrays for calculator if needed
-                    allAssignments={assignments}
-                    allExclusions={exclusions}
-                    allDays={days}
+                    // Precomputed slot availability for this day
+                    slotAvailability={availabilityByDay[day.id]}
                 />
             ))}
         </Box>
@@ -3,9 +3,6 @@ import { Box, Paper, Typography, Tooltip } from '@mui/material';
 import WarningIcon from '@mui/icons-material/Warning';
 import LockIcon from '@mui/icons-material/Lock'; // 🟢 1. IMPORT LOCK ICON
 
-// Import the calculator (Ensure this path matches your file structure)
-import { calculateSlotAvailability } from '../utils/availabilityCalculator';
-
 const ScheduleDayCell = memo(({
     day,
     requiredStations = [],
@@ -13,11 +10,9 @@ const ScheduleDayCell = memo(({
     leaves = [],
     exclusions = [],
 
-    // Global Props for Calculator
-    allAssignments = [],
-    allExclusions = [],
-    allDays = [],
+    // Global Props
     memberships = [],
+    slotAvailability = {}, // { station_id: score } from /availability-grid
 
     // Interaction & Validation Props
     isSelected,
@@ -165,9 +160,7 @@ const ScheduleDayCell = memo(({
                     if (hasAssignment) {
                         displayValue = assign.assigned_person_name.split(' ')[0];
                     } else if (!isLookback) {
-                        availScore = calculateSlotAvailability(
-                            st.station_id, day, allDays, memberships, allAssignments, allExclusions, requiredStations
-                        );
+                        availScore = slotAvailability?.[st.station_id] ?? 0;
                         displayValue = `${availScore.toFixed(1)}`;
                     }
 
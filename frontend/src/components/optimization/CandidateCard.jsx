@@ -167,6 +167,11 @@ export default function CandidateCard({
                     <Typography variant="caption" color="text.secondary" sx={{ fontSize: '0.7rem' }}>
                         ID: {candidate.run_id ? candidate.run_id.substring(0, 6) : 'N/A'}
                     </Typography>
+                    {candidate.alert_count > 0 && (
+                        <Typography variant="caption" color="warning.main" sx={{ fontSize: '0.7rem', display: 'block' }}>
+                            {candidate.alert_count} conflict{candidate.alert_count === 1 ? '' : 's'} if applied
+                        </Typography>
+                    )}
                 </Box>
 
                 <Divider sx={{ my: 1 }} />
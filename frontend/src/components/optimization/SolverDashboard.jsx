@@ -59,8 +59,13 @@ export default function SolverDashboard({
     // Fetch existing candidates (load on start)
     const fetchCandidates = async () => {
         try {
-            const res = await axios.get(`/api/schedules/${scheduleId}/candidates`);
-            setCandidates(res.data);
+            const [res, validation] = await Promise.all([
+                axios.get(`/api/schedules/${scheduleId}/candidates`),
+                axios.get(`/api/schedules/${scheduleId}/candidates/validation`).catch(() => ({ data: [] }))
+            ]);
+            // Attach the in-memory validation result (alerts if this option were applied)
+            const alertCounts = new Map(validation.data.map(v => [v.candidate_id, v.alert_count]));
+            setCandidates(res.data.map(c => ({ ...c, alert_count: alertCounts.get(c.id) ?? 0 })));
         } catch (err) { console.error(err); }
     };
 
@@ -1,20 +1,31 @@
 import { useState, useEffect } from 'react';
-import { Typography, Fab, Box, Grid } from '@mui/material';
+import { Typography, Fab, Box, Grid, Button } from '@mui/material';
 import AddIcon from '@mui/icons-material/Add';
+import { fetchPage } from '../pagination';
 
 // Assumes you have these components created
 import ScheduleCard from '../components/ScheduleCard';
 import CreateScheduleDialog from '../components/CreateScheduleDialog';
 
+const PAGE_SIZE = 24;
+
 export default function Dashboard() {
     const [schedules, setSchedules] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const [open, setOpen] = useState(false);
 
-    useEffect(() => {
-        fetch('/api/schedules')
-            .then(res => res.json())
-            .then(data => setSchedules(data))
+    // Newest first, one page at a time (keyset cursor from the previous page)
+    const loadPage = (cursor = null) => {
+        fetchPage('/api/schedules', { cursor, limit: PAGE_SIZE })
+            .then(page => {
+                setSchedules(prev => (cursor ? [...prev, ...page.items] : page.items));
+                setNextCursor(page.next_cursor);
+            })
             .catch(err => console.error("Error fetching schedules:", err));
+    };
+
+    useEffect(() => {
+        loadPage();
     }, []);
 
     const handleCreated = (newSchedule) => {
@@ -54,6 +65,14 @@ export default function Dashboard() {
                 )}
             </Grid>
 
+            {nextCursor && (
+                <Box sx={{ mt: 3, textAlign: 'center' }}>
+                    <Button variant="outlined" onClick={() => loadPage(nextCursor)}>
+                        Load more
+                    </Button>
+                </Box>
+            )}
+
             <CreateScheduleDialog
                 open={open}
                 onClose={() => setOpen(false)}
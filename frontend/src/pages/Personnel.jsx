@@ -13,9 +13,13 @@ import EditIcon from '@mui/icons-material/Edit';
 import PersonIcon from '@mui/icons-material/Person';
 import CheckCircleIcon from '@mui/icons-material/CheckCircle';
 import CancelIcon from '@mui/icons-material/Cancel';
+import { fetchPage } from '../pagination';
+
+const PAGE_SIZE = 100;
 
 export default function Personnel() {
     const [members, setMembers] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
     const [groups, setGroups] = useState([]);
     const [open, setOpen] = useState(false);
     const [editingId, setEditingId] = useState(null);
@@ -31,8 +35,18 @@ export default function Personnel() {
         fetchData();
     }, []);
 
+    // Personnel by name, one page at a time (keyset cursor from the previous page)
+    const loadPage = (cursor = null) => {
+        fetchPage('/api/personnel', { cursor, limit: PAGE_SIZE })
+            .then(page => {
+                setMembers(prev => (cursor ? [...prev, ...page.items] : page.items));
+                setNextCursor(page.next_cursor);
+            })
+            .catch(err => console.error("Error fetching personnel:", err));
+    };
+
     const fetchData = () => {
-        fetch('/api/personnel').then(res => res.json()).then(setMembers);
+        loadPage();
         fetch('/api/groups').then(res => res.json()).then(setGroups);
     };
 
@@ -157,6 +171,14 @@ export default function Personnel() {
                 </Table>
             </TableContainer>
 
+            {nextCursor && (
+                <Box sx={{ mt: 2, textAlign: 'center' }}>
+                    <Button variant="outlined" onClick={() => loadPage(nextCursor)}>
+                        Load more
+                    </Button>
+                </Box>
+            )}
+
             {/* DIALOG */}
             <Dialog open={open} onClose={() => setOpen(false)} fullWidth maxWidth="xs">
                 <DialogTitle>{editingId ? "Edit Sailor" : "Add New Sailor"}</DialogTitle>
@@ -6,6 +6,7 @@ import {
 import EditIcon from '@mui/icons-material/Edit';
 import CancelIcon from '@mui/icons-material/Cancel'; // The "Red X"
 import CheckCircleIcon from '@mui/icons-material/CheckCircle';
+import { fetchAllPages } from '../pagination';
 export default function Qualifications() {
     const [people, setPeople] = useState([]);
     const [stations, setStations] = useState([]);
@@ -13,7 +14,7 @@ export default function Qualifications() {
 
     useEffect(() => {
         Promise.all([
-            fetch('/api/personnel').then(res => res.json()),
+            fetchAllPages('/api/personnel'),
             fetch('/api/master-stations').then(res => res.json())
         ]).then(([peopleData, stationsData]) => {
             setPeople(peopleData);
@@ -77,7 +78,7 @@ export default function Qualifications() {
     };
 
     const refreshData = () => {
-        fetch('/api/personnel').then(res => res.json()).then(setPeople);
+        fetchAllPages('/api/personnel').then(setPeople);
     };
 
     if (loading) return <Box p={4} textAlign="center"><CircularProgress /></Box>;
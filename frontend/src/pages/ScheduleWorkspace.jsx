@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { useParams } from 'react-router-dom';
 import {
     Box, Typography, Breadcrumbs, Link, Paper,
@@ -19,6 +19,7 @@ import LeaveManagerDialog from '../components/LeaveManagerDialog';
 import AlertsList from '../components/AlertsList';
 import MemberConfigDialog from '../components/MemberConfigDialog';
 import MemberPickerDialog from '../components/MemberPickerDialog';
+import { fetchAllPages } from '../pagination';
 
 function a11yProps(index) {
     return {
@@ -27,6 +28,70 @@ function a11yProps(index) {
     };
 }
 
+// Grid slots arrive as parallel arrays + lookup tables (?format=columnar);
+// expand back into the row objects the components expect.
+async function fetchAssignments(scheduleId) {
+    const res = await fetch(`/api/schedules/${scheduleId}/assignments?format=columnar`);
+    if (!res.ok) return [];
+    const { count, columns: c, days, stations, members } = await res.json();
+    const rows = new Array(count);
+    for (let i = 0; i < count; i++) {
+        const memberId = c.membership_id[i];
+        rows[i] = {
+            id: c.id[i],
+            day_id: c.day_id[i],
+            date: days[c.day_id[i]],
+            station_id: c.station_id[i],
+            station_name: stations[c.station_id[i]],
+            membership_id: memberId,
+            assigned_person_name: memberId != null ? members[memberId] : null,
+            is_locked: c.is_locked[i],
+            availability_estimate: c.availability_estimate[i],
+        };
+    }
+    return rows;
+}
+
+// Full alert list plus its base: the revision token from the ETag
+// (W/"<schedule id>-<token>"). Edits send the base back to get a delta.
+async function fetchAlerts(scheduleId) {
+    const res = await fetch(`/api/schedules/${scheduleId}/alerts`);
+    if (!res.ok) return { alerts: [], base: null };
+    const etag = res.headers.get('ETag');
+    const base = etag ? etag.slice(etag.lastIndexOf('-') + 1).replace(/"$/, '') : null;
+    return { alerts: await res.json(), base };
+}
+
+// Leaves arrive once each as date intervals; expand them into the per-day
+// lists (day.leaves) and the flat per-date list (allLeaves) the views use.
+function expandLeaves(schData) {
+    const byDate = {};
+    const exploded = [];
+    for (const l of schData.leave_intervals || []) {
+        const curr = new Date(`${l.start_date}T00:00:00Z`);
+        const end = new Date(`${l.end_date}T00:00:00Z`);
+        for (; curr <= end; curr.setUTCDate(curr.getUTCDate() + 1)) {
+            const iso = curr.toISOString().slice(0, 10);
+            (byDate[iso] ||= []).push({
+                id: l.id,
+                person_name: l.person_name,
+                reason: l.reason,
+                membership_id: l.membership_id,
+                person_id: l.person_id,
+            });
+            exploded.push({
+                id: l.id,
+                date: iso,
+                membership_id: l.membership_id,
+                person_name: l.person_name,
+                reason: l.reason,
+            });
+        }
+    }
+    const days = (schData.days || []).map(d => ({ ...d, leaves: byDate[d.date] || [] }));
+    return { days, leaves: exploded };
+}
+
 export default function ScheduleWorkspace() {
     const { scheduleId } = useParams();
 
@@ -56,32 +121,38 @@ export default function ScheduleWorkspace() {
     const [allLeaves, setAllLeaves] = useState([]);
     const [exclusions, setExclusions] = useState([]);
     const [alerts, setAlerts] = useState([]);
+    const alertsBase = useRef(null);
+    const [availabilityGrid, setAvailabilityGrid] = useState(null);
     const [highlightedMemberId, setHighlightedMemberId] = useState(null);
 
     // 🟢 DATA FETCHING
     const fetchData = useCallback(async () => {
         setLoading(true);
         try {
-            const [schData, masterRes, peopleRes, assignmentsRes, exclusionsRes, alertsRes, groupsRes] = await Promise.all([
+            const [schData, masterRes, peopleRes, assignmentsRes, exclusionsRes, alertsRes, groupsRes, gridRes] = await Promise.all([
                 fetch(`/api/schedules/${scheduleId}`).then(res => res.json()),
                 fetch('/api/master-stations').then(res => res.json()),
-                fetch('/api/personnel').then(res => res.json()),
-                fetch(`/api/schedules/${scheduleId}/assignments`).then(res => res.ok ? res.json() : []),
+                fetchAllPages('/api/personnel'),
+                fetchAssignments(scheduleId),
                 fetch(`/api/exclusions/schedule/${scheduleId}`).then(res => res.ok ? res.json() : []),
-                fetch(`/api/schedules/${scheduleId}/alerts`).then(res => res.ok ? res.json() : []),
-                fetch('/api/groups').then(res => res.json())
+                fetchAlerts(scheduleId),
+                fetch('/api/groups').then(res => res.json()),
+                fetch(`/api/schedules/${scheduleId}/availability-grid`).then(res => res.ok ? res.json() : null)
             ]);
 
+            const { days: dayRows, leaves } = expandLeaves(schData);
             setSchedule(schData);
             setSummary(schData);
-            setDays(schData.days || []);
-            setAllLeaves(schData.leaves_exploded || []);
+            setDays(dayRows);
+            setAllLeaves(leaves);
             setMasterStations(masterRes);
             setAllPersonnel(peopleRes);
             setAssignments(assignmentsRes);
             setExclusions(exclusionsRes);
-            setAlerts(alertsRes);
+            setAlerts(alertsRes.alerts);
+            alertsBase.current = alertsRes.base;
             setAllGroups(groupsRes);
+            setAvailabilityGrid(gridRes);
             setLoading(false);
         } catch (err) {
             console.error("Error loading workspace:", err);
@@ -89,21 +160,26 @@ export default function ScheduleWorkspace() {
         }
     }, [scheduleId]);
 
-    const refreshOperationalData = useCallback(async () => {
+    const refreshOperationalData = useCallback(async ({ skipAlerts = false } = {}) => {
         try {
-            const [assignmentsRes, exclusionsRes, alertsRes, schRes] = await Promise.all([
-                fetch(`/api/schedules/${scheduleId}/assignments`).then(r => r.ok ? r.json() : []),
+            const [assignmentsRes, exclusionsRes, alertsRes, schRes, gridRes] = await Promise.all([
+                fetchAssignments(scheduleId),
                 fetch(`/api/exclusions/schedule/${scheduleId}`).then(r => r.ok ? r.json() : []),
-                fetch(`/api/schedules/${scheduleId}/alerts`).then(r => r.ok ? r.json() : []),
-                fetch(`/api/schedules/${scheduleId}`).then(r => r.json())
+                skipAlerts ? null : fetchAlerts(scheduleId),
+                fetch(`/api/schedules/${scheduleId}`).then(r => r.json()),
+                fetch(`/api/schedules/${scheduleId}/availability-grid`).then(r => r.ok ? r.json() : null)
             ]);
 
             setAssignments(assignmentsRes);
             setExclusions(exclusionsRes);
-            setAlerts(alertsRes);
+            if (alertsRes) {
+                setAlerts(alertsRes.alerts);
+                alertsBase.current = alertsRes.base;
+            }
+            setAvailabilityGrid(gridRes);
 
-            if (schRes && schRes.leaves_exploded) {
-                setAllLeaves(schRes.leaves_exploded);
+            if (schRes && schRes.leave_intervals) {
+                setAllLeaves(expandLeaves(schRes).leaves);
             }
         } catch (err) {
             console.error("Partial refresh failed:", err);
@@ -215,12 +291,27 @@ export default function ScheduleWorkspace() {
         if (!targetAssignment) return;
         try {
             const shouldLock = !!membershipId;
-            const res = await fetch(`/api/assignments/${targetAssignment.id}`, {
+            const base = alertsBase.current ? `?alerts_base=${alertsBase.current}` : '';
+            const res = await fetch(`/api/assignments/${targetAssignment.id}${base}`, {
                 method: 'PATCH',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({ membership_id: membershipId || null, is_locked: shouldLock })
             });
-            if (res.ok) { refreshOperationalData(); }
+            if (res.ok) {
+                // Merge the alert delta from the PATCH instead of refetching every alert;
+                // the server sends the full list when our base is out of date
+                const { alerts_delta: delta } = await res.json();
+                if (delta) {
+                    alertsBase.current = delta.base;
+                    if (delta.alerts) {
+                        setAlerts(delta.alerts);
+                    } else {
+                        const removedKeys = new Set(delta.removed.map(a => a.key));
+                        setAlerts(prev => prev.filter(a => !removedKeys.has(a.key)).concat(delta.added));
+                    }
+                }
+                refreshOperationalData({ skipAlerts: !!delta });
+            }
         } catch (err) { console.error(err); }
     }, [assignments, refreshOperationalData]);
 
@@ -260,6 +351,7 @@ export default function ScheduleWorkspace() {
                         memberships={schedule.memberships}
                         requiredStations={schedule?.required_stations || []}
                         alerts={alerts}
+                        availabilityGrid={availabilityGrid}
                         highlightedMemberId={highlightedMemberId}
                         // 🟢 PASSED DOWN HERE
                         onToggleLock={handleToggleLock}
@@ -0,0 +1,26 @@
+// Lists that are not scoped to one schedule (/api/schedules, /api/personnel,
+// /api/holidays, /api/schedule-memberships without schedule_id) are always
+// paged: { items, next_cursor }. See backend/app/utils/pagination.py.
+export const MAX_PAGE_LIMIT = 500;
+
+export async function fetchPage(url, { cursor = null, limit = MAX_PAGE_LIMIT } = {}) {
+    const sep = url.includes('?') ? '&' : '?';
+    let pageUrl = `${url}${sep}limit=${limit}`;
+    if (cursor) pageUrl += `&cursor=${encodeURIComponent(cursor)}`;
+    const res = await fetch(pageUrl);
+    if (!res.ok) throw new Error(`GET ${url} failed: ${res.status}`);
+    return res.json();
+}
+
+// Follows next_cursor to the end, for views that need every row
+// (member pickers, the qualification matrix).
+export async function fetchAllPages(url) {
+    const items = [];
+    let cursor = null;
+    do {
+        const page = await fetchPage(url, { cursor });
+        items.push(...page.items);
+        cursor = page.next_cursor;
+    } while (cursor);
+    return items;
+}